@@ -4,7 +4,8 @@ import os
 
 from AgentMarket.ai_analysis.openai_client import analyze_text
 from AgentMarket.rss_feeds.feeds_list import RSS_FEEDS
-from AgentMarket.utils.helpers import parse_rss
+from AgentMarket.utils.helpers import parse_rss_many
+from scores_news.utils.near_dup import NearDuplicateIndex, fingerprint_text
 
 
 def calculate_impact_score(analysis_text):
@@ -37,11 +38,22 @@ def main():
     daily_scores = []
     today = datetime.date.today().isoformat()
 
+    # כל הפידים נטענים במקביל בבת אחת
+    feeds_articles = parse_rss_many(RSS_FEEDS.values())
+
+    # ידיעה שמופיעה בכמה פידים נשלחת לניתוח פעם אחת בלבד
+    near_dups = NearDuplicateIndex()
+
     for feed_name, url in RSS_FEEDS.items():
         print(f"טוען נתונים מ-{feed_name}...")
-        articles = parse_rss(url)
+        articles = feeds_articles.get(url, [])
 
         for article in articles:
+            _, is_duplicate = near_dups.add(article.get('link') or article['title'], fingerprint_text(article))
+            if is_duplicate:
+                print(f"דילוג על כפילות: {article['title']}")
+                continue
+
             prompt = f"""
             נתח את סיכום המאמר הבא וספק תובנות מקצועיות בעברית על ההשפעה שלו על שוק החוזים העתידיים (NASDAQ ו-S&P 500).
             כלול המלצה לפעולת השקעה (לונג/שורט/ללא פעולה) בהתחשב בניתוח.
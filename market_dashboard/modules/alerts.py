@@ -3,7 +3,7 @@ import pandas as pd
 from datetime import datetime
 from pathlib import Path
 from modules.config import load_config
-from scores_news.cat_scores.bonds_score import fetch_treasury_yield_xml, extract_yields_from_treasury_xml
+from scores_news.utils.yield_curve import latest_yields
 from scores_news.cat_scores.futures_vix_score import detect_vix_spike
 
 BASE_DIR = Path(__file__).parent.parent
@@ -12,11 +12,10 @@ DATA_DIR = BASE_DIR / 'data'
 
 def detect_yield_inversion() -> float:
     """
-    משלב fetch_treasury_yield_xml ו-extract_yields_from_treasury_xml כדי לחשב inversion
+    מחשב inversion (10Y–2Y) מעקום התשואות במאגר המקומי – בלי להוריד ולפענח את ה־XML בכל טעינה
     """
     try:
-        xml = fetch_treasury_yield_xml()
-        yields = extract_yields_from_treasury_xml(xml)
+        yields = latest_yields()
         spread = yields.get('10Y', 0.0) - yields.get('2Y', 0.0)
         return abs(spread) if spread < 0 else 0.0
     except Exception:
@@ -1,60 +1,37 @@
 # bonds_score.py
 
-import requests
-import xml.etree.ElementTree as ET
-from datetime import datetime, timedelta
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from scores_news.utils.http_client import http_get
+from scores_news.utils.yield_curve import SPREAD_TENORS, TREASURY_URL, latest_yields, parse_yield_curve_xml
 
 
 def fetch_treasury_yield_xml(year_month: str = None) -> str:
     """מוריד את קובץ ה־XML של משרד האוצר לפי חודש"""
     if not year_month:
         year_month = datetime.now().strftime("%Y%m")
-    url = (
-        "https://home.treasury.gov/resource-center/data-chart-center/"
-        f"interest-rates/pages/xmlview?data=daily_treasury_yield_curve&field_tdr_date_value_month={year_month}"
-    )
+    url = TREASURY_URL.format(year_month=year_month)
     print(f"📡 מוריד XML מ: {url}")
-    response = requests.get(url)
+    response = http_get(url)
     response.raise_for_status()
     return response.content
 
 
 def extract_yields_from_treasury_xml(xml_data: str) -> dict:
-    root = ET.fromstring(xml_data)
-
-    # השורות נמצאות תחת namespace ולכן נשתמש ב־{*}
-    entries = root.findall(".//{*}entry")
-
-    candidates = []
-
-    for entry in entries:
-        props = entry.find(".//{*}properties")
-        if props is None:
-            continue
-
-        try:
-            date_text = props.findtext(".//{*}NEW_DATE")
-            y2_text = props.findtext(".//{*}BC_2YEAR")
-            y10_text = props.findtext(".//{*}BC_10YEAR")
-
-            print(f"🔍 {date_text} | 2Y: {y2_text} | 10Y: {y10_text}")
-
-            if date_text and y2_text and y10_text:
-                date_obj = datetime.strptime(date_text, "%Y-%m-%dT%H:%M:%S")
-                y2 = float(y2_text)
-                y10 = float(y10_text)
-                candidates.append((date_obj, y2, y10))
-        except Exception as e:
-            continue
-
-    if not candidates:
+    """כל הטנורים (1M…30Y) של היום האחרון בקובץ שיש בו 2Y ו־10Y – פענוח הדרגתי ב־iterparse, בלי לבנות עץ מלא"""
+    curves = parse_yield_curve_xml(xml_data)
+    if not curves:
         return {}
+    complete = [date for date, curve in curves.items() if all(t in curve for t in SPREAD_TENORS)]
+    return curves[max(complete or curves)]
+
 
-    latest = max(candidates, key=lambda x: x[0])
-    return {
-        "2Y": latest[1],
-        "10Y": latest[2]
-    }
+def load_latest_yields() -> dict:
+    """עקום התשואות האחרון מהמאגר המקומי – חודשים סגורים נשמרים, רק החודש הנוכחי מתרענן"""
+    return latest_yields()
 
 
 def calculate_bond_score(yields: dict) -> tuple[int, str]:
@@ -78,6 +55,19 @@ def calculate_bond_score(yields: dict) -> tuple[int, str]:
 
     return score, explanation
 
+
+def calculate_bond_scores(yields: pd.DataFrame) -> pd.Series:
+    """גרסה וקטורית של calculate_bond_score – שורה לכל יום (עמודות 2Y ו־10Y), 50 כשחסר אחד מהם"""
+    if "2Y" not in yields or "10Y" not in yields:
+        return pd.Series(50, index=yields.index, name="bonds_score")
+    spread = yields["10Y"].to_numpy(dtype=float) - yields["2Y"].to_numpy(dtype=float)
+    score = np.select(
+        [np.isnan(spread), spread > 1, spread > 0, spread > -1],
+        [50, 80, 65, 40],
+        20,
+    )
+    return pd.Series(score, index=yields.index, name="bonds_score")
+
 import yfinance as yf
 
 def detect_yield_inversion() -> float:
@@ -102,17 +92,6 @@ def detect_yield_inversion() -> float:
 
 
 if __name__ == "__main__":
-    try:
-        xml = fetch_treasury_yield_xml()
-        yields = extract_yields_from_treasury_xml(xml)
-        if not yields:  # אם אין תשואות – ננסה חודש קודם
-            raise ValueError("אין תשואות")
-    except:
-        print("🔁 מנסה חודש קודם...")
-        prev_month = (datetime.now().replace(day=1) - timedelta(days=1)).strftime("%Y%m")
-        xml = fetch_treasury_yield_xml(prev_month)
-        yields = extract_yields_from_treasury_xml(xml)
-
+    yields = load_latest_yields()
     score, explanation = calculate_bond_score(yields)
     print(f"📉 Bond Score: {score} | {explanation}")
-
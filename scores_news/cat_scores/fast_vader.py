@@ -0,0 +1,235 @@
+# cat_scores/fast_vader.py
+"""
+Fast VADER-compatible compound scorer.
+
+``SentimentIntensityAnalyzer.polarity_scores`` rebuilds the emoji-free text
+character by character.  For every sentiment word it also re-lowercases
+the whole token list several times (``_negation_check``,
+``_special_idioms_check``, ``_but_check``), so long summaries cost O(n²).
+This scorer applies the same rules in one pass:
+
+* the lexicon, booster, negation and idiom tables are compiled once into
+  plain dicts / frozensets (one shared instance per process);
+* tokens are lower-cased once per text, and each distinct lower-cased
+  token is interned in a bounded lookup table holding its valence and
+  booster/negation flags;
+* the emoji rewrite only runs when the text actually contains an emoji.
+
+Only the ``compound`` score is produced, rounded to 4 decimals like VADER.
+``scores_news/tests/bench_sentiment.py`` checks equivalence and speed
+against the reference implementation on the archived
+``logs/sentiment_raw_*.csv`` files.
+"""
+
+import math
+import string
+
+from vaderSentiment import vaderSentiment as _vader
+from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+
+B_INCR = _vader.B_INCR
+C_INCR = _vader.C_INCR
+N_SCALAR = _vader.N_SCALAR
+
+_PUNCTUATION = string.punctuation
+_TOKEN_TABLE_LIMIT = 200000
+
+# דגלים לכל טוקן בטבלה
+_IS_BOOSTER = 1
+_IS_NEGATION = 2
+
+
+class FastVader:
+    """Compiled VADER rules; ``compound(text)`` equals ``polarity_scores(text)["compound"]``."""
+
+    def __init__(self, analyzer: SentimentIntensityAnalyzer | None = None) -> None:
+        analyzer = analyzer or SentimentIntensityAnalyzer()
+        self.lexicon = dict(analyzer.lexicon)
+        self.boosters = dict(_vader.BOOSTER_DICT)
+        self.special_cases = dict(_vader.SPECIAL_CASES)
+        self.negations = frozenset(_vader.NEGATE)
+        # ב־VADER לולאת האימוג'י עוברת תו־תו, ולכן רק מפתחות של תו אחד יכולים להתאים
+        self.emojis = {k: v for k, v in analyzer.emojis.items() if len(k) == 1}
+        self._emoji_chars = frozenset(self.emojis)
+        self._tokens = {}  # lower-case token -> (valence or None, flags)
+
+    def _token_info(self, lower: str):
+        info = self._tokens.get(lower)
+        if info is None:
+            flags = 0
+            if lower in self.boosters:
+                flags |= _IS_BOOSTER
+            if lower in self.negations or "n't" in lower:
+                flags |= _IS_NEGATION
+            info = (self.lexicon.get(lower), flags)
+            if len(self._tokens) < _TOKEN_TABLE_LIMIT:
+                self._tokens[lower] = info
+        return info
+
+    def _replace_emojis(self, text: str) -> str:
+        parts = []
+        prev_space = True
+        for ch in text:
+            description = self.emojis.get(ch)
+            if description is not None:
+                if not prev_space:
+                    parts.append(" ")
+                parts.append(description)
+                prev_space = False
+            else:
+                parts.append(ch)
+                prev_space = ch == " "
+        return "".join(parts)
+
+    def _scalar(self, word: str, lower: str, valence: float, is_cap_diff: bool) -> float:
+        scalar = self.boosters[lower]
+        if valence < 0:
+            scalar *= -1
+        if is_cap_diff and word.isupper():
+            scalar = scalar + C_INCR if valence > 0 else scalar - C_INCR
+        return scalar
+
+    def _idioms(self, valence: float, lw: list, i: int) -> float:
+        special = self.special_cases
+        onezero = f"{lw[i - 1]} {lw[i]}"
+        twoonezero = f"{lw[i - 2]} {lw[i - 1]} {lw[i]}"
+        twoone = f"{lw[i - 2]} {lw[i - 1]}"
+        threetwoone = f"{lw[i - 3]} {lw[i - 2]} {lw[i - 1]}"
+        threetwo = f"{lw[i - 3]} {lw[i - 2]}"
+        for seq in (onezero, twoonezero, twoone, threetwoone, threetwo):
+            if seq in special:
+                valence = special[seq]
+                break
+        n = len(lw)
+        if n - 1 > i:
+            zeroone = f"{lw[i]} {lw[i + 1]}"
+            if zeroone in special:
+                valence = special[zeroone]
+        if n - 1 > i + 1:
+            zeroonetwo = f"{lw[i]} {lw[i + 1]} {lw[i + 2]}"
+            if zeroonetwo in special:
+                valence = special[zeroonetwo]
+        for n_gram in (threetwoone, threetwo, twoone):
+            if n_gram in self.boosters:
+                valence = valence + self.boosters[n_gram]
+        return valence
+
+    def _negation(self, valence: float, lw: list, flags: list, start_i: int, i: int) -> float:
+        if start_i == 0:
+            if flags[i - 1] & _IS_NEGATION:
+                valence = valence * N_SCALAR
+        elif start_i == 1:
+            if lw[i - 2] == "never" and (lw[i - 1] == "so" or lw[i - 1] == "this"):
+                valence = valence * 1.25
+            elif lw[i - 2] == "without" and lw[i - 1] == "doubt":
+                pass
+            elif flags[i - 2] & _IS_NEGATION:
+                valence = valence * N_SCALAR
+        else:
+            if (lw[i - 3] == "never" and (lw[i - 2] == "so" or lw[i - 2] == "this")) or \
+                    (lw[i - 1] == "so" or lw[i - 1] == "this"):
+                valence = valence * 1.25
+            elif lw[i - 3] == "without" and (lw[i - 2] == "doubt" or lw[i - 1] == "doubt"):
+                pass
+            elif flags[i - 3] & _IS_NEGATION:
+                valence = valence * N_SCALAR
+        return valence
+
+    def _valence(self, i: int, words: list, lw: list, vals: list, flags: list, is_cap_diff: bool) -> float:
+        n = len(words)
+        base = vals[i]
+        valence = base
+        if lw[i] == "no" and i != n - 1 and vals[i + 1] is not None:
+            valence = 0.0
+        if (i > 0 and lw[i - 1] == "no") or (i > 1 and lw[i - 2] == "no") or \
+                (i > 2 and lw[i - 3] == "no" and lw[i - 1] in ("or", "nor")):
+            valence = base * N_SCALAR
+
+        if is_cap_diff and words[i].isupper():
+            valence = valence + C_INCR if valence > 0 else valence - C_INCR
+
+        for start_i in range(3):
+            j = i - (start_i + 1)
+            if i > start_i and vals[j] is None:
+                if flags[j] & _IS_BOOSTER:
+                    s = self._scalar(words[j], lw[j], valence, is_cap_diff)
+                    if start_i == 1:
+                        s = s * 0.95
+                    elif start_i == 2:
+                        s = s * 0.9
+                    valence = valence + s
+                valence = self._negation(valence, lw, flags, start_i, i)
+                if start_i == 2:
+                    valence = self._idioms(valence, lw, i)
+
+        # "least" כשלילה
+        if i > 1 and vals[i - 1] is None and lw[i - 1] == "least":
+            if lw[i - 2] != "at" and lw[i - 2] != "very":
+                valence = valence * N_SCALAR
+        elif i > 0 and vals[i - 1] is None and lw[i - 1] == "least":
+            valence = valence * N_SCALAR
+        return valence
+
+    @staticmethod
+    def _but_check(lw: list, sentiments: list) -> list:
+        # שחזור מדויק של VADER, כולל השימוש ב־index() על ערכים חוזרים
+        if "but" in lw:
+            bi = lw.index("but")
+            for sentiment in sentiments:
+                si = sentiments.index(sentiment)
+                if si < bi:
+                    sentiments.pop(si)
+                    sentiments.insert(si, sentiment * 0.5)
+                elif si > bi:
+                    sentiments.pop(si)
+                    sentiments.insert(si, sentiment * 1.5)
+        return sentiments
+
+    def compound(self, text: str) -> float:
+        if self._emoji_chars.intersection(text):
+            text = self._replace_emojis(text)
+        text = text.strip()
+
+        words = []
+        for token in text.split():
+            stripped = token.strip(_PUNCTUATION)
+            words.append(token if len(stripped) <= 2 else stripped)
+        if not words:
+            return 0.0
+
+        lw = [w.lower() for w in words]
+        infos = [self._token_info(w) for w in lw]
+        vals = [info[0] for info in infos]
+        flags = [info[1] for info in infos]
+
+        caps = sum(1 for w in words if w.isupper())
+        is_cap_diff = 0 < len(words) - caps < len(words)
+
+        sentiments = []
+        last = len(words) - 1
+        for i in range(len(words)):
+            if flags[i] & _IS_BOOSTER:
+                sentiments.append(0)
+            elif i < last and lw[i] == "kind" and lw[i + 1] == "of":
+                sentiments.append(0)
+            elif vals[i] is None:
+                sentiments.append(0)
+            else:
+                sentiments.append(self._valence(i, words, lw, vals, flags, is_cap_diff))
+
+        sentiments = self._but_check(lw, sentiments)
+
+        sum_s = float(sum(sentiments))
+        ep_count = min(text.count("!"), 4)
+        amplifier = ep_count * 0.292
+        qm_count = text.count("?")
+        if qm_count > 1:
+            amplifier += qm_count * 0.18 if qm_count <= 3 else 0.96
+        if sum_s > 0:
+            sum_s += amplifier
+        elif sum_s < 0:
+            sum_s -= amplifier
+
+        score = sum_s / math.sqrt(sum_s * sum_s + 15)
+        score = max(-1.0, min(1.0, score))
+        return round(score, 4)
@@ -2,30 +2,37 @@
 
 from datetime import datetime
 from pathlib import Path
+from urllib.parse import urlsplit
 
-from scores_news.cat_scores.sentiment_score import (
-    load_sentiment_data,
-    calculate_sentiment_score,
-)
+from scores_news.cat_scores.sentiment_score import load_sentiment_score
 from scores_news.cat_scores.macro_score import (
     fetch_macro_news,
     calculate_macro_score,
 )
-from scores_news.cat_scores.bonds_score import (
-    fetch_treasury_yield_xml,
-    extract_yields_from_treasury_xml,
-    calculate_bond_score,
-)
+from scores_news.cat_scores.bonds_score import load_latest_yields, calculate_bond_score
 from scores_news.cat_scores.futures_vix_score import (
     fetch_futures_news,
     calculate_futures_score,
 )
 from scores_news.cat_scores.mes_score import fetch_mes_data, calculate_mes_score
 from scores_news.cat_scores.sectors_score import calculate_sectors_score
+from scores_news.utils.decayed_sentiment import DecayedSentiment
+from scores_news.utils.feed_registry import FeedRegistry
+from scores_news.utils.score_snapshot import (
+    SNAPSHOT_INTERVAL,
+    SNAPSHOT_PATH,
+    read_snapshot,
+    snapshot_age,
+    write_snapshot,
+)
 import pandas as pd
+from concurrent.futures import Future, TimeoutError as FutureTimeout
 import csv
 import json
 import os
+import sys
+import threading
+import time
 
 # ---------------------------------------------------------------
 # נתיב בסיס - מחושב דינמית על בסיס מיקום הקובץ הנוכחי
@@ -53,131 +60,182 @@ def load_mes_local_data() -> pd.DataFrame:
     df["date"] = pd.to_datetime(df["date"], errors="coerce").dt.date
     return df
 
-def load_all_scores():
-    """מריץ כל קטגוריה ומחזיר מילון ציונים"""
-    scores = {}
+# קטגוריות שנשענות על פידי RSS בזמן חישוב הציון
+NEWS_CATEGORIES = ["macro", "futures_vix"]
 
-    # === Sentiment ===
-    try:
-        df = load_sentiment_data()
-        sentiment_score, explanation = calculate_sentiment_score(df)
-        scores["sentiment"] = {
-            "score": sentiment_score,
-            "explanation": explanation
-        }
-    except Exception as e:
-        print(f"⚠️ שגיאה בקטגוריית sentiment: {e}")
-        scores["sentiment"] = {
-            "score": 50,
-            "explanation": "שגיאה או חוסר נתונים – ברירת מחדל"
-        }
+# קטגוריות חדשות שיש להן גם ציון דועך בזמן (נשמר ע"י ה־listener)
+DECAYED_CATEGORIES = ["sentiment", "macro", "futures_vix"]
 
-    # === Macro ===
-    try:
-        df_macro = fetch_macro_news()
-        macro_score, explanation = calculate_macro_score(df_macro)
-        scores["macro"] = {
-            "score": macro_score,
-            "explanation": explanation
-        }
-    except Exception as e:
-        print(f"⚠️ שגיאה בקטגוריית macro: {e}")
-        scores["macro"] = {
-            "score": 50,
-            "explanation": "שגיאה או חוסר נתונים – ברירת מחדל"
-        }
 
-    # === Bonds ===
-    try:
-        xml = fetch_treasury_yield_xml()
-        yields = extract_yields_from_treasury_xml(xml)
-        if not yields:
-            raise ValueError("אין תשואות")
-        bond_score, explanation = calculate_bond_score(yields)
-        scores["bonds"] = {
-            "score": bond_score,
-            "explanation": explanation
-        }
-    except Exception as e:
-        print(f"⚠️ שגיאה בקטגוריית bonds: {e}")
-        scores["bonds"] = {
-            "score": 50,
-            "explanation": "שגיאה או חוסר נתונים – ברירת מחדל"
-        }
+def calculate_decayed_score(store: DecayedSentiment, category: str, ts: float | None = None) -> tuple[int, str]:
+    """ציון סנטימנט דועך בזמן לקטגוריה – כתבות חדשות שוקלות יותר, בלי חדשות הציון חוזר ל־50"""
+    result = store.score(category, ts=ts)
+    if result is None:
+        return 50, "🔒 אין כתבות שנותחו עבור הציון הדועך"
+    score, mass = result
+    by_source = sorted(
+        ((source, store.score(category, source, ts)) for source in store.sources(category)),
+        key=lambda item: item[1][1],
+        reverse=True,
+    )
+    top = ", ".join(f"{urlsplit(source).netloc or source}: {s:.0f}" for source, (s, _) in by_source[:3])
+    explanation = (
+        f"⏳ זמן מחצית {store.half_life_hours(category):g} ש׳, משקל אפקטיבי {mass:.1f} כתבות"
+        + (f" | מקורות מובילים: {top}" if top else "")
+    )
+    return round(score), explanation
 
-    # === Futures/VIX ===
-    try:
-        df_fut = fetch_futures_news()
-        fut_score, explanation = calculate_futures_score(df_fut)
-        scores["futures_vix"] = {
-            "score": fut_score,
-            "explanation": explanation
-        }
-    except Exception as e:
-        print(f"⚠️ שגיאה בקטגוריית futures_vix: {e}")
-        scores["futures_vix"] = {
-            "score": 50,
-            "explanation": "שגיאה או חוסר נתונים – ברירת מחדל"
-        }
 
-    # === MES + שינוי יומי, כיוון, open/close ===
-    try:
-        df_mes = load_mes_local_data()
-        mes_score, explanation = calculate_mes_score(df_mes)
-        scores["mes"] = {
-            "score": mes_score,
-            "explanation": explanation
-        }
+def _default(explanation: str = "שגיאה או חוסר נתונים – ברירת מחדל", score=50) -> dict:
+    return {"score": score, "explanation": explanation}
 
-        # חישוב שינוי יומי באחוזים לפי close/open
-        daily_change = ((df_mes["close"].iloc[-1] - df_mes["open"].iloc[-1]) / df_mes["open"].iloc[-1]) * 100
-        scores["daily_change_pct"] = {
-            "score": round(daily_change, 2),
-            "explanation": "שינוי יומי באחוזים לפי MES"
-        }
 
-        # הוספת ערכים של open ו-close
-        scores["open"] = {
-            "score": round(df_mes["open"].iloc[-1], 2),
-            "explanation": "מחיר פתיחה יומי של MES"
-        }
-        scores["close"] = {
-            "score": round(df_mes["close"].iloc[-1], 2),
-            "explanation": "מחיר סגירה יומי של MES"
-        }
+def _sentiment_scores(registry) -> dict:
+    # המונים היומיים של ה־listener; חישוב מלא מה־CSV רק אם אין מונים להיום
+    sentiment_score, explanation = load_sentiment_score()
+    return {"sentiment": {"score": sentiment_score, "explanation": explanation}}
 
-        # יצירת כיוון תנועה על סמך שינוי באחוזים עם סף של 0.3%
-        direction_value = 1 if daily_change > 0.3 else -1 if daily_change < -0.3 else 0
-        scores["direction"] = {
+
+def _macro_scores(registry) -> dict:
+    df_macro = fetch_macro_news(registry)
+    macro_score, explanation = calculate_macro_score(df_macro)
+    return {"macro": {"score": macro_score, "explanation": explanation}}
+
+
+def _bonds_scores(registry) -> dict:
+    yields = load_latest_yields()
+    if not yields:
+        raise ValueError("אין תשואות")
+    bond_score, explanation = calculate_bond_score(yields)
+    return {"bonds": {"score": bond_score, "explanation": explanation}}
+
+
+def _futures_scores(registry) -> dict:
+    df_fut = fetch_futures_news(registry)
+    fut_score, explanation = calculate_futures_score(df_fut)
+    return {"futures_vix": {"score": fut_score, "explanation": explanation}}
+
+
+def _decayed_scores(registry) -> dict:
+    # ציונים דועכים בזמן – וריאנט לצד הציונים מבוססי הספירה
+    decayed = DecayedSentiment()
+    scores = {}
+    for cat in DECAYED_CATEGORIES:
+        decayed_score, explanation = calculate_decayed_score(decayed, cat)
+        scores[f"{cat}_decayed"] = {"score": decayed_score, "explanation": explanation}
+    return scores
+
+
+def _mes_scores(registry) -> dict:
+    # MES + שינוי יומי, כיוון, open/close
+    df_mes = load_mes_local_data()
+    mes_score, explanation = calculate_mes_score(df_mes)
+    # חישוב שינוי יומי באחוזים לפי close/open
+    daily_change = ((df_mes["close"].iloc[-1] - df_mes["open"].iloc[-1]) / df_mes["open"].iloc[-1]) * 100
+    # יצירת כיוון תנועה על סמך שינוי באחוזים עם סף של 0.3%
+    direction_value = 1 if daily_change > 0.3 else -1 if daily_change < -0.3 else 0
+    return {
+        "mes": {"score": mes_score, "explanation": explanation},
+        "daily_change_pct": {"score": round(daily_change, 2), "explanation": "שינוי יומי באחוזים לפי MES"},
+        "open": {"score": round(df_mes["open"].iloc[-1], 2), "explanation": "מחיר פתיחה יומי של MES"},
+        "close": {"score": round(df_mes["close"].iloc[-1], 2), "explanation": "מחיר סגירה יומי של MES"},
+        "direction": {
             "score": direction_value,
-            "explanation": "כיוון תנועה יומית על סמך MES: 1=עלייה, -1=ירידה, 0=נייטרלי"
-        }
+            "explanation": "כיוון תנועה יומית על סמך MES: 1=עלייה, -1=ירידה, 0=נייטרלי",
+        },
+    }
 
-    except Exception as e:
-        print(f"⚠️ שגיאה ב־MES או daily_change_pct: {e}")
-        scores["mes"] = {
-            "score": 0,
-            "explanation": "שגיאה ב־calculate_mes_score או ב־df_mes"
-        }
-        scores["daily_change_pct"] = {
-            "score": 0,
-            "explanation": "שגיאה או חוסר נתונים"
-        }
 
-    # === Sectors ===
+def _sectors_scores(registry) -> dict:
+    sector_score, explanation = calculate_sectors_score()
+    return {"sectors": {"score": sector_score, "explanation": explanation}}
+
+
+# (שם, פונקציה, ברירת מחדל) – לפי סדר ההצגה; כל קטגוריה רצה ב־thread משלה
+CATEGORY_TASKS = [
+    ("sentiment", _sentiment_scores, lambda: {"sentiment": _default()}),
+    ("macro", _macro_scores, lambda: {"macro": _default()}),
+    ("bonds", _bonds_scores, lambda: {"bonds": _default()}),
+    ("futures_vix", _futures_scores, lambda: {"futures_vix": _default()}),
+    ("decayed", _decayed_scores, lambda: {f"{cat}_decayed": _default() for cat in DECAYED_CATEGORIES}),
+    ("mes", _mes_scores, lambda: {
+        "mes": _default("שגיאה ב־calculate_mes_score או ב־df_mes", score=0),
+        "daily_change_pct": _default("שגיאה או חוסר נתונים", score=0),
+    }),
+    ("sectors", _sectors_scores, lambda: {"sectors": _default()}),
+]
+
+# זמן מקסימלי (שניות) לכל קטגוריה, ומועד אחרון כולל לכל הסבב
+CATEGORY_TIMEOUTS = {
+    "sentiment": 30,
+    "macro": 45,
+    "bonds": 30,
+    "futures_vix": 45,
+    "decayed": 10,
+    "mes": 20,
+    "sectors": 30,
+}
+DEFAULT_CATEGORY_TIMEOUT = 30
+GLOBAL_DEADLINE = 60
+
+
+def _start(fn, *args) -> Future:
+    """מריץ את fn ב־thread רקע (daemon) – קטגוריה תקועה לא מעכבת את סיום התהליך"""
+    future = Future()
+
+    def run():
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(fn(*args))
+        except BaseException as e:
+            future.set_exception(e)
+
+    threading.Thread(target=run, daemon=True).start()
+    return future
+
+
+def load_all_scores(timeouts: dict | None = None, deadline: float = GLOBAL_DEADLINE):
+    """מריץ את כל הקטגוריות במקביל ומחזיר מילון ציונים.
+
+    כל קטגוריה מקבלת זמן מקסימלי משלה (CATEGORY_TIMEOUTS) וכולן כפופות למועד אחרון כולל.
+    קטגוריה שנכשלה או לא הסתיימה בזמן מקבלת את ברירת המחדל (50).
+    משך הריצה של כל קטגוריה נשמר בשדה "seconds" של הציון הראשון שלה.
+    """
+    timeouts = {**CATEGORY_TIMEOUTS, **(timeouts or {})}
+    scores = {}
+
+    # סבב משיכה אחד לכל הפידים של הקטגוריות – כל URL נמשך ומנותח פעם אחת בלבד
     try:
-        sector_score, explanation = calculate_sectors_score()
-        scores["sectors"] = {
-            "score": sector_score,
-            "explanation": explanation
-        }
+        registry = FeedRegistry.from_config(categories=NEWS_CATEGORIES)
+        print(f"📡 טוען {len(registry.urls)} פידי RSS ייחודיים עבור {', '.join(NEWS_CATEGORIES)}")
     except Exception as e:
-        print(f"⚠️ שגיאה בקטגוריית sectors: {e}")
-        scores["sectors"] = {
-            "score": 50,
-            "explanation": "שגיאה או חוסר נתונים – ברירת מחדל"
-        }
+        print(f"⚠️ שגיאה בטעינת רשימת הפידים: {e}")
+        registry = None
+
+    started = time.monotonic()
+    futures = {name: _start(fn, registry) for name, fn, _ in CATEGORY_TASKS}
+    finished_at = {}
+    for name, future in futures.items():
+        future.add_done_callback(lambda _, name=name: finished_at.setdefault(name, time.monotonic()))
 
+    for name, _, fallback in CATEGORY_TASKS:
+        future = futures[name]
+        due = started + min(timeouts.get(name, DEFAULT_CATEGORY_TIMEOUT), deadline)
+        try:
+            result = future.result(timeout=max(0.0, due - time.monotonic()))
+        except FutureTimeout:
+            print(f"⏱️ קטגוריית {name} לא הסתיימה בזמן – ברירת מחדל")
+            result = fallback()
+            next(iter(result.values()))["explanation"] = "⏱️ חריגה מזמן החישוב – ברירת מחדל"
+        except Exception as e:
+            print(f"⚠️ שגיאה בקטגוריית {name}: {e}")
+            result = fallback()
+        seconds = finished_at.get(name, time.monotonic()) - started
+        next(iter(result.values()))["seconds"] = round(seconds, 2)
+        scores.update(result)
+
+    print(f"⏱️ כל הקטגוריות חושבו תוך {time.monotonic() - started:.1f} שניות")
     return scores
 
 
@@ -220,12 +278,31 @@ def determine_market_bias(score: int, thresholds_path: Path | None = None) -> st
         return "❌ SHORT"
     return "🔒 NEUTRAL"
 
-def save_scores_to_log(scores: dict, final_score: int, bias: str, path: Path | None = None) -> None:
+def _last_logged_snapshot(log_path: Path) -> str | None:
+    """ערך snapshot_at של השורה האחרונה ב־score_log.csv (None אם אין עמודה כזו)"""
+    if not log_path.exists():
+        return None
+    with open(log_path, "r", newline="", encoding="utf-8") as f:
+        rows = list(csv.reader(f))
+    if len(rows) < 2 or "snapshot_at" not in rows[0]:
+        return None
+    index = rows[0].index("snapshot_at")
+    return rows[-1][index] if index < len(rows[-1]) else None
+
+
+def save_scores_to_log(scores: dict, final_score: int, bias: str, path: Path | None = None,
+                       snapshot_at: str | None = None) -> bool:
     """שומר את תוצאות היום לקובץ score_log.csv.
 
     אם לא סופק נתיב, ישתמש בנתיב תחת CONFIG_DIR. יוצר את הקובץ אם אינו קיים.
+    snapshot_at – זמן ה־snapshot שממנו נלקחו הציונים; snapshot שכבר נרשם בשורה
+    האחרונה לא נרשם שוב (ריצות חוזרות בתוך ה־TTL לא משכפלות שורות אימון).
+    מחזיר True אם נוספה שורה.
     """
     log_path = Path(path) if path else CONFIG_DIR / "score_log.csv"
+    if snapshot_at is not None and _last_logged_snapshot(log_path) == snapshot_at:
+        print(f"⏭️ snapshot מ־{snapshot_at} כבר נרשם ב־score_log.csv – לא נוספה שורה")
+        return False
     date_str = datetime.now().strftime("%Y-%m-%d")
     # הכנת שורה עם הערכים
     row: dict[str, object] = {
@@ -233,6 +310,8 @@ def save_scores_to_log(scores: dict, final_score: int, bias: str, path: Path | N
         "final_score": final_score,
         "bias": bias,
     }
+    if snapshot_at is not None:
+        row["snapshot_at"] = snapshot_at
     # אם חסר sectors – הוסף ברירת מחדל
     if "sectors" not in scores:
         scores["sectors"] = {
@@ -246,22 +325,75 @@ def save_scores_to_log(scores: dict, final_score: int, bias: str, path: Path | N
             row[cat] = score_value
         else:
             row[f"{cat}_score"] = score_value
+    # זמני החישוב של כל קטגוריה (load_all_scores) – בעמודות נפרדות אחרי הציונים
+    for cat, result in scores.items():
+        if "seconds" in result:
+            row[f"{cat}_seconds"] = result["seconds"]
     # כתיבה לקובץ
-    file_exists = log_path.exists()
     log_path.parent.mkdir(parents=True, exist_ok=True)
+    header = []
+    if log_path.exists():
+        with open(log_path, "r", newline="", encoding="utf-8") as f:
+            header = next(csv.reader(f), [])
+    new_columns = [col for col in row if col not in header]
+    if header and new_columns:
+        # עמודות חדשות (למשל ציון חדש) – כותבים מחדש את הכותרת כדי שהעמודות לא יזוזו;
+        # העמודות החדשות נוספות בסוף, כך שהשורות הקיימות נשארות כמו שהן
+        with open(log_path, "r", newline="", encoding="utf-8") as f:
+            old_rows = list(csv.reader(f))[1:]
+        tmp_path = log_path.with_suffix(".tmp")
+        with open(tmp_path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(header + new_columns)
+            writer.writerows(old_rows)
+        os.replace(tmp_path, log_path)
+        header = header + new_columns
     with open(log_path, "a", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=row.keys())
-        if not file_exists:
+        writer = csv.DictWriter(f, fieldnames=header or list(row))
+        if not header:
             writer.writeheader()
         writer.writerow(row)
     print(f"💾 נשמר ל־score_log.csv ({log_path})")
+    return True
+
+
+
+def refresh_snapshot(path: Path = SNAPSHOT_PATH) -> dict:
+    """מחשב את כל הקטגוריות, את הציון הסופי ואת ההמלצה – ושומר snapshot משותף"""
+    scores = load_all_scores()
+    weighted_score = calculate_weighted_score(scores)
+    return write_snapshot(scores, weighted_score, determine_market_bias(weighted_score), path)
 
 
+def load_scores_snapshot(max_age: float = SNAPSHOT_INTERVAL, path: Path = SNAPSHOT_PATH) -> dict:
+    """ה־snapshot האחרון אם הוא צעיר מ־max_age שניות, אחרת חישוב מחדש"""
+    snapshot = read_snapshot(path, max_age=max_age)
+    if snapshot is not None:
+        print(f"📦 ציונים מ־snapshot של {snapshot['created_at']} (לפני {snapshot_age(snapshot):.0f} שניות)")
+        return snapshot
+    return refresh_snapshot(path)
+
+
+def run_snapshot_service(interval: float = SNAPSHOT_INTERVAL) -> None:
+    """מפיק snapshot פעם ב־interval שניות – הדשבורד וריצות final_score קוראים ממנו בלי לגשת לרשת"""
+    while True:
+        started = time.monotonic()
+        try:
+            snapshot = refresh_snapshot()
+            print(f"📦 snapshot נשמר: ציון סופי {snapshot['final_score']} | {snapshot['bias']}")
+        except Exception as e:
+            print(f"⚠️ שגיאה בהפקת snapshot: {e}")
+        time.sleep(max(0.0, interval - (time.monotonic() - started)))
+
 
 if __name__ == "__main__":
-    all_scores = load_all_scores()
-    weighted_score = calculate_weighted_score(all_scores)
-    decision = determine_market_bias(weighted_score)
+    if "--serve" in sys.argv:
+        run_snapshot_service()
+
+    snapshot = load_scores_snapshot()
+    all_scores = snapshot["scores"]
+    weighted_score = snapshot["final_score"]
+    decision = snapshot["bias"]
 
     print("\n📊 ציונים לפי קטגוריה:")
     for cat, result in all_scores.items():
@@ -269,4 +401,4 @@ if __name__ == "__main__":
     print(f"\n🎯 ציון סופי משוקלל: {weighted_score}/100")
     print(f"\n📌 המלצה יומית: {decision}")
 
-    save_scores_to_log(all_scores, weighted_score, decision)
+    save_scores_to_log(all_scores, weighted_score, decision, snapshot_at=snapshot["created_at"])
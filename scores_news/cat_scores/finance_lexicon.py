@@ -0,0 +1,160 @@
+# cat_scores/finance_lexicon.py
+"""
+Market-specific phrase lexicon compiled into a word-level Aho-Corasick automaton.
+
+Generic VADER misreads market language: "beat" and "short squeeze" carry no
+valence for it, and "cut rates" reads as negative.  ``config/sentiment_keywords.json``
+holds weighted phrases on VADER's -4..+4 valence scale.  They are compiled
+once into an automaton whose alphabet is tokens (not characters), so:
+
+* a text is scanned in one pass, linear in its number of tokens whatever the
+  size of the lexicon;
+* matches always fall on word boundaries ("beat" never matches "upbeat").
+
+Overlapping matches resolve leftmost-longest ("cut rates" wins over "cut").
+A match directly preceded by a negation ("not", "failed to", ...) is flipped
+with VADER's negation scalar.  The summed valence is normalized like VADER's
+compound, and :func:`FinanceLexicon.blend` mixes it with the VADER score.
+"""
+
+import hashlib
+import json
+import math
+import re
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[2]
+KEYWORDS_PATH = BASE_DIR / "scores_news" / "config" / "sentiment_keywords.json"
+
+N_SCALAR = -0.74  # כמו ב־VADER
+_TOKEN_RE = re.compile(r"[a-z0-9]+(?:[-'’][a-z0-9]+)*")
+
+
+def tokenize(text: str) -> list:
+    return _TOKEN_RE.findall(text.lower())
+
+
+class AhoCorasick:
+    """Aho-Corasick automaton over token sequences.
+
+    ``patterns`` maps a tuple of tokens to a value; :meth:`finditer` yields
+    ``(start, end, value)`` for every occurrence (``end`` exclusive).
+    """
+
+    def __init__(self, patterns: dict) -> None:
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]  # state -> [(length, value)]
+        for tokens, value in patterns.items():
+            self._insert(tuple(tokens), value)
+        self._build()
+
+    def _insert(self, tokens: tuple, value) -> None:
+        state = 0
+        for token in tokens:
+            nxt = self._goto[state].get(token)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][token] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = nxt
+        self._out[state].append((len(tokens), value))
+
+    def _build(self) -> None:
+        # BFS – קישורי כישלון ואיחוד פלטים של סיומות
+        queue = list(self._goto[0].values())
+        head = 0
+        while head < len(queue):
+            state = queue[head]
+            head += 1
+            for token, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and token not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(token, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def finditer(self, tokens: list):
+        state = 0
+        goto, fail, out = self._goto, self._fail, self._out
+        for end, token in enumerate(tokens, start=1):
+            while state and token not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(token, 0)
+            for length, value in out[state]:
+                yield end - length, end, value
+
+    def __len__(self) -> int:
+        return len(self._goto)
+
+
+class FinanceLexicon:
+    """Weighted market phrases with negation handling and VADER blending."""
+
+    def __init__(self, phrases: dict, negations=(), blend_weight: float = 0.5) -> None:
+        self.blend_weight = blend_weight
+        self.phrases = {p: float(w) for p, w in phrases.items() if tokenize(p)}
+        self._automaton = AhoCorasick({tuple(tokenize(p)): w for p, w in self.phrases.items()})
+        self._negations = {tuple(tokenize(n)) for n in negations if tokenize(n)}
+        self._max_negation = max((len(n) for n in self._negations), default=0)
+        payload = json.dumps([sorted(self.phrases.items()), sorted(self._negations), blend_weight])
+        self.fingerprint = hashlib.blake2b(payload.encode("utf-8"), digest_size=8).hexdigest()
+
+    @classmethod
+    def load(cls, path: Path | str = KEYWORDS_PATH) -> "FinanceLexicon":
+        """Load the lexicon from ``sentiment_keywords.json``; a missing/invalid file yields an empty lexicon."""
+        path = Path(path)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                config = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ לקסיקון פיננסי לא נטען ({path}): {e}")
+            return cls({})
+        return cls(
+            config.get("phrases", {}),
+            config.get("negations", []),
+            config.get("blend_weight", 0.5),
+        )
+
+    def _negated(self, tokens: list, start: int) -> bool:
+        for size in range(1, self._max_negation + 1):
+            if start >= size and tuple(tokens[start - size:start]) in self._negations:
+                return True
+        return False
+
+    def matches(self, text: str) -> list:
+        """Non-overlapping ``(phrase_tokens, valence)`` matches, leftmost-longest."""
+        tokens = tokenize(text)
+        found = sorted(self._automaton.finditer(tokens), key=lambda m: (m[0], m[0] - m[1]))
+        result = []
+        covered = 0
+        for start, end, weight in found:
+            if start < covered:
+                continue
+            if self._negated(tokens, start):
+                weight *= N_SCALAR
+            result.append((tuple(tokens[start:end]), weight))
+            covered = end
+        return result
+
+    def score(self, text: str):
+        """Normalized (-1..1) valence of the matched phrases, or None when nothing matched."""
+        hits = self.matches(text)
+        if not hits:
+            return None
+        total = sum(weight for _, weight in hits)
+        return total / math.sqrt(total * total + 15)
+
+    def blend(self, vader_compound: float, text: str) -> float:
+        finance = self.score(text)
+        if finance is None:
+            return vader_compound
+        blended = (1 - self.blend_weight) * vader_compound + self.blend_weight * finance
+        return round(max(-1.0, min(1.0, blended)), 4)
+
+    def __len__(self) -> int:
+        return len(self.phrases)
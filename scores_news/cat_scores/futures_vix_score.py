@@ -1,11 +1,12 @@
 # futures_vix_score.py
 
 
-import feedparser
 import yaml
 import pandas as pd
 from pathlib import Path
-from scores_news.cat_scores.nlp_utils import analyze_articles
+from scores_news.cat_scores.nlp_utils import analyze_texts, article_text
+from scores_news.utils.near_dup import dedupe_articles
+from scores_news.utils.feed_engine import fetch_articles
 import yfinance as yf
 
 # ---------------------------------------------------------------
@@ -26,32 +27,25 @@ def load_futures_feeds(config_path: Path | None = None) -> list:
     return config.get("rss_feeds", {}).get("futures_vix", [])
 
 
-def fetch_futures_news():
+def fetch_futures_news(registry=None):
+    """משוך את כל כתבות ה־futures/vix מכל הפידים במקביל.
+
+    אם סופק FeedRegistry – הכתבות נלקחות מהסבב המשותף שלו.
+    """
+    if registry is not None:
+        return pd.DataFrame(registry.articles_for("futures_vix"))
     urls = load_futures_feeds()
-    articles = []
-    for url in urls:
-        try:
-            feed = feedparser.parse(url)
-            for entry in feed.entries:
-                articles.append({
-                    "title": entry.get("title", ""),
-                    "summary": entry.get("summary", ""),
-                    "link": entry.get("link", ""),
-                    "published": entry.get("published", ""),
-                    "source": url
-                })
-        except Exception as e:
-            print(f"⚠️ שגיאה ב־{url}: {e}")
+    articles = fetch_articles(urls)
     return pd.DataFrame(articles)
 
 
 def calculate_futures_score(df: pd.DataFrame) -> tuple[int, str]:
-    articles = df.to_dict(orient="records")
-    enriched = analyze_articles(articles)
-    df_enriched = pd.DataFrame(enriched)
+    # ידיעה שהופצה בכמה מקורות נספרת פעם אחת
+    articles = dedupe_articles(df.to_dict(orient="records"))
+    _, labels = analyze_texts([article_text(a) for a in articles])
 
-    pos = (df_enriched["sentiment_label"] == "positive").sum()
-    neg = (df_enriched["sentiment_label"] == "negative").sum()
+    pos = int((labels == "positive").sum())
+    neg = int((labels == "negative").sum())
     total = pos + neg
 
     if total == 0:
@@ -1,10 +1,11 @@
 import yaml
 import os
-import feedparser
 import pandas as pd
 from datetime import datetime
 from pathlib import Path
-from scores_news.cat_scores.nlp_utils import analyze_articles
+from scores_news.cat_scores.nlp_utils import analyze_texts, article_text
+from scores_news.utils.near_dup import dedupe_articles
+from scores_news.utils.feed_engine import fetch_articles
 
 # ---------------------------------------------------------------
 # נתיב בסיס - משמש למציאת sources.yaml יחסית לפרויקט
@@ -25,36 +26,26 @@ def load_macro_feeds(config_path: Path | None = None) -> list:
     return config.get("rss_feeds", {}).get("macro", [])
 
 
-def fetch_macro_news():
-    """משוך את כל הודעות המאקרו לפי RSS"""
-    urls = load_macro_feeds()
-    all_articles = []
-
-    for url in urls:
-        try:
-            print(f"📡 טוען RSS מאקרו: {url}")
-            feed = feedparser.parse(url)
-            for entry in feed.entries:
-                all_articles.append({
-                    "title": entry.get("title", ""),
-                    "summary": entry.get("summary", ""),
-                    "link": entry.get("link", ""),
-                    "published": entry.get("published", ""),
-                    "source": url
-                })
-        except Exception as e:
-            print(f"⚠️ שגיאה ב־{url}: {e}")
+def fetch_macro_news(registry=None):
+    """משוך את כל הודעות המאקרו לפי RSS (כל הפידים במקביל).
 
+    אם סופק FeedRegistry – הכתבות נלקחות מהסבב המשותף שלו, כך שכל פיד נמשך פעם אחת בלבד.
+    """
+    if registry is not None:
+        return pd.DataFrame(registry.articles_for("macro"))
+    urls = load_macro_feeds()
+    print(f"📡 טוען {len(urls)} פידי RSS מאקרו במקביל")
+    all_articles = fetch_articles(urls)
     return pd.DataFrame(all_articles)
 
 
 def calculate_macro_score(df: pd.DataFrame) -> tuple[int, str]:
-    articles = df.to_dict(orient="records")
-    enriched = analyze_articles(articles)
-    df_enriched = pd.DataFrame(enriched)
+    # ידיעה שהופצה בכמה מקורות נספרת פעם אחת
+    articles = dedupe_articles(df.to_dict(orient="records"))
+    _, labels = analyze_texts([article_text(a) for a in articles])
 
-    pos = (df_enriched["sentiment_label"] == "positive").sum()
-    neg = (df_enriched["sentiment_label"] == "negative").sum()
+    pos = int((labels == "positive").sum())
+    neg = int((labels == "negative").sum())
     total = pos + neg
 
     if total == 0:
@@ -0,0 +1,235 @@
+# cat_scores/mes_intraday.py
+"""
+Intraday MES score, updated on every closed 1m / 5m bar.
+
+``calculate_mes_score`` compares the last two daily closes, so the bias
+cannot move during the session.  :class:`IntradayMES` instead ingests bars
+one at a time and keeps every indicator as running state, so each bar costs
+O(1) whatever the length of the session:
+
+* session return – from the previous session's close (or the session open);
+* session range and Wilder ATR – running high/low, recursive ATR;
+* VWAP distance – cumulative price·volume / volume, reset every session;
+* realized volatility – root of the running sum of squared log returns over
+  the last ``rv_window`` bars (a deque plus the running sum).
+
+Sessions follow the CME Globex day: a new session starts at 18:00 New York
+time.  :func:`run_intraday` polls Yahoo for bars newer than the last one
+ingested (``period1``), feeds only closed bars and prints the score after
+each one.  History is never reloaded.
+"""
+
+import math
+import time
+from collections import deque
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from scores_news.cat_scores.mes_score import fetch_mes_data
+
+SESSION_TZ = ZoneInfo("America/New_York")
+SESSION_START_HOUR = 18  # פתיחת סשן Globex
+INTERVAL_SECONDS = {"1m": 60, "2m": 120, "5m": 300, "15m": 900}
+ATR_PERIOD = 14
+RV_WINDOW = 30  # מספר ברים לתנודתיות ממומשת
+
+
+def session_key(ts: float) -> str:
+    """תאריך המסחר של הבר – סשן שנפתח ב־18:00 שייך ליום שאחריו"""
+    local = datetime.fromtimestamp(ts, SESSION_TZ) + timedelta(hours=24 - SESSION_START_HOUR)
+    return local.strftime("%Y-%m-%d")
+
+
+def trend_score(delta: float) -> int:
+    # אותם ספים כמו בציון היומי
+    if delta > 1:
+        return 90
+    if delta > 0.3:
+        return 70
+    if delta > -0.3:
+        return 50
+    if delta > -1:
+        return 35
+    return 15
+
+
+def range_score(price_range: float) -> int:
+    if price_range > 20:
+        return 90
+    if price_range > 10:
+        return 70
+    if price_range > 5:
+        return 50
+    return 30
+
+
+def vwap_score(distance: float) -> int:
+    """מחיר מעל ה־VWAP = קונים בשליטה; מרחק באחוזים"""
+    if distance > 0.25:
+        return 80
+    if distance > 0.05:
+        return 60
+    if distance > -0.05:
+        return 50
+    if distance > -0.25:
+        return 40
+    return 20
+
+
+class IntradayMES:
+    """Rolling intraday MES indicators, O(1) per bar."""
+
+    def __init__(self, atr_period: int = ATR_PERIOD, rv_window: int = RV_WINDOW) -> None:
+        self.atr_period = atr_period
+        self.rv_window = rv_window
+        self.last_ts = None
+        self.last_close = None
+        self.bars = 0
+        # ATR (Wilder): ממוצע פשוט ל־atr_period הברים הראשונים, אחר כך רקורסיבי
+        self.atr = None
+        self._tr_sum = 0.0
+        self._tr_count = 0
+        # תנודתיות ממומשת על חלון נע
+        self._returns = deque()
+        self._sq_sum = 0.0
+        # מצב הסשן
+        self.session = None
+        self.prev_session_close = None
+        self.session_open = None
+        self.session_high = None
+        self.session_low = None
+        self._pv = 0.0
+        self._volume = 0.0
+
+    def _start_session(self, key: str, open_: float) -> None:
+        if self.session is not None:
+            self.prev_session_close = self.last_close
+        self.session = key
+        self.session_open = open_
+        self.session_high = None
+        self.session_low = None
+        self._pv = 0.0
+        self._volume = 0.0
+
+    def update(self, ts: float, open_: float, high: float, low: float, close: float, volume: float = 0.0) -> bool:
+        """מוסיף בר סגור; בר ישן או כפול (ts <= האחרון) נדחה ומחזיר False"""
+        if self.last_ts is not None and ts <= self.last_ts:
+            return False
+        key = session_key(ts)
+        if key != self.session:
+            self._start_session(key, open_)
+
+        self.session_high = high if self.session_high is None else max(self.session_high, high)
+        self.session_low = low if self.session_low is None else min(self.session_low, low)
+
+        # VWAP לפי המחיר הטיפוסי של הבר
+        typical = (high + low + close) / 3
+        self._pv += typical * (volume or 0.0)
+        self._volume += volume or 0.0
+
+        prev = self.last_close
+        true_range = high - low if prev is None else max(high - low, abs(high - prev), abs(low - prev))
+        if self.atr is None:
+            self._tr_sum += true_range
+            self._tr_count += 1
+            if self._tr_count == self.atr_period:
+                self.atr = self._tr_sum / self.atr_period
+        else:
+            self.atr = (self.atr * (self.atr_period - 1) + true_range) / self.atr_period
+
+        if prev:
+            r = math.log(close / prev)
+            self._returns.append(r)
+            self._sq_sum += r * r
+            if len(self._returns) > self.rv_window:
+                old = self._returns.popleft()
+                self._sq_sum -= old * old
+
+        self.last_ts = ts
+        self.last_close = close
+        self.bars += 1
+        return True
+
+    def ingest(self, df) -> int:
+        """מזין את השורות החדשות של DataFrame (timestamp/open/high/low/close/volume); מחזיר כמה נוספו"""
+        added = 0
+        for row in df.itertuples(index=False):
+            ts = row.timestamp.timestamp() if hasattr(row.timestamp, "timestamp") else float(row.timestamp)
+            if self.update(ts, row.open, row.high, row.low, row.close, getattr(row, "volume", 0.0)):
+                added += 1
+        return added
+
+    @property
+    def vwap(self) -> float | None:
+        return self._pv / self._volume if self._volume else None
+
+    @property
+    def realized_vol(self) -> float:
+        """תנודתיות ממומשת באחוזים על החלון (לא מנורמלת לשנה)"""
+        return math.sqrt(max(self._sq_sum, 0.0)) * 100
+
+    def indicators(self) -> dict:
+        base = self.prev_session_close or self.session_open
+        vwap = self.vwap
+        return {
+            "session": self.session,
+            "close": self.last_close,
+            "session_return": (self.last_close - base) / base * 100 if base else 0.0,
+            "session_range": (self.session_high - self.session_low) if self.session_high is not None else 0.0,
+            "atr": self.atr,
+            "vwap": vwap,
+            "vwap_distance": (self.last_close - vwap) / vwap * 100 if vwap else 0.0,
+            "realized_vol": self.realized_vol,
+        }
+
+    def score(self) -> tuple[int, str]:
+        """ציון MES תוך־יומי: מגמה 50%, מרחק מה־VWAP 20%, טווח הסשן 30%"""
+        if self.last_close is None:
+            return 50, "🔒 אין עדיין ברים תוך־יומיים"
+        ind = self.indicators()
+        trend = trend_score(ind["session_return"])
+        vwap = vwap_score(ind["vwap_distance"])
+        rng = range_score(ind["session_range"])
+        final_score = round(trend * 0.5 + vwap * 0.2 + rng * 0.3)
+        atr = f"{ind['atr']:.2f}" if ind["atr"] is not None else "—"
+        explanation = (
+            f"⏱️ סשן {ind['session']}: {ind['session_return']:.2f}% | טווח: {ind['session_range']:.2f} נק׳ "
+            f"| VWAP {ind['vwap_distance']:+.2f}% | ATR {atr} | RV {ind['realized_vol']:.2f}% "
+            f"(מגמה: {trend}, VWAP: {vwap}, תנודתיות: {rng})"
+        )
+        return final_score, explanation
+
+
+def closed_bars(df, interval: str, now: float | None = None):
+    """רק ברים שנסגרו – הבר האחרון של Yahoo עדיין נבנה ומשתנה עד סופו"""
+    now = now if now is not None else time.time()
+    step = INTERVAL_SECONDS[interval]
+    ends = df["timestamp"].map(lambda t: t.timestamp()) + step
+    return df[ends <= now]
+
+
+def run_intraday(interval: str = "5m", poll_seconds: float | None = None, on_score=None) -> None:
+    """לולאת polling: ברים חדשים בלבד (period1), ציון מעודכן אחרי כל בר"""
+    poll_seconds = poll_seconds or INTERVAL_SECONDS[interval] / 5
+    state = IntradayMES()
+    df = fetch_mes_data(interval=interval, range_days="5d")  # חימום: ATR וסשן קודם
+    state.ingest(closed_bars(df, interval))
+    while True:
+        try:
+            df = fetch_mes_data(interval=interval, since=state.last_ts)
+            new_bars = df[df["timestamp"].map(lambda t: t.timestamp()) > (state.last_ts or 0)]
+            if state.ingest(closed_bars(new_bars, interval)):
+                score, explanation = state.score()
+                if on_score:
+                    on_score(score, explanation, state)
+                else:
+                    print(f"📉 MES Intraday: {score} | {explanation}")
+        except Exception as e:
+            print(f"⚠️ שגיאה במשיכת ברים תוך־יומיים: {e}")
+        time.sleep(poll_seconds)
+
+
+if __name__ == "__main__":
+    import sys
+
+    run_intraday(sys.argv[1] if len(sys.argv) > 1 else "5m")
@@ -1,19 +1,27 @@
 # mes_score.py
 
-import requests
 from datetime import datetime
+import numpy as np
 import pandas as pd
 
+from scores_news.utils.http_client import http_get
 
-def fetch_mes_data(interval="1d", range_days="30d") -> pd.DataFrame:
-    """משיכת נתוני MES=F מ־Yahoo Finance"""
-    url = f"https://query1.finance.yahoo.com/v8/finance/chart/MES=F?interval={interval}&range={range_days}"
-    headers = {"User-Agent": "Mozilla/5.0"}
-    response = requests.get(url, headers=headers)
+
+def fetch_mes_data(interval="1d", range_days="30d", since: float | None = None) -> pd.DataFrame:
+    """משיכת נתוני MES=F מ־Yahoo Finance; עם since – רק ברים מאז ה־timestamp הזה (לעדכון תוך־יומי)"""
+    url = f"https://query1.finance.yahoo.com/v8/finance/chart/MES=F?interval={interval}"
+    if since is not None:
+        url += f"&period1={int(since)}&period2={int(datetime.now().timestamp())}"
+    else:
+        url += f"&range={range_days}"
+    response = http_get(url)
     response.raise_for_status()
     data = response.json()
 
-    timestamps = data["chart"]["result"][0]["timestamp"]
+    timestamps = data["chart"]["result"][0].get("timestamp")
+    if not timestamps:
+        # אין ברים חדשים מאז since
+        return pd.DataFrame(columns=["timestamp", "open", "close", "high", "low", "volume"])
     indicators = data["chart"]["result"][0]["indicators"]["quote"][0]
     closes = indicators["close"]
     highs = indicators["high"]
@@ -21,10 +29,14 @@ def fetch_mes_data(interval="1d", range_days="30d") -> pd.DataFrame:
 
     df = pd.DataFrame({
         "timestamp": pd.to_datetime(timestamps, unit="s"),
+        "open": indicators.get("open", closes),
         "close": closes,
         "high": highs,
         "low": lows,
-    }).dropna()
+        "volume": indicators.get("volume", [0] * len(closes)),
+    }).dropna(subset=["close", "high", "low"])
+    df["open"] = df["open"].fillna(df["close"])
+    df["volume"] = df["volume"].fillna(0)
 
     return df
 
@@ -110,6 +122,48 @@ def calculate_mes_score(df: pd.DataFrame) -> tuple[int, str]:
 
     return final_score, explanation
 
+
+def calculate_mes_scores(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Vectorized ``calculate_mes_score`` over a whole history.
+
+    Row ``i`` of the result holds what ``calculate_mes_score(df.iloc[:i + 1])``
+    would return: ``delta`` (% change from the previous close), ``price_range``,
+    ``trend_score``, ``range_score`` and ``mes_score``.  The first row (no
+    previous close) and every row of a frame without ``close`` or range
+    columns get the neutral 50, like the scalar version.
+    """
+    df_cols = {c.lower(): c for c in df.columns}
+    out = pd.DataFrame(index=df.index)
+    close_col = df_cols.get("close")
+    high_col, low_col, open_col = df_cols.get("high"), df_cols.get("low"), df_cols.get("open")
+    if close_col is None or not ((high_col and low_col) or open_col):
+        out["mes_score"] = 50
+        return out
+
+    close = df[close_col].to_numpy(dtype=float)
+    prev = np.roll(close, 1)
+    # אותו סדר פעולות כמו בגרסה הסקלרית – תוצאה זהה עד הביט
+    delta = (close - prev) / prev * 100
+    if high_col and low_col:
+        price_range = df[high_col].to_numpy(dtype=float) - df[low_col].to_numpy(dtype=float)
+    else:
+        price_range = np.abs(close - df[open_col].to_numpy(dtype=float))
+
+    trend = np.select([delta > 1, delta > 0.3, delta > -0.3, delta > -1], [90, 70, 50, 35], 15)
+    rng = np.select([price_range > 20, price_range > 10, price_range > 5], [90, 70, 50], 30)
+    score = np.rint(trend * 0.7 + rng * 0.3).astype(int)
+    if len(score):
+        delta[0] = np.nan
+        score[0] = 50
+
+    out["delta"] = delta
+    out["price_range"] = price_range
+    out["trend_score"] = trend
+    out["range_score"] = rng
+    out["mes_score"] = score
+    return out
+
 if __name__ == "__main__":
     df = fetch_mes_data()
     score, explanation = calculate_mes_score(df)
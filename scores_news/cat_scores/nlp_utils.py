@@ -1,15 +1,42 @@
 # utils/nlp_utils.py
 
 from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+import atexit
+import hashlib
+import os
 import threading
+from concurrent.futures import ProcessPoolExecutor
+from importlib.metadata import PackageNotFoundError, version as package_version
+
+import numpy as np
+
+from scores_news.cat_scores.fast_vader import FastVader
+from scores_news.cat_scores.finance_lexicon import FinanceLexicon
+from scores_news.cat_scores.transformer_sentiment import load_backend, load_backend_config
+from scores_news.utils.sentiment_cache import SentimentCache
 
 analyzer = SentimentIntensityAnalyzer()
-_sentiment_cache = {}
+# אותם חוקים של VADER עם לקסיקון מקומפל – אותו compound, מהר פי ~7
+_fast_vader = FastVader(analyzer)
+# ביטויי שוק משוקללים (config/sentiment_keywords.json) שמשולבים עם ציון VADER
+finance_lexicon = FinanceLexicon.load()
 _lock = threading.Lock()
+_sentiment_cache = None  # נפתח בשימוש הראשון – ראו _get_cache
+
+# בחירת המנתח: "vader" (ברירת מחדל) או "transformer" – config/sentiment_backend.json
+backend_config = load_backend_config()
+_transformer = None
+_transformer_loaded = False
+
+# מעל סף זה (טקסטים שטרם נותחו) המנה מחולקת ל־pool של תהליכים; מתחתיו
+# עלות הקמת התהליכים והעברת הנתונים גבוהה מהרווח
+PARALLEL_THRESHOLD = 1000
+POOL_WORKERS = os.cpu_count() or 1
+_pool = None
 
 def fast_sentiment_score(text: str) -> float:
-    """שימוש במנוע VADER — מחזיר סנטימנט בין -1 ל־1"""
-    return analyzer.polarity_scores(text)["compound"]
+    """VADER (המימוש המקומפל) משולב עם הלקסיקון הפיננסי — מחזיר סנטימנט בין -1 ל־1"""
+    return finance_lexicon.blend(_fast_vader.compound(text), text)
 
 def classify_sentiment(score: float) -> str:
     """תווית סנטימנט על פי סף"""
@@ -20,42 +47,122 @@ def classify_sentiment(score: float) -> str:
     else:
         return "neutral"
 
-def cached_sentiment(text: str) -> tuple:
-    """בודק אם הטקסט כבר חושב — אם לא, שומר בזיכרון"""
+def get_transformer():
+    """מודל ה־transformer שנבחר בקונפיג (נטען פעם אחת), או None כשעובדים עם VADER"""
+    global _transformer, _transformer_loaded
     with _lock:
-        if text in _sentiment_cache:
-            return _sentiment_cache[text]
+        if not _transformer_loaded:
+            _transformer = load_backend(backend_config)
+            _transformer_loaded = True
+        return _transformer
+
+
+def scorer_version() -> str:
+    """טביעת אצבע של המנתח והלקסיקון – שינוי בהם פוסל את הציונים השמורים"""
+    transformer = get_transformer()
+    if transformer is not None:
+        return f"onnx-{transformer.model_fingerprint}"
+    try:
+        vader_version = package_version("vaderSentiment")
+    except PackageNotFoundError:
+        vader_version = "unknown"
+    lexicon = hashlib.blake2b(repr(sorted(analyzer.lexicon.items())).encode("utf-8"), digest_size=8)
+    return f"vader-{vader_version}-{lexicon.hexdigest()}-fin-{finance_lexicon.fingerprint}"
+
+
+def _get_cache() -> SentimentCache:
+    """מטמון הסנטימנט המשותף (זיכרון + SQLite) – משותף לכל תהליכי ה־pipeline"""
+    global _sentiment_cache
+    if _sentiment_cache is None:
+        version = scorer_version()  # מחוץ לנעילה – scorer_version טוען את ה־backend
+        with _lock:
+            if _sentiment_cache is None:
+                _sentiment_cache = SentimentCache(version)
+    return _sentiment_cache
+
+
+def cached_sentiment(text: str) -> tuple:
+    """בודק אם הטקסט כבר חושב — אם לא, מחשב ושומר במטמון"""
+    cache = _get_cache()
+    score = cache.get(text)
+    if score is None:
+        score = _score_missing([text], PARALLEL_THRESHOLD)[0]
+        cache.set_many({text: score})
+    return score, classify_sentiment(score)
+
+def article_text(article: dict) -> str:
+    """הטקסט שמנותח לכל כתבה – כותרת + תקציר"""
+    title = str(article.get('title') or '')
+    summary = str(article.get('summary') or '')
+    return f"{title} {summary}"
+
 
-    score = fast_sentiment_score(text)
-    label = classify_sentiment(score)
+def _score_chunk(texts: list) -> list:
+    """נקרא בתהליכי ה־pool – כל תהליך מחזיק analyzer משלו"""
+    return [fast_sentiment_score(text) for text in texts]
 
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
     with _lock:
-        _sentiment_cache[text] = (score, label)
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=POOL_WORKERS)
+            atexit.register(_pool.shutdown, wait=False, cancel_futures=True)
+        return _pool
+
+
+def _score_missing(missing: list, parallel_threshold: int) -> list:
+    """ציונים לטקסטים שאינם במטמון – במודל ה־transformer או ב־VADER"""
+    transformer = get_transformer()
+    if transformer is not None:
+        # onnxruntime מנצל בעצמו את כל הליבות – בלי pool של תהליכים
+        return transformer.compound_many(missing)
+    if len(missing) > parallel_threshold and POOL_WORKERS > 1:
+        chunk = -(-len(missing) // (POOL_WORKERS * 4))
+        chunks = [missing[i:i + chunk] for i in range(0, len(missing), chunk)]
+        return [score for part in _get_pool().map(_score_chunk, chunks) for score in part]
+    return _score_chunk(missing)
+
+
+def analyze_texts(texts, parallel_threshold: int = PARALLEL_THRESHOLD) -> tuple[np.ndarray, np.ndarray]:
+    """
+    ניתוח סנטימנט במנה אחת לרשימה או עמודה של טקסטים.
+
+    טקסטים זהים מנותחים פעם אחת, וטקסטים שכבר נותחו (גם בתהליך אחר) נלקחים מהמטמון.
+    כשנבחר backend של transformer הטקסטים החדשים מנותחים בו במנות מרופדות לפי אורך. ב־VADER מנות קטנות מנותחות
+    ברצף בתהליך הנוכחי – VADER הוא Python טהור ו־threads לא מאיצים אותו;
+    מעל ``parallel_threshold`` טקסטים חדשים העבודה מחולקת ל־pool של תהליכים.
+    מחזיר ``(compound, labels)`` – מערכי numpy בסדר הקלט.
+    """
+    texts = [str(t) if t is not None else "" for t in texts]
+    unique = list(dict.fromkeys(texts))
+
+    cache = _get_cache()
+    known = cache.get_many(unique)
+    missing = [t for t in unique if t not in known]
+
+    scores = _score_missing(missing, parallel_threshold) if missing else []
+
+    fresh = dict(zip(missing, scores))
+    cache.set_many(fresh)
+    known.update(fresh)
+
+    compound = np.fromiter((known[t] for t in texts), dtype=float, count=len(texts))
+    labels = np.where(compound > 0.3, "positive", np.where(compound < -0.3, "negative", "neutral"))
+    return compound, labels
+
+
+def to_score_100(compound: np.ndarray) -> np.ndarray:
+    """מיפוי compound (‎-1..1) לסולם 0–100"""
+    return ((np.asarray(compound) + 1) * 50).astype(int)
 
-    return score, label
 
 def analyze_articles(articles: list) -> list:
     """
     מקבל רשימת כתבות ומחזיר אותן עם שדות sentiment_score + sentiment_label
     """
-    results = []
-
-    def process(article):
-        title = str(article.get('title') or '')
-        summary = str(article.get('summary') or '')
-        text = f"{title} {summary}"
-        score, label = cached_sentiment(text)
-        article['sentiment_score'] = int((score + 1) * 50)  # מיפוי ל־0–100
-        article['sentiment_label'] = label
-        results.append(article)
-
-    threads = []
-    for article in articles:
-        t = threading.Thread(target=process, args=(article,))
-        threads.append(t)
-        t.start()
-
-    for t in threads:
-        t.join()
-
-    return results
+    compound, labels = analyze_texts([article_text(a) for a in articles])
+    for article, score, label in zip(articles, to_score_100(compound), labels):
+        article['sentiment_score'] = int(score)  # מיפוי ל־0–100
+        article['sentiment_label'] = str(label)
+    return articles
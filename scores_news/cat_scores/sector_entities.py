@@ -0,0 +1,89 @@
+# cat_scores/sector_entities.py
+"""
+Tag articles to the ``SECTOR_SYMBOLS`` buckets from a ticker / company /
+keyword dictionary (``config/sector_entities.json``).
+
+The dictionary is compiled once:
+
+* company names and sector keywords go into the same word-level
+  Aho-Corasick automaton as the finance lexicon.  One pass over the tokens
+  finds every phrase whatever the size of the dictionary, and matches
+  always fall on word boundaries ("oil" never matches "turmoil");
+* tickers are matched case-sensitively against upper-case words and
+  ``$cashtags`` with one set lookup per word.  Tickers of
+  ``CASHTAG_ONLY_MAX_LEN`` letters or fewer ("MS", "DE", "GE") collide with
+  acronyms, so they only count as ``$MS``; the company name ("morgan
+  stanley") still tags the article.  Headlines written entirely in capitals
+  match cashtags only.
+
+:meth:`SectorEntityMatcher.tag` returns ``{sector: hits}`` for one text.
+The listener adds each tagged article's score to the per-sector daily
+counters, so the sector score never rescans the article set.
+"""
+
+import json
+import re
+from pathlib import Path
+
+from scores_news.cat_scores.finance_lexicon import AhoCorasick, tokenize
+
+BASE_DIR = Path(__file__).resolve().parents[2]
+ENTITIES_PATH = BASE_DIR / "scores_news" / "config" / "sector_entities.json"
+
+# קטגוריית המונים של כל סקטור ב־SentimentAggregates
+AGGREGATE_PREFIX = "sector/"
+
+_TICKER_RE = re.compile(r"(?<![\w$])(\$?)([A-Z][A-Z0-9]{0,4})(?![\w])")
+# טיקרים קצרים מזה נספרים רק כ־$cashtag (אחרת "DE", "MS", "CI" בראשי תיבות מתויגים בטעות)
+CASHTAG_ONLY_MAX_LEN = 2
+
+
+def aggregate_key(sector: str) -> str:
+    return f"{AGGREGATE_PREFIX}{sector}"
+
+
+class SectorEntityMatcher:
+    """Single-pass ticker / company / keyword → sector tagger."""
+
+    def __init__(self, sectors: dict) -> None:
+        self.sectors = list(sectors)
+        self.etfs = {name: spec.get("etf") for name, spec in sectors.items()}
+        self._tickers = {}
+        phrases = {}
+        for name, spec in sectors.items():
+            for ticker in spec.get("tickers", []):
+                self._tickers.setdefault(ticker.upper(), set()).add(name)
+            for phrase in spec.get("companies", []) + spec.get("keywords", []):
+                tokens = tuple(tokenize(phrase))
+                if tokens:
+                    phrases.setdefault(tokens, set()).add(name)
+        self._automaton = AhoCorasick({tokens: frozenset(names) for tokens, names in phrases.items()})
+
+    @classmethod
+    def load(cls, path: Path | str = ENTITIES_PATH) -> "SectorEntityMatcher":
+        """Load the dictionary; a missing/invalid file yields a matcher that tags nothing."""
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                config = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ מילון הישויות של הסקטורים לא נטען ({path}): {e}")
+            return cls({})
+        return cls(config.get("sectors", {}))
+
+    def tag(self, text: str) -> dict:
+        """``{sector: number of entity hits}`` for ``text``."""
+        hits = {}
+        for _, _, names in self._automaton.finditer(tokenize(text)):
+            for name in names:
+                hits[name] = hits.get(name, 0) + 1
+        if self._tickers:
+            all_caps = text.isupper()
+            for cashtag, ticker in _TICKER_RE.findall(text):
+                if not cashtag and (all_caps or len(ticker) <= CASHTAG_ONLY_MAX_LEN):
+                    continue
+                for name in self._tickers.get(ticker, ()):
+                    hits[name] = hits.get(name, 0) + 1
+        return hits
+
+    def tag_many(self, texts) -> list:
+        return [self.tag(text) for text in texts]
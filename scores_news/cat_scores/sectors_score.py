@@ -1,40 +1,73 @@
 # sectors_score.py
 
 
-import requests
 from datetime import datetime
+import numpy as np
 import pandas as pd
 
+from scores_news.cat_scores.sector_entities import aggregate_key
+from scores_news.utils.price_fetcher import PriceFetcher, change_from_closes, fetch_chart, get_fetcher
+from scores_news.utils.sentiment_aggregates import SentimentAggregates
+
+# כל 11 סקטורי ה־SPDR ("consumer" נשאר המפתח של staples לתאימות ללוגים קיימים)
 SECTOR_SYMBOLS = {
     "tech": "XLK",
     "finance": "XLF",
     "health": "XLV",
     "energy": "XLE",
     "consumer": "XLP",
-    "industrial": "XLI"
+    "industrial": "XLI",
+    "discretionary": "XLY",
+    "utilities": "XLU",
+    "materials": "XLB",
+    "real_estate": "XLRE",
+    "communication": "XLC",
 }
 
+# משקל החדשות בציון הסקטורים, ומספר הכתבות שנדרש כדי לקבל את מלוא המשקל
+NEWS_WEIGHT = 0.3
+NEWS_FULL_WEIGHT_ARTICLES = 20
+
+
+def fetch_sector_change(symbol: str) -> float | None:
+    """שינוי יומי של סימול בודד; None כשאין שני ערכי סגירה (ולא 0.0 שמטה את הממוצע)"""
+    return change_from_closes(fetch_chart(symbol))
+
+def sector_news_sentiment(aggregates: SentimentAggregates | None = None, date: str | None = None) -> dict:
+    """ציון חדשות (0–100) ומספר כתבות לכל סקטור, מהמונים היומיים שה־listener מעדכן – בלי לסרוק כתבות"""
+    aggregates = aggregates if aggregates is not None else SentimentAggregates()
+    news = {}
+    for name in SECTOR_SYMBOLS:
+        counters = aggregates.get(aggregate_key(name), date)
+        if counters and counters["total"]:
+            # אותה שקילה כמו בציון הסנטימנט: positive = 1, neutral = 0.5, negative = 0
+            score = (counters["positive"] + 0.5 * counters["neutral"]) / counters["total"] * 100
+            news[name] = (score, counters["total"])
+    return news
+
+
+def blend_news(price_score: int, news: dict) -> tuple[int, str]:
+    """משלב את ציון המחירים עם ציון החדשות; משקל החדשות גדל עם מספר הכתבות"""
+    articles = sum(count for _, count in news.values())
+    if not articles:
+        return price_score, "📰 אין חדשות מתויגות לסקטורים היום"
+    news_score = sum(score * count for score, count in news.values()) / articles
+    weight = NEWS_WEIGHT * min(1.0, articles / NEWS_FULL_WEIGHT_ARTICLES)
+    blended = round((1 - weight) * price_score + weight * news_score)
+    by_sector = ", ".join(f"{name} {score:.0f} ({count})" for name, (score, count) in news.items())
+    return blended, f"📰 חדשות: {news_score:.0f} מ־{articles} כתבות (משקל {weight:.0%}) | {by_sector}"
+
+
+def calculate_sectors_score(aggregates: SentimentAggregates | None = None,
+                            fetcher: PriceFetcher | None = None) -> tuple[int, str]:
+    fetcher = fetcher if fetcher is not None else get_fetcher()
+    # כל ה־ETFs בבקשה אחת (batch) עם נפילה לבקשות מקבילות; סימול שלא הגיע נשאר מחוץ לממוצע
+    changes, missing = fetcher.daily_changes(SECTOR_SYMBOLS.values())
+    results = {name: changes[symbol] for name, symbol in SECTOR_SYMBOLS.items() if symbol in changes}
 
-def fetch_sector_change(symbol: str) -> float:
-    url = f"https://query1.finance.yahoo.com/v8/finance/chart/{symbol}?interval=1d&range=2d"
-    headers = {"User-Agent": "Mozilla/5.0"}
-    response = requests.get(url, headers=headers)
-    response.raise_for_status()
-    data = response.json()
-    closes = data["chart"]["result"][0]["indicators"]["quote"][0]["close"]
-    if len(closes) < 2 or closes[-1] is None or closes[-2] is None:
-        return 0.0
-    change = ((closes[-1] - closes[-2]) / closes[-2]) * 100
-    return round(change, 2)
-
-def calculate_sectors_score() -> tuple[int, str]:
-    results = {}
-    for name, symbol in SECTOR_SYMBOLS.items():
-        try:
-            change = fetch_sector_change(symbol)
-            results[name] = change
-        except:
-            results[name] = 0.0
+    if not results:
+        score, explanation = 50, f"⚠️ אין נתוני מחיר לסקטורים ({', '.join(missing)}) – ציון ניטרלי"
+        return _with_news(score, explanation, aggregates)
 
     avg_change = sum(results.values()) / len(results)
 
@@ -53,6 +86,53 @@ def calculate_sectors_score() -> tuple[int, str]:
         score = 20
 
     explanation = f"שינוי ממוצע: {avg_change:.2f}% | 🟢 {green} סקטורים חיוביים, 🔴 {red} שליליים"
+    if missing:
+        explanation += f" | ⚠️ חסרים נתונים: {', '.join(missing)}"
+    return _with_news(score, explanation, aggregates)
+
+
+def calculate_sectors_scores(closes: pd.DataFrame) -> pd.DataFrame:
+    """
+    גרסה וקטורית של רכיב המחיר ב־calculate_sectors_score על היסטוריה שלמה.
+
+    closes: שורה לכל יום, עמודה לכל ETF (או שם סקטור). שינוי שלא ניתן לחשב (NaN)
+    לא נכנס לממוצע; יום בלי אף נתון מקבל 50. החדשות לא משולבות – הן לא נשמרות היסטורית.
+    """
+    columns = [c for c in list(SECTOR_SYMBOLS.values()) + list(SECTOR_SYMBOLS) if c in closes.columns]
+    values = closes[columns].to_numpy(dtype=float)
+    prev = np.vstack([np.full((1, values.shape[1]), np.nan), values[:-1]])
+    with np.errstate(invalid="ignore", divide="ignore"):
+        changes = np.round((values - prev) / prev * 100, 2)
+        changes[prev == 0] = np.nan
+
+        present = ~np.isnan(changes)
+        count = present.sum(axis=1)
+        # סכימה לפי הסדר של SECTOR_SYMBOLS, כמו sum() בגרסה הסקלרית
+        total = np.zeros(len(changes))
+        for j in range(changes.shape[1]):
+            total = total + np.where(present[:, j], changes[:, j], 0.0)
+        avg_change = total / count
+
+    score = np.select(
+        [count == 0, avg_change > 1, avg_change > 0.3, avg_change > -0.3, avg_change > -1],
+        [50, 80, 65, 50, 35],
+        20,
+    )
+    return pd.DataFrame({
+        "avg_change": avg_change,
+        "green": (present & (changes > 0.3)).sum(axis=1),
+        "red": (present & (changes < -0.3)).sum(axis=1),
+        "missing": len(columns) - count,
+        "sectors_score": score,
+    }, index=closes.index)
+
+
+def _with_news(score: int, explanation: str, aggregates: SentimentAggregates | None) -> tuple[int, str]:
+    try:
+        score, news_explanation = blend_news(score, sector_news_sentiment(aggregates))
+        explanation = f"{explanation} | {news_explanation}"
+    except Exception as e:
+        print(f"⚠️ שגיאה בקריאת חדשות הסקטורים: {e}")
     return score, explanation
 
 
@@ -6,7 +6,9 @@ import os
 import pandas as pd
 import datetime
 from pathlib import Path
-from scores_news.cat_scores.nlp_utils import analyze_articles
+from scores_news.cat_scores.nlp_utils import analyze_texts, article_text
+from scores_news.utils.near_dup import dedupe_articles
+from scores_news.utils.sentiment_aggregates import SentimentAggregates
 
 # ---------------------------------------------------------------
 # נתיב בסיס - מאפשר גישה יחסית לקבצי לוג במקום שימוש בנתיב קבוע
@@ -30,16 +32,9 @@ def load_sentiment_data(date: str | None = None) -> pd.DataFrame:
         return pd.DataFrame()
     return pd.read_csv(path)
 
-def calculate_sentiment_score(df: pd.DataFrame) -> tuple[int, str]:
-    articles = df.to_dict(orient="records")
-    analyzed = analyze_articles(articles)
-    labeled_df = pd.DataFrame(analyzed)
-
-    total = len(labeled_df)
-    pos = (labeled_df["sentiment_label"] == "positive").sum()
-    neg = (labeled_df["sentiment_label"] == "negative").sum()
-    neu = (labeled_df["sentiment_label"] == "neutral").sum()
-
+def score_from_counts(pos: int, neg: int, neu: int) -> tuple[int, str]:
+    """ציון והסבר מתוך ספירת התוויות – משותף לחישוב המלא ולמונים המצטברים"""
+    total = pos + neg + neu
     if total == 0:
         return 50, "🔒 אין מספיק נתונים לחישוב סנטימנט"
 
@@ -52,7 +47,30 @@ def calculate_sentiment_score(df: pd.DataFrame) -> tuple[int, str]:
     return score, explanation
 
 
+def calculate_sentiment_score(df: pd.DataFrame) -> tuple[int, str]:
+    # ידיעה שהופצה בכמה מקורות נספרת פעם אחת
+    articles = dedupe_articles(df.to_dict(orient="records"))
+    _, labels = analyze_texts([article_text(a) for a in articles])
+
+    pos = int((labels == "positive").sum())
+    neg = int((labels == "negative").sum())
+    neu = int((labels == "neutral").sum())
+    return score_from_counts(pos, neg, neu)
+
+
+def load_sentiment_score(date: str | None = None, aggregates: SentimentAggregates | None = None) -> tuple[int, str]:
+    """ציון הסנטימנט של היום.
+
+    קריאה ב־O(1) מהמונים שה־listener מעדכן לכל כתבה חדשה (logs/sentiment_aggregates.json).
+    רק כשאין מונים ליום המבוקש – נופל לחישוב המלא מקובץ sentiment_raw של אותו יום.
+    """
+    aggregates = aggregates if aggregates is not None else SentimentAggregates()
+    counters = aggregates.get("sentiment", date)
+    if counters:
+        return score_from_counts(counters["positive"], counters["negative"], counters["neutral"])
+    return calculate_sentiment_score(load_sentiment_data(date))
+
+
 if __name__ == "__main__":
-    df = load_sentiment_data()
-    score, _ = calculate_sentiment_score(df)
+    score, _ = load_sentiment_score()
     print(score)
\ No newline at end of file
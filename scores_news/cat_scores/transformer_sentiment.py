@@ -0,0 +1,211 @@
+# cat_scores/transformer_sentiment.py
+"""
+Optional CPU transformer backend for headline sentiment.
+
+Runs a local financial sentiment classifier (e.g. FinBERT exported to ONNX and
+int8-quantized with :func:`quantize_model`) through ``onnxruntime`` on CPU.
+The tokenizer is the model's HF ``tokenizer.json``, loaded with the
+``tokenizers`` package.  Neither dependency is required: when they or the
+model files are missing, :func:`load_backend` returns None and ``nlp_utils``
+keeps scoring with VADER.
+
+Throughput comes from how the texts are batched:
+
+* texts are tokenized once, then sorted by token length;
+* each batch is padded only up to the smallest *length bucket* that fits
+  its longest text (e.g. 16/32/64/128), never to ``max_length``;
+* batches are sized dynamically under a ``max_batch_tokens`` budget, so
+  many short headlines run together and long summaries in smaller groups.
+
+The compound score is ``P(positive) - P(negative)``, on the same -1..1
+scale as VADER's compound.  Results go through the persistent
+``SentimentCache`` like every other backend.  ``model_fingerprint`` is part
+of the scorer version, so swapping the model invalidates cached scores.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+
+try:
+    import onnxruntime as ort  # type: ignore
+except ImportError:
+    ort = None
+
+try:
+    from tokenizers import Tokenizer  # type: ignore
+except ImportError:
+    Tokenizer = None
+
+BASE_DIR = Path(__file__).resolve().parents[2]
+BACKEND_CONFIG_PATH = BASE_DIR / "scores_news" / "config" / "sentiment_backend.json"
+
+DEFAULT_SETTINGS = {
+    "model_path": "scores_news/ml_model/sentiment/model.int8.onnx",
+    "tokenizer_path": "scores_news/ml_model/sentiment/tokenizer.json",
+    "labels": ["positive", "negative", "neutral"],
+    "max_length": 128,
+    "length_buckets": [16, 32, 64, 128],
+    "max_batch_size": 64,
+    "max_batch_tokens": 4096,
+    "threads": None,
+}
+
+
+def load_backend_config(path: Path | str = BACKEND_CONFIG_PATH) -> dict:
+    """Read ``sentiment_backend.json``; a missing/invalid file means ``{"backend": "vader"}``."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            config = json.load(f)
+    except (OSError, ValueError):
+        return {"backend": "vader"}
+    config.setdefault("backend", "vader")
+    return config
+
+
+def _resolve(path: str) -> Path:
+    path = Path(path)
+    return path if path.is_absolute() else BASE_DIR / path
+
+
+def _file_fingerprint(path: Path) -> str:
+    digest = hashlib.blake2b(digest_size=8)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def plan_batches(lengths, length_buckets, max_batch_size: int, max_batch_tokens: int) -> list:
+    """
+    Group text indices into padded batches.
+
+    Returns ``[(indices, padded_length), ...]``.  Indices are sorted by token
+    length, so neighbours pad to the same bucket.  A batch is closed when it
+    reaches ``max_batch_size`` texts or when ``rows * padded_length`` would
+    exceed ``max_batch_tokens``.
+    """
+    buckets = sorted(length_buckets)
+    order = sorted(range(len(lengths)), key=lambda i: lengths[i])
+    batches = []
+    current = []
+    current_pad = 0
+    for i in order:
+        pad = next((b for b in buckets if b >= lengths[i]), buckets[-1])
+        width = max(pad, current_pad)
+        if current and (len(current) >= max_batch_size or (len(current) + 1) * width > max_batch_tokens):
+            batches.append((current, current_pad))
+            current, width = [], pad
+        current.append(i)
+        current_pad = width
+    if current:
+        batches.append((current, current_pad))
+    return batches
+
+
+class TransformerSentiment:
+    """ONNX sequence classifier with length-bucketed dynamic batching."""
+
+    def __init__(self, session, tokenizer, settings: dict | None = None, fingerprint: str = "") -> None:
+        settings = {**DEFAULT_SETTINGS, **(settings or {})}
+        self.session = session
+        self.tokenizer = tokenizer
+        self.max_length = int(settings["max_length"])
+        self.length_buckets = sorted(b for b in settings["length_buckets"] if b <= self.max_length) or [self.max_length]
+        self.max_batch_size = int(settings["max_batch_size"])
+        self.max_batch_tokens = int(settings["max_batch_tokens"])
+        labels = [label.lower() for label in settings["labels"]]
+        self._positive = labels.index("positive")
+        self._negative = labels.index("negative")
+        self._input_names = {i.name for i in session.get_inputs()}
+        self.model_fingerprint = fingerprint
+        self.stats = {"texts": 0, "batches": 0, "padded_tokens": 0, "real_tokens": 0}
+
+    @classmethod
+    def from_settings(cls, settings: dict) -> "TransformerSentiment":
+        """Build the backend from config; raises ``RuntimeError`` when it can't run here."""
+        if ort is None or Tokenizer is None:
+            raise RuntimeError("onnxruntime / tokenizers are not installed")
+        settings = {**DEFAULT_SETTINGS, **settings}
+        model_path = _resolve(settings["model_path"])
+        tokenizer_path = _resolve(settings["tokenizer_path"])
+        for path in (model_path, tokenizer_path):
+            if not path.exists():
+                raise RuntimeError(f"missing model file {path}")
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.intra_op_num_threads = int(settings["threads"] or os.cpu_count() or 1)
+        options.inter_op_num_threads = 1
+        session = ort.InferenceSession(str(model_path), options, providers=["CPUExecutionProvider"])
+
+        tokenizer = Tokenizer.from_file(str(tokenizer_path))
+        tokenizer.no_padding()
+        tokenizer.enable_truncation(int(settings["max_length"]))
+
+        fingerprint = f"{model_path.name}-{_file_fingerprint(model_path)}-{_file_fingerprint(tokenizer_path)}"
+        return cls(session, tokenizer, settings, fingerprint)
+
+    def _encode(self, texts: list) -> list:
+        encodings = self.tokenizer.encode_batch(texts)
+        return [(enc.ids[:self.max_length], enc.type_ids[:self.max_length]) for enc in encodings]
+
+    def _run(self, encoded: list, padded_length: int) -> np.ndarray:
+        rows = len(encoded)
+        input_ids = np.zeros((rows, padded_length), dtype=np.int64)
+        attention = np.zeros((rows, padded_length), dtype=np.int64)
+        type_ids = np.zeros((rows, padded_length), dtype=np.int64)
+        for r, (ids, types) in enumerate(encoded):
+            input_ids[r, :len(ids)] = ids
+            attention[r, :len(ids)] = 1
+            type_ids[r, :len(types)] = types
+        feeds = {"input_ids": input_ids, "attention_mask": attention, "token_type_ids": type_ids}
+        logits = self.session.run(None, {k: v for k, v in feeds.items() if k in self._input_names})[0]
+
+        self.stats["batches"] += 1
+        self.stats["padded_tokens"] += rows * padded_length
+        self.stats["real_tokens"] += int(attention.sum())
+
+        logits = logits - logits.max(axis=1, keepdims=True)
+        probs = np.exp(logits)
+        probs /= probs.sum(axis=1, keepdims=True)
+        return probs[:, self._positive] - probs[:, self._negative]
+
+    def compound_many(self, texts: list) -> list:
+        """Compound score (-1..1, 4 decimals) for every text, in input order."""
+        if not texts:
+            return []
+        encoded = self._encode(list(texts))
+        scores = np.zeros(len(texts), dtype=float)
+        plan = plan_batches([len(ids) for ids, _ in encoded], self.length_buckets,
+                            self.max_batch_size, self.max_batch_tokens)
+        for indices, padded_length in plan:
+            scores[indices] = self._run([encoded[i] for i in indices], padded_length)
+        self.stats["texts"] += len(texts)
+        return [round(float(s), 4) for s in np.clip(scores, -1.0, 1.0)]
+
+    def compound(self, text: str) -> float:
+        return self.compound_many([text])[0]
+
+
+def load_backend(config: dict | None = None):
+    """The transformer backend selected in config, or None for VADER / when it can't be loaded."""
+    config = config if config is not None else load_backend_config()
+    if config.get("backend") != "transformer":
+        return None
+    try:
+        return TransformerSentiment.from_settings(config.get("transformer", {}))
+    except Exception as e:
+        print(f"⚠️ מודל ה־transformer לא נטען, ממשיכים עם VADER: {e}")
+        return None
+
+
+def quantize_model(source: Path | str, target: Path | str) -> Path:
+    """Dynamic int8 quantization of an exported ONNX model (weights int8, activations float)."""
+    from onnxruntime.quantization import QuantType, quantize_dynamic  # type: ignore
+
+    quantize_dynamic(str(source), str(target), weight_type=QuantType.QInt8)
+    return Path(target)
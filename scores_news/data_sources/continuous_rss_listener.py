@@ -2,11 +2,19 @@ import os
 import logging
 import time
 from datetime import datetime
-import feedparser
-from scores_news.cat_scores.nlp_utils import analyze_articles
-from scores_news.utils.cache import RedisCache
+from scores_news.cat_scores.nlp_utils import analyze_texts, article_text, to_score_100
+from scores_news.cat_scores.sector_entities import SectorEntityMatcher, aggregate_key
+from scores_news.utils.cache_codec import codec_stats
+from scores_news.utils.decayed_sentiment import DecayedSentiment
+from scores_news.utils.feed_engine import FeedFetchEngine
+from scores_news.utils.feed_marks import FeedMarks, parse_timestamp
+from scores_news.utils.feed_registry import FeedRegistry
+from scores_news.utils.near_dup import NearDuplicateIndex, fingerprint_text
+from scores_news.utils.poll_scheduler import PollScheduler
+from scores_news.utils.seen_store import SeenStore
+from scores_news.utils.sentiment_aggregates import SentimentAggregates
+from scores_news.utils.tiered_cache import TieredCache
 import pandas as pd
-import json
 
 import sys
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
@@ -33,8 +41,23 @@ logging.info(f"📍 Writing logs to: {os.path.abspath(LOG_PATH)}")
 # קובץ CSV של כתבות
 CSV_PATH = r"/AgentMarket/scores_news/logs/sentiment_new.csv"
 
-# אתחול Redis
-cache = RedisCache()
+# מטמון שכבתי: זיכרון → SQLite → Redis (אם זמין) – ה־seen-set לא נעלם כש־Redis למטה
+cache = TieredCache.default()
+
+# כתבות שכבר טופלו – Bloom filter מסתובב עם בדיקה מדויקת ב־SQLite, נשמר בין הרצות
+seen_store = SeenStore()
+
+# מונים יומיים לכל קטגוריה (חיוביות/שליליות/נייטרליות, סכום ציונים) – הציון נקרא מהם ב־O(1)
+aggregates = SentimentAggregates()
+
+# סנטימנט דועך בזמן לכל קטגוריה ומקור – כתבה חדשה שוקלת יותר מכתבה מלפני 20 שעות
+decayed = DecayedSentiment()
+
+# תיוג כתבות לסקטורים (טיקרים / חברות / מילות מפתח) במעבר אחד – בנוי פעם אחת
+sector_matcher = SectorEntityMatcher.load()
+
+# אינדקס כמעט־כפילויות לכל קטגוריה – ידיעה שהופצה בכמה מקורות תנותח פעם אחת
+near_dup_indexes = {}
 
 # קריאת פידים מתוך קובץ yaml
 import yaml
@@ -44,40 +67,46 @@ with open(CONFIG_PATH, "r", encoding="utf-8") as f:
     feed_config = yaml.safe_load(f)
 
 
-def fetch_feed(url):
-    for attempt in range(2):
-        try:
-            logging.info(f"Fetching RSS feed from internet: {url}")
-            return feedparser.parse(url)
-        except Exception as e:
-            logging.warning(f"Attempt {attempt + 1} failed for {url}: {e}")
-    logging.error(f"Failed to fetch {url} after 2 attempts")
-    return None
+def tag_sectors(rows, labels, scores):
+    """מוסיף כל כתבה מתויגת למונים היומיים של הסקטורים שלה – כל כתבה נספרת פעם אחת"""
+    # אותה כתבה יכולה להגיע בכמה קטגוריות; המפתח בלי קטגוריה מונע ספירה כפולה
+    keys = [f"sectors-tag:{row['link'] or row['title']}" for row in rows]
+    for row, label, score, seen in zip(rows, labels, scores, seen_store.check_and_add(keys)):
+        if seen:
+            continue
+        sectors = sector_matcher.tag(article_text(row))
+        for sector in sectors:
+            aggregates.add(aggregate_key(sector), [label], [score])
+        if sectors:
+            logging.debug(f"🏷️ {row['title']} → {sorted(sectors)}")
+
 
 def handle_new_entries(articles, category):
     logging.info(f"🧪 Handling {len(articles)} articles in category {category}")
     new_entries = []
-    for entry in articles:
-        unique_id = entry.get("link", "")
-        cache_key = f"entry:{unique_id}"
-        if not cache.get(cache_key):
+    published_ts = []
+    # אותו פיד מחולק לכמה קטגוריות, ולכן המפתח כולל את הקטגוריה
+    seen_keys = [
+        f"{category}:{entry.get('link') or entry.get('guid') or entry.get('title', '')}" for entry in articles
+    ]
+    # בדיקה מקומית ב־O(1) לכתבה, בלי round-trip לרשת; הכתבות נרשמות כנראו מיד
+    seen_flags = seen_store.check_and_add(seen_keys)
+    for entry, seen in zip(articles, seen_flags):
+        if not seen:
+            unique_id = entry.get("link", "")
             title = entry.get("title", "").strip()
             summary = entry.get("summary", "").strip()
             link = entry.get("link", "").strip()
             published = entry.get("published", "")
             source = entry.get("source", "")
 
-            logging.info(f"🆕 New entry found in {category}: {title}")
-            cache.set(cache_key, "seen", ttl=600)
+            index = near_dup_indexes.setdefault(category, NearDuplicateIndex())
+            representative, is_duplicate = index.add(unique_id or title, fingerprint_text(entry))
+            if is_duplicate:
+                logging.info(f"🔁 Near-duplicate in {category}: {title} (→ {representative})")
+                continue
 
-            # ניתוח סנטימנט
-            try:
-                analyzed = analyze_articles([entry])[0]
-                sentiment_score = analyzed.get("sentiment_score", None)
-                logging.info(f"🧠 Sentiment score: {sentiment_score}")
-            except Exception as e:
-                logging.error(f"❌ Failed to analyze article: {e}")
-                sentiment_score = None
+            logging.info(f"🆕 New entry found in {category}: {title}")
 
             new_entries.append({
                 "datetime": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
@@ -87,8 +116,24 @@ def handle_new_entries(articles, category):
                 "published": published,
                 "source": source,
                 "category": category,
-                "sentiment_score": sentiment_score
+                "sentiment_score": None
             })
+            published_ts.append(entry.get("published_ts") or parse_timestamp(published))
+
+    # ניתוח סנטימנט לכל הכתבות החדשות במנה אחת
+    if new_entries:
+        try:
+            compound, labels = analyze_texts([article_text(row) for row in new_entries])
+            scores = to_score_100(compound)
+            for row, score, ts in zip(new_entries, scores, published_ts):
+                row["sentiment_score"] = int(score)
+                decayed.add(category, int(score), source=row["source"], ts=ts)
+            counters = aggregates.add(category, labels, scores)
+            logging.info(f"📈 Daily {category} counters: {counters}")
+            tag_sectors(new_entries, labels, scores)
+            logging.info(f"🧠 Sentiment scores: {[row['sentiment_score'] for row in new_entries]}")
+        except Exception as e:
+            logging.error(f"❌ Failed to analyze articles: {e}")
 
     if new_entries:
         df = pd.DataFrame(new_entries)
@@ -99,44 +144,44 @@ def handle_new_entries(articles, category):
 def main():
     logging.info("=== Starting Continuous RSS Listener ===")
     feeds = feed_config["rss_feeds"]  # וידוא גישה נכונה
+    marks = FeedMarks()
+    engine = FeedFetchEngine(cache=cache)
+
+    # כל URL ייחודי נמשך פעם אחת ומחולק לכל הקטגוריות שמנויות עליו
+    registry = FeedRegistry(feeds, engine=engine)
+
+    scheduler = PollScheduler(
+        registry.urls,
+        feed_config.get("polling", {}),
+        macro_urls=feeds.get("macro", []),
+    )
+
     while True:
-        for category, urls in feeds.items():
-            logging.info(f"Checking RSS category: {category}")
-            for url in urls:
-                logging.info(f"🔗 Fetching from URL: {url} (Category: {category})")
-
-                cache_key = f"rss_cache:{url}"
-                raw_data = cache.get(cache_key)
-
-                if raw_data:
-                    try:
-                        parsed_entries = json.loads(raw_data)
-                        feed = type("Feed", (object,), {"entries": parsed_entries})
-                    except Exception as e:
-                        logging.error(f"❌ Failed to parse cached JSON for {cache_key}: {e}")
-                        feed = None
-                else:
-                    feed = fetch_feed(url)
-                    if feed:
-                        # נרמל את הנתונים לשמירה תקינה ב־Redis
-                        entries = []
-                        for entry in feed.entries:
-                            entries.append({
-                                "title": entry.get("title", ""),
-                                "summary": entry.get("summary", ""),
-                                "link": entry.get("link", ""),
-                                "published": entry.get("published", ""),
-                                "source": entry.get("source", "")
-                            })
-                        cache.set(cache_key, json.dumps(entries), ttl=600)
-                        feed = type("Feed", (object,), {"entries": entries})
-
-                if feed:
-                    logging.info(f"✅ Got {len(feed.entries)} entries from: {url}")
-                    handle_new_entries(feed.entries, category)
-
-        logging.info("Sleeping for 300 seconds...\n")
-        time.sleep(300)
+        due = scheduler.pop_due()
+        if due:
+            # רק הפידים שהגיע זמנם נמשכים (במקביל), ומכל פיד רק הכתבות שמעל ה־high-water mark
+            new_items = engine.fetch_new(due, marks)
+            logging.info(f"📊 Polled {len(due)} feeds – fetch stats: {engine.stats}")
+            logging.info(f"🗄️ Cache stats: {cache.stats} | seen-set: {seen_store.stats}")
+            logging.debug(f"🌐 Per-host latency: {engine.host_stats.snapshot()}")
+            logging.debug(f"🗜️ Cache codec: {codec_stats.snapshot()}")
+
+            for url in due:
+                entries = new_items.get(url, [])
+                interval = scheduler.record(url, entries)
+                for category in registry.categories_for(url):
+                    if entries:
+                        logging.info(f"✅ Got {len(entries)} new entries from: {url} (Category: {category})")
+                        handle_new_entries([dict(entry) for entry in entries], category)
+                logging.debug(f"⏱️ Next poll of {url} in {interval:.0f}s")
+
+            marks.save()
+            aggregates.save()
+            decayed.save()
+
+        wait = scheduler.seconds_until_next()
+        logging.info(f"Sleeping for {wait:.0f} seconds...\n")
+        time.sleep(wait)
 
 
 if __name__ == "__main__":
@@ -3,12 +3,12 @@ import logging
 import os
 from datetime import datetime
 
-import feedparser
 import pandas as pd
 import yaml
 
 # from utils.cache import RedisCache, fetch_url_with_cache
-from scores_news.utils.cache import RedisCache, fetch_url_with_cache
+from scores_news.utils.tiered_cache import TieredCache
+from scores_news.utils.feed_engine import FeedFetchEngine
 
 logging.basicConfig(
     level=logging.INFO,
@@ -24,49 +24,23 @@ def load_sentiment_feeds(config_path=r"C:\Users\inter\PycharmProjects\FuturesMar
 
 def fetch_feed_articles(feed_url, cache, timeout=30, retries=1):
     """משיכת כתבות מ־RSS כולל שימוש ב־Redis Cache"""
-
-    headers = {
-        "User-Agent": (
-            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-            "AppleWebKit/537.36 (KHTML, like Gecko) "
-            "Chrome/124.0.0.0 Safari/537.36"
-        )
-    }
-
-    try:
-        raw_feed = fetch_url_with_cache(feed_url, cache, headers=headers, timeout=timeout, retries=retries)
-        feed = feedparser.parse(raw_feed)
-    except Exception as e:
-        logger.error(f"Error fetching feed {feed_url}: {e}")
-        return []
-
-    articles = []
-    for entry in feed.entries:
-        articles.append({
-            "title": entry.get("title", ""),
-            "summary": entry.get("summary", ""),
-            "link": entry.get("link", ""),
-            "published": entry.get("published", ""),
-            "source": feed_url
-        })
-
-    return articles
+    engine = FeedFetchEngine(timeout=timeout, retries=retries, cache=cache)
+    return engine.fetch_all([feed_url])[feed_url]
 
 def fetch_all_sentiment_articles():
-    """משיכת כל הכתבות מכל פידי הסנטימנט עם Cache"""
+    """משיכת כל הכתבות מכל פידי הסנטימנט עם Cache – כל הפידים במקביל"""
     feeds = load_sentiment_feeds()
-    all_articles = []
 
-    cache = RedisCache(ttl_seconds=600)  # Cache ל־10 דקות
+    cache = TieredCache.default(ttl_seconds=600)  # Cache ל־10 דקות (זיכרון → SQLite → Redis)
+    engine = FeedFetchEngine(cache=cache, cache_ttl=600)
 
-    for url in feeds:
-        logger.info(f"📡 טוען RSS: {url}")
-        try:
-            articles = fetch_feed_articles(url, cache)
-            logger.info(f"✅ {len(articles)} כתבות מ־{url}")
-            all_articles.extend(articles)
-        except Exception as e:
-            logger.warning(f"⚠️ שגיאה בהבאת נתונים מ: {url} – {e}")
+    logger.info(f"📡 טוען {len(feeds)} פידי RSS במקביל")
+    results = engine.fetch_all(feeds)
+
+    all_articles = []
+    for url, articles in results.items():
+        logger.info(f"✅ {len(articles)} כתבות מ־{url}")
+        all_articles.extend(articles)
 
     return pd.DataFrame(all_articles)
 
@@ -2,6 +2,7 @@
 import subprocess
 import datetime
 import os
+import sys
 from pathlib import Path
 
 # ---------------------------------------------------------------
@@ -37,6 +38,24 @@ def run_step(script_path: str) -> None:
     except subprocess.CalledProcessError as e:
         log(f"Failed: {script_path} with error: {e}\n")
 
+def run_snapshot_service() -> None:
+    """Keep the score snapshot producer running (``final_score --serve``).
+
+    The dashboard only reads ``logs/score_snapshot.json``; without this
+    service its scores go stale.  Blocks until the service is stopped.
+    """
+    log("Starting score snapshot service (final_score --serve)")
+    try:
+        subprocess.run(
+            ["python", "-m", "scores_news.cat_scores.final_score", "--serve"],
+            cwd=BASE_DIR.parent,
+            check=True,
+        )
+    except KeyboardInterrupt:
+        log("Score snapshot service stopped")
+    except subprocess.CalledProcessError as e:
+        log(f"Score snapshot service failed: {e}")
+
 def main() -> None:
     """Execute the full data collection, scoring, merging, and model training pipeline."""
     log("=== Starting Full System Run ===")
@@ -112,3 +131,6 @@ def main() -> None:
 
 if __name__ == "__main__":
     main()
+    # --serve: אחרי הריצה המלאה ממשיכים להפיק snapshot של ציונים עבור הדשבורד
+    if "--serve" in sys.argv:
+        run_snapshot_service()
@@ -0,0 +1,103 @@
+# rescore_history.py
+"""
+Rebuild the price-based score columns for a whole history in one pass.
+
+``calculate_mes_score``, ``calculate_bond_score`` and
+``calculate_sectors_score`` score one day at a time.  Producing training
+rows with them means one call per day (and per request).  This script uses
+their vectorized twins (``calculate_mes_scores``, ``calculate_bond_scores``,
+``calculate_sectors_scores``) over:
+
+* MES open/close from ``config/MES_data.csv``;
+* every curve already stored in ``logs/yield_curve.json`` (no download);
+* daily closes of the sector ETFs (one ``yfinance`` download, optional).
+
+Years of rows are scored in milliseconds.  The result has one row per MES
+date: ``mes_score``, ``bonds_score`` (the latest curve on or before that
+date), ``sectors_score`` and ``daily_change_pct``.
+"""
+
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from scores_news.cat_scores.bonds_score import calculate_bond_scores
+from scores_news.cat_scores.mes_score import calculate_mes_scores
+from scores_news.cat_scores.sectors_score import SECTOR_SYMBOLS, calculate_sectors_scores
+from scores_news.utils.yield_curve import YieldCurveStore
+
+BASE_DIR = Path(__file__).resolve().parents[2]
+MES_DATA_PATH = BASE_DIR / "scores_news" / "config" / "MES_data.csv"
+OUTPUT_PATH = BASE_DIR / "scores_news" / "ml_model" / "rescored_history.csv"
+
+
+def load_mes_history(path: Path | str = MES_DATA_PATH) -> pd.DataFrame:
+    df = pd.read_csv(path)
+    df.columns = [col.strip().lower() for col in df.columns]
+    df["date"] = pd.to_datetime(df["date"])
+    return df.sort_values("date").reset_index(drop=True)
+
+
+def load_yield_history(store: YieldCurveStore | None = None) -> pd.DataFrame:
+    """כל העקומים השמורים – שורה לכל יום, עמודה לכל טנור"""
+    store = store if store is not None else YieldCurveStore()
+    df = pd.DataFrame.from_dict(store.curves, orient="index")
+    df.index = pd.to_datetime(df.index)
+    return df.sort_index()
+
+
+def fetch_sector_closes(start, end=None) -> pd.DataFrame:
+    """סגירות יומיות של כל ETF הסקטורים בהורדה אחת"""
+    import yfinance as yf
+
+    data = yf.download(list(SECTOR_SYMBOLS.values()), start=start, end=end, progress=False, auto_adjust=False)
+    closes = data["Close"]
+    closes.index = pd.to_datetime(closes.index).tz_localize(None)
+    return closes
+
+
+def rescore_history(mes: pd.DataFrame, yields: pd.DataFrame | None = None,
+                    sector_closes: pd.DataFrame | None = None) -> pd.DataFrame:
+    dates = pd.DatetimeIndex(mes["date"])
+    out = pd.DataFrame({"date": dates.strftime("%Y-%m-%d")})
+    out["mes_score"] = calculate_mes_scores(mes)["mes_score"].to_numpy()
+    out["daily_change_pct"] = ((mes["close"] - mes["open"]) / mes["open"] * 100).round(2).to_numpy()
+
+    if yields is not None and len(yields):
+        bonds = calculate_bond_scores(yields)
+        # העקום האחרון שפורסם עד אותו יום
+        out["bonds_score"] = bonds.reindex(bonds.index.union(dates)).ffill().reindex(dates).fillna(50).astype(int).to_numpy()
+    else:
+        out["bonds_score"] = 50
+
+    if sector_closes is not None and len(sector_closes):
+        sectors = calculate_sectors_scores(sector_closes)["sectors_score"]
+        out["sectors_score"] = sectors.reindex(dates).fillna(50).astype(int).to_numpy()
+    else:
+        out["sectors_score"] = 50
+    return out
+
+
+def main(fetch_sectors: bool = True) -> pd.DataFrame:
+    mes = load_mes_history()
+    yields = load_yield_history()
+    sector_closes = None
+    if fetch_sectors:
+        try:
+            # יום מסחר אחד אחורה כדי שלשורה הראשונה יהיה שינוי יומי
+            sector_closes = fetch_sector_closes(mes["date"].min() - pd.Timedelta(days=7))
+        except Exception as e:
+            print(f"⚠️ שגיאה במשיכת סגירות הסקטורים: {e}")
+
+    start = time.perf_counter()
+    scores = rescore_history(mes, yields, sector_closes)
+    elapsed = time.perf_counter() - start
+
+    scores.to_csv(OUTPUT_PATH, index=False)
+    print(f"✅ {len(scores)} ימים נוקדו ב־{elapsed * 1000:.1f}ms → {OUTPUT_PATH}")
+    return scores
+
+
+if __name__ == "__main__":
+    main()
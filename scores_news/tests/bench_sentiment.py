@@ -0,0 +1,114 @@
+# bench_sentiment.py
+"""השוואת FastVader מול VADER המקורי על כתבות הארכיון (logs/sentiment_raw_*.csv),
+ומדידת latency ו־throughput של מודל ה־transformer (אם הוגדר) מול מסלול VADER.
+
+הרצה: python -m scores_news.tests.bench_sentiment
+"""
+import json
+import time
+from pathlib import Path
+
+import pandas as pd
+from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+
+from scores_news.cat_scores.fast_vader import FastVader
+from scores_news.cat_scores.finance_lexicon import FinanceLexicon
+from scores_news.cat_scores.transformer_sentiment import (
+    BACKEND_CONFIG_PATH,
+    TransformerSentiment,
+    load_backend_config,
+)
+
+LOG_DIR = Path(__file__).resolve().parents[1] / "logs"
+TOLERANCE = 1e-4
+
+
+def load_archived_texts(log_dir: Path = LOG_DIR) -> list:
+    texts = []
+    for path in sorted(log_dir.glob("sentiment_raw_*.csv")):
+        df = pd.read_csv(path)
+        texts += (df["title"].fillna("").astype(str) + " " + df["summary"].fillna("").astype(str)).tolist()
+    return texts
+
+
+def compare(texts: list, rounds: int = 3) -> dict:
+    reference = SentimentIntensityAnalyzer()
+    fast = FastVader(reference)
+
+    expected = [reference.polarity_scores(t)["compound"] for t in texts]
+    actual = [fast.compound(t) for t in texts]
+    mismatches = [(t, e, a) for t, e, a in zip(texts, expected, actual) if abs(e - a) > TOLERANCE]
+
+    def best_of(fn):
+        best = float("inf")
+        for _ in range(rounds):
+            started = time.perf_counter()
+            for t in texts:
+                fn(t)
+            best = min(best, time.perf_counter() - started)
+        return best
+
+    ref_seconds = best_of(reference.polarity_scores)
+    fast_seconds = best_of(fast.compound)
+    return {
+        "texts": len(texts),
+        "mismatches": mismatches,
+        "max_abs_diff": max((abs(e - a) for e, a in zip(expected, actual)), default=0.0),
+        "reference_ms_per_text": ref_seconds / max(len(texts), 1) * 1000,
+        "fast_ms_per_text": fast_seconds / max(len(texts), 1) * 1000,
+        "speedup": ref_seconds / fast_seconds if fast_seconds else float("inf"),
+    }
+
+
+def measure_backend(score_batch, texts: list, batch_size: int = 256, rounds: int = 3) -> dict:
+    """latency למנה ו־throughput של פונקציה שמקבלת רשימת טקסטים ומחזירה ציונים"""
+    batches = [texts[i:i + batch_size] for i in range(0, len(texts), batch_size)]
+    best = float("inf")
+    latencies = []
+    for _ in range(rounds):
+        latencies = []
+        started = time.perf_counter()
+        for batch in batches:
+            t0 = time.perf_counter()
+            score_batch(batch)
+            latencies.append(time.perf_counter() - t0)
+        best = min(best, time.perf_counter() - started)
+    latencies.sort()
+    return {
+        "texts_per_second": len(texts) / best if best else float("inf"),
+        "p50_batch_ms": latencies[len(latencies) // 2] * 1000 if latencies else 0.0,
+        "max_batch_ms": latencies[-1] * 1000 if latencies else 0.0,
+    }
+
+
+def compare_backends(texts: list, config: dict | None = None, batch_size: int = 256) -> dict:
+    """VADER (+ לקסיקון פיננסי) מול ה־transformer שמוגדר ב־sentiment_backend.json; בלי מטמון"""
+    config = config if config is not None else load_backend_config()
+    fast = FastVader(SentimentIntensityAnalyzer())
+    lexicon = FinanceLexicon.load()
+    results = {
+        "vader": measure_backend(lambda batch: [lexicon.blend(fast.compound(t), t) for t in batch], texts, batch_size)
+    }
+    try:
+        model = TransformerSentiment.from_settings(config.get("transformer", {}))
+    except RuntimeError as e:
+        results["transformer"] = {"error": str(e)}
+    else:
+        results["transformer"] = measure_backend(model.compound_many, texts, batch_size)
+        results["transformer"]["padding_overhead"] = round(
+            model.stats["padded_tokens"] / max(model.stats["real_tokens"], 1), 3
+        )
+    return results
+
+
+if __name__ == "__main__":
+    texts = load_archived_texts()
+    result = compare(texts)
+    print(f"📄 טקסטים: {result['texts']}")
+    print(f"🎯 אי־התאמות (מעל {TOLERANCE}): {len(result['mismatches'])} | הפרש מקסימלי: {result['max_abs_diff']}")
+    print(f"🐢 VADER: {result['reference_ms_per_text']:.3f} ms/טקסט")
+    print(f"⚡ FastVader: {result['fast_ms_per_text']:.3f} ms/טקסט (פי {result['speedup']:.1f})")
+
+    print(f"⚙️ backends ({BACKEND_CONFIG_PATH.name}):")
+    for name, stats in compare_backends(texts).items():
+        print(f"   {name}: {json.dumps({k: round(v, 2) if isinstance(v, float) else v for k, v in stats.items()})}")
@@ -0,0 +1,12 @@
+# conftest.py
+
+import pytest
+
+from scores_news.cat_scores import nlp_utils
+from scores_news.utils.sentiment_cache import SentimentCache
+
+
+@pytest.fixture(autouse=True)
+def _isolated_sentiment_cache(monkeypatch):
+    """כל טסט מקבל מטמון סנטימנט בזיכרון – לא נכתב ל־logs/sentiment_cache.sqlite של הייצור"""
+    monkeypatch.setattr(nlp_utils, "_sentiment_cache", SentimentCache("test", path=None))
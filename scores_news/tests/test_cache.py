@@ -0,0 +1,125 @@
+# test_cache.py
+
+from scores_news.utils import cache as cache_module
+from scores_news.utils.cache import (
+    RedisCache,
+    bulk_get,
+    bulk_set,
+    feed_state_keys,
+    fetch_url_with_cache,
+    parse_feed_state,
+)
+from scores_news.utils.tiered_cache import MemoryCache
+
+
+class _FakePipeline:
+    def __init__(self, client):
+        self.client = client
+        self.ops = []
+
+    def set(self, key, value, ex=None):
+        self.ops.append(("set", key, value))
+
+    def exists(self, key):
+        self.ops.append(("exists", key, None))
+
+    def execute(self):
+        self.client.round_trips += 1
+        results = []
+        for op, key, value in self.ops:
+            if op == "set":
+                self.client.data[key] = value.encode() if isinstance(value, str) else value
+                results.append(True)
+            else:
+                results.append(int(key in self.client.data))
+        return results
+
+
+class _FakeRedis:
+    """לקוח Redis מינימלי בזיכרון שסופר round-trips."""
+
+    def __init__(self):
+        self.data = {}
+        self.round_trips = 0
+
+    def mget(self, keys):
+        self.round_trips += 1
+        return [self.data.get(k) for k in keys]
+
+    def pipeline(self, transaction=True):
+        return _FakePipeline(self)
+
+
+def _cache():
+    cache = RedisCache.__new__(RedisCache)
+    cache.ttl_seconds = 600
+    cache.redis_client = _FakeRedis()
+    return cache
+
+
+def test_many_operations_use_one_round_trip_each():
+    cache = _cache()
+    keys = [f"entry:macro:https://example.com/{i}" for i in range(400)]
+    cache.set_many({k: "seen" for k in keys[:200]}, ttl=600)
+    assert cache.exists_many(keys) == [True] * 200 + [False] * 200
+    assert cache.get_many(keys[199:201]) == ["seen", None]
+    assert cache.redis_client.round_trips == 3
+
+
+def test_disabled_cache_returns_aligned_defaults():
+    cache = RedisCache.__new__(RedisCache)
+    cache.redis_client = None
+    assert cache.get_many(["a", "b"]) == [None, None]
+    assert cache.exists_many(["a"]) == [False]
+    cache.set_many({"a": "1"})
+
+
+def test_bulk_helpers_fall_back_to_single_key_calls():
+    class Plain:
+        def __init__(self):
+            self.data = {}
+
+        def get(self, key):
+            return self.data.get(key)
+
+        def set(self, key, value, ttl=None):
+            self.data[key] = value
+
+    cache = Plain()
+    bulk_set(cache, {"a": "1", "b": "2"}, ttl=10)
+    assert bulk_get(cache, ["a", "x", "b"]) == ["1", None, "2"]
+
+
+class _Response:
+    def __init__(self, status_code, text="", headers=None):
+        self.status_code = status_code
+        self.text = text
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        pass
+
+
+def test_body_cache_does_not_share_freshness_or_validators_with_entries(monkeypatch):
+    cache = MemoryCache()
+    url = "https://feed"
+    requests = []
+
+    def fake_get(url, headers=None, timeout=None):
+        requests.append(dict(headers or {}))
+        if headers and headers.get("If-None-Match") == '"body-v1"':
+            return _Response(304)
+        return _Response(200, "<rss>v1</rss>", {"ETag": '"body-v1"'})
+
+    monkeypatch.setattr(cache_module, "http_get", fake_get)
+    assert fetch_url_with_cache(url, cache) == "<rss>v1</rss>"
+    assert fetch_url_with_cache(url, cache) == "<rss>v1</rss>"  # טרי – בלי בקשה
+    assert len(requests) == 1
+
+    # מצב ה־entries של מנוע הפידים לא רואה את הטריות וה־ETag של הגוף
+    state = parse_feed_state(bulk_get(cache, feed_state_keys(url)))
+    assert state == {"validators": {}, "fresh": False, "entries": None}
+
+    cache.set(f"rss_fresh{cache_module.BODY_SCOPE}:{url}", "")
+    assert fetch_url_with_cache(url, cache) == "<rss>v1</rss>"
+    assert requests[-1]["If-None-Match"] == '"body-v1"'
@@ -0,0 +1,65 @@
+# test_cache_codec.py
+
+import json
+
+import pytest
+
+from scores_news.utils.cache import _decode_entries, _from_redis, feed_entries_payload, parse_feed_state
+from scores_news.utils.cache_codec import CodecStats, codec_stats, decode, encode
+from scores_news.utils.tiered_cache import SQLiteCache
+
+ITEM = (
+    "<item><title>Stocks rise as Treasury yields ease {n}</title>"
+    "<link>https://www.cnbc.com/2025/07/03/markets-{n}.html</link>"
+    "<description>U.S. stocks rose on Thursday as investors digested the latest jobs data.</description>"
+    "<pubDate>Thu, 03 Jul 2025 13:{n:02d}:00 GMT</pubDate></item>"
+)
+FEED_XML = '<?xml version="1.0"?><rss><channel>' + "".join(ITEM.format(n=n) for n in range(40)) + "</channel></rss>"
+
+
+def test_round_trip_text_and_entries():
+    entries = [{"title": "כותרת", "link": "https://x/1", "published": "", "source": "s"}] * 30
+    assert decode(encode(FEED_XML)) == FEED_XML
+    assert decode(encode(entries)) == entries
+
+
+def test_feed_bodies_are_compressed():
+    encoded = encode(FEED_XML)
+    assert len(encoded) * 4 < len(FEED_XML.encode())
+
+
+def test_values_written_before_the_codec_are_still_read():
+    assert decode("<rss/>") == "<rss/>"
+    assert decode(json.dumps([{"a": 1}]), legacy="json") == [{"a": 1}]
+    assert parse_feed_state([None, "1", json.dumps([{"a": 1}])])["entries"] == [{"a": 1}]
+
+
+def test_encoded_values_survive_redis_and_sqlite_tiers(tmp_path):
+    payload = feed_entries_payload("https://feed", [{"title": "t"}] * 20)
+    value = payload["rss_entries:https://feed"]
+    assert isinstance(value, bytes)
+    assert _from_redis(value) == value and _from_redis(b"plain") == "plain"
+
+    disk = SQLiteCache(tmp_path / "cache.sqlite")
+    disk.set("k", value)
+    assert decode(disk.get("k")) == [{"title": "t"}] * 20
+
+
+def test_corrupt_compressed_value_is_a_value_error_not_a_crash():
+    truncated = encode([{"title": "t"}] * 30)[:-20]
+    with pytest.raises(ValueError):
+        decode(truncated)
+    assert _decode_entries(truncated, "https://feed") is None
+    # מצב של פיד אחד פגום לא מפיל את קריאת ה־batch
+    state = parse_feed_state([None, "1", truncated])
+    assert state["entries"] is None and state["fresh"]
+
+
+def test_stats_report_bytes_saved():
+    codec_stats.reset()
+    encode(FEED_XML)
+    decode(encode(FEED_XML))
+    snapshot = codec_stats.snapshot()
+    assert snapshot["encoded"] == 2 and snapshot["decoded"] == 1
+    assert snapshot["bytes_saved"] > 0
+    assert CodecStats().snapshot()["ratio"] is None
@@ -0,0 +1,85 @@
+# test_decayed_sentiment.py
+
+import csv
+
+import pytest
+
+from scores_news.cat_scores.final_score import calculate_decayed_score, save_scores_to_log
+from scores_news.utils.decayed_sentiment import DecayedAccumulator, DecayedSentiment
+
+HOUR = 3600.0
+CONFIG = {"half_life_hours": {"default": 1, "macro": 2}, "prior_weight": 0.0}
+
+
+def test_weight_halves_every_half_life():
+    acc = DecayedAccumulator(HOUR)
+    acc.add(80, ts=0)
+    assert acc.mass_at(HOUR) == pytest.approx(0.5)
+    assert acc.mass_at(3 * HOUR) == pytest.approx(0.125)
+
+    acc.add(20, ts=HOUR)
+    # 80 בוזן 0.5 מול 20 בוזן 1
+    assert acc.mean() == pytest.approx((80 * 0.5 + 20) / 1.5)
+
+
+def test_arrival_order_does_not_matter():
+    events = [(0, 90), (1800, 10), (5400, 60), (600, 40)]
+    forward, backward = DecayedAccumulator(HOUR), DecayedAccumulator(HOUR)
+    for ts, value in events:
+        forward.add(value, ts)
+    for ts, value in reversed(events):
+        backward.add(value, ts)
+    assert forward.score_at(7200, 1.0) == pytest.approx(backward.score_at(7200, 1.0))
+
+
+def test_score_drifts_back_to_neutral_without_news():
+    acc = DecayedAccumulator(HOUR)
+    acc.add(100, ts=0)
+    fresh = acc.score_at(0, prior_weight=1.0)
+    stale = acc.score_at(10 * HOUR, prior_weight=1.0)
+    assert fresh == pytest.approx(75)
+    assert 50 < stale < 50.1
+
+
+def test_querying_before_the_last_update_is_rejected():
+    acc = DecayedAccumulator(HOUR)
+    acc.add(90, ts=0)
+    acc.add(10, ts=HOUR)
+    # ב־ts=0 הכתבה של ts=HOUR עוד לא קיימת – אי אפשר לשחזר את זה מהמצב המקופל
+    with pytest.raises(ValueError):
+        acc.mass_at(0)
+    with pytest.raises(ValueError):
+        acc.score_at(HOUR / 2)
+    assert acc.mass_at(HOUR) == pytest.approx(1.5)
+
+
+def test_store_tracks_categories_and_sources_and_persists(tmp_path):
+    path = tmp_path / "decayed.json"
+    store = DecayedSentiment(path, CONFIG)
+    now = 1_700_000_000.0
+    store.add("macro", 80, source="https://a.example/rss", ts=now)
+    store.add("macro", 20, source="https://b.example/rss", ts=now)
+    store.save()
+
+    reader = DecayedSentiment(path, CONFIG)
+    assert reader.score("macro", ts=now) == pytest.approx((50.0, 2.0))
+    assert reader.score("macro", "https://a.example/rss", ts=now)[0] == pytest.approx(80)
+    # זמן מחצית של macro הוא שעתיים
+    assert reader.score("macro", ts=now + 2 * HOUR)[1] == pytest.approx(1.0)
+    assert reader.score("sentiment") is None
+
+    score, explanation = calculate_decayed_score(reader, "macro", ts=now)
+    assert score == 50 and "a.example" in explanation
+
+
+def test_score_log_header_grows_with_new_columns(tmp_path):
+    path = tmp_path / "score_log.csv"
+    save_scores_to_log({"sentiment": {"score": 60}, "sectors": {"score": 55}}, 58, "NEUTRAL", path)
+    save_scores_to_log(
+        {"sentiment": {"score": 70}, "sectors": {"score": 65}, "sentiment_decayed": {"score": 80}}, 68, "LONG", path
+    )
+
+    with open(path, newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    assert rows[0]["sentiment_score"] == "60" and rows[0]["sentiment_decayed_score"] in ("", None)
+    assert rows[1]["sentiment_score"] == "70" and rows[1]["sentiment_decayed_score"] == "80"
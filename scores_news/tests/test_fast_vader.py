@@ -0,0 +1,47 @@
+# test_fast_vader.py
+
+import random
+
+from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+
+from scores_news.cat_scores.fast_vader import FastVader
+from scores_news.tests.bench_sentiment import TOLERANCE, compare, load_archived_texts
+
+REFERENCE = SentimentIntensityAnalyzer()
+FAST = FastVader(REFERENCE)
+
+EDGE_CASES = [
+    "VADER is VERY SMART, uber handsome, and FRIGGIN FUNNY!!!",
+    "At least it isn't a horrible book.",
+    "The plot was good, but the characters are uncompelling and the dialog is not great.",
+    "Today only kinda sux! But I'll get by, lol",
+    "Catch utf-8 emoji such as 💘 and 💋 and 😁",
+    "Not bad at all",
+    "the book was kind of good",
+    "without doubt it is great??",
+    "",
+]
+
+
+def test_edge_cases_match_reference():
+    for text in EDGE_CASES:
+        assert FAST.compound(text) == REFERENCE.polarity_scores(text)["compound"], text
+
+
+def test_random_rule_combinations_match_reference():
+    vocab = (
+        "good bad great terrible not never no least at very kind of but so this without doubt "
+        "the bomb yeah right isn't extremely slightly GOOD BAD VERY NOT ! ? :) 😁 nor or"
+    ).split()
+    rng = random.Random(7)
+    for _ in range(3000):
+        text = " ".join(rng.choice(vocab) for _ in range(rng.randint(1, 12)))
+        assert FAST.compound(text) == REFERENCE.polarity_scores(text)["compound"], text
+
+
+def test_archived_articles_match_the_reference():
+    # מהירות נמדדת ב־bench_sentiment.py – כאן רק שקילות הציונים (בדיקת זמן הייתה לא יציבה על מכונה עמוסה)
+    result = compare(load_archived_texts(), rounds=1)
+    assert result["texts"] > 0
+    assert result["mismatches"] == []
+    assert result["max_abs_diff"] <= TOLERANCE
@@ -0,0 +1,175 @@
+# test_feed_engine.py
+
+import asyncio
+import time
+
+from aiohttp import web
+
+from scores_news.utils.feed_engine import FeedFetchEngine
+
+RSS_TEMPLATE = """<?xml version="1.0"?>
+<rss version="2.0"><channel><title>{name}</title>
+<item><title>{name} headline</title><link>https://example.com/{name}</link>
+<description>summary</description><pubDate>Thu, 03 Jul 2025 13:31:00 GMT</pubDate></item>
+</channel></rss>"""
+
+
+async def _serve_and_fetch(engine, paths, delays):
+    async def handler(request):
+        name = request.match_info["name"]
+        await asyncio.sleep(delays.get(name, 0))
+        return web.Response(text=RSS_TEMPLATE.format(name=name), content_type="application/rss+xml")
+
+    app = web.Application()
+    app.router.add_get("/{name}", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    try:
+        urls = [f"http://127.0.0.1:{port}/{p}" for p in paths]
+        started = time.perf_counter()
+        results = await engine.fetch_all_async(urls)
+        return urls, results, time.perf_counter() - started
+    finally:
+        await runner.cleanup()
+
+
+def test_feeds_are_fetched_concurrently():
+    engine = FeedFetchEngine(timeout=5, retries=0)
+    names = ["a", "b", "c", "d"]
+    urls, results, elapsed = asyncio.run(
+        _serve_and_fetch(engine, names, {n: 0.3 for n in names})
+    )
+    assert elapsed < 0.9, "❌ הפידים לא נטענו במקביל"
+    for url, name in zip(urls, names):
+        assert results[url][0]["title"] == f"{name} headline"
+        assert results[url][0]["source"] == url
+
+
+def test_dead_feed_hits_deadline_without_stalling_others():
+    engine = FeedFetchEngine(timeout=0.3, retries=0)
+    urls, results, elapsed = asyncio.run(
+        _serve_and_fetch(engine, ["fast", "dead"], {"dead": 1.5})
+    )
+    assert elapsed < 2
+    assert results[urls[0]] and results[urls[1]] == []
+
+
+def test_per_host_limit_serializes_requests():
+    engine = FeedFetchEngine(timeout=5, retries=0, per_host=1)
+    _, _, elapsed = asyncio.run(
+        _serve_and_fetch(engine, ["a", "b", "c"], {"a": 0.2, "b": 0.2, "c": 0.2})
+    )
+    assert elapsed >= 0.55
+
+
+class _DictCache:
+    """מטמון מינימלי בזיכרון עם אותו ממשק get/set כמו RedisCache."""
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, ttl=None):
+        self.data[key] = value
+
+
+def test_conditional_get_reuses_entries_on_304():
+    cache = _DictCache()
+    seen_headers = []
+
+    async def run():
+        async def handler(request):
+            seen_headers.append(request.headers.get("If-None-Match"))
+            if request.headers.get("If-None-Match") == '"v1"':
+                return web.Response(status=304)
+            return web.Response(text=RSS_TEMPLATE.format(name="etag"), headers={"ETag": '"v1"'})
+
+        app = web.Application()
+        app.router.add_get("/feed", handler)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        url = f"http://127.0.0.1:{port}/feed"
+        try:
+            first = FeedFetchEngine(cache=cache, retries=0)
+            await first.fetch_all_async([url])
+            cache.data.pop(f"rss_fresh:{url}")  # פג תוקף הטריות
+            second = FeedFetchEngine(cache=cache, retries=0)
+            result = await second.fetch_all_async([url])
+            return first, second, result[url]
+        finally:
+            await runner.cleanup()
+
+    first, second, entries = asyncio.run(run())
+    assert seen_headers == [None, '"v1"']
+    assert first.stats["downloaded"] == 1
+    assert second.stats["downloaded"] == 0 and second.stats["not_modified"] == 1
+    assert entries[0]["title"] == "etag headline"
+
+
+def test_fetch_new_returns_only_unseen_items(tmp_path):
+    from scores_news.utils.feed_marks import FeedMarks
+
+    marks = FeedMarks(tmp_path / "marks.json")
+    engine = FeedFetchEngine(retries=0)
+
+    async def handler(request):
+        return web.Response(text=RSS_TEMPLATE.format(name="x"))
+
+    async def run():
+        app = web.Application()
+        app.router.add_get("/feed", handler)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        url = f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}/feed"
+        try:
+            first = await engine.fetch_new_async([url], marks)
+            again = await engine.fetch_new_async([url], marks)
+            return first[url], again[url]
+        finally:
+            await runner.cleanup()
+
+    first, again = asyncio.run(run())
+    assert [a["title"] for a in first] == ["x headline"]
+    assert again == []
+    assert engine.stats["stopped_early"] == 1
+
+
+class _BatchCache(_DictCache):
+    """מטמון שסופר round-trips – get_many / set_many נספרים כקריאה אחת."""
+
+    def __init__(self):
+        super().__init__()
+        self.round_trips = 0
+
+    def get_many(self, keys):
+        self.round_trips += 1
+        return [self.data.get(k) for k in keys]
+
+    def set_many(self, mapping, ttl=None):
+        self.round_trips += 1
+        self.data.update(mapping)
+
+
+def test_cache_traffic_is_batched_per_cycle():
+    cache = _BatchCache()
+    engine = FeedFetchEngine(cache=cache, retries=0)
+    names = [f"f{i}" for i in range(20)]
+    urls, results, _ = asyncio.run(_serve_and_fetch(engine, names, {}))
+    # MGET אחד לפני ההורדות + SET אחד לכל TTL בסוף הסבב
+    assert cache.round_trips == 3
+    assert all(results[url] for url in urls)
+
+    cache.round_trips = 0
+    again = asyncio.run(engine.fetch_all_async(urls))
+    assert cache.round_trips == 1 and engine.stats["cache_hits"] == 20
+    assert again == results
@@ -0,0 +1,64 @@
+# test_feed_marks.py
+
+from scores_news.utils.feed_marks import FeedMarks, NewItemsParser, filter_new
+
+RSS_ITEM = """<item><title>Story {n}</title><link>https://example.com/{n}</link>
+<guid>id-{n}</guid><description>body {n}</description>
+<pubDate>Thu, 03 Jul 2025 {hh:02d}:00:00 GMT</pubDate></item>"""
+
+
+def _rss(numbers):
+    items = "".join(RSS_ITEM.format(n=n, hh=n) for n in numbers)
+    return f'<?xml version="1.0"?><rss version="2.0"><channel><title>t</title>{items}</channel></rss>'.encode()
+
+
+def _feed_in_chunks(parser, body, size=64):
+    for i in range(0, len(body), size):
+        if parser.feed(body[i:i + size]):
+            return i + size
+    parser.close()
+    return len(body)
+
+
+def test_first_run_returns_every_item():
+    parser = NewItemsParser(None, "src")
+    _feed_in_chunks(parser, _rss([12, 11, 10]))
+    assert [a["guid"] for a in parser.items] == ["id-12", "id-11", "id-10"]
+    assert parser.new_mark()["id"] == "id-12"
+
+
+def test_parser_stops_at_marked_item_without_reading_the_rest():
+    body = _rss([15, 14, 13] + list(range(12, 0, -1)))
+    first = NewItemsParser(None, "src")
+    _feed_in_chunks(first, _rss([13, 12, 11]))
+
+    parser = NewItemsParser(first.new_mark(), "src")
+    consumed = _feed_in_chunks(parser, body)
+    assert [a["title"] for a in parser.items] == ["Story 15", "Story 14"]
+    assert consumed < len(body) / 2, "❌ הפרסר המשיך לקרוא אחרי הפריט שכבר נראה"
+
+
+def test_older_items_count_as_seen_even_without_id_match():
+    parser = NewItemsParser(None, "src")
+    _feed_in_chunks(parser, _rss([10]))
+    mark = {"id": "gone", "published_ts": parser.items[0]["published_ts"]}
+    assert filter_new([{"link": "x", "published": "Thu, 03 Jul 2025 09:00:00 GMT"}], mark) == []
+
+
+def test_atom_entries_are_supported():
+    body = b"""<?xml version="1.0"?><feed xmlns="http://www.w3.org/2005/Atom">
+    <entry><title>Atom story</title><id>tag:1</id><link href="https://example.com/a"/>
+    <updated>2025-07-03T13:31:00Z</updated><summary>s</summary></entry></feed>"""
+    parser = NewItemsParser(None, "src")
+    _feed_in_chunks(parser, body)
+    assert parser.items[0]["link"] == "https://example.com/a"
+    assert parser.items[0]["guid"] == "tag:1"
+    assert parser.items[0]["published_ts"] is not None
+
+
+def test_marks_persist_across_instances(tmp_path):
+    path = tmp_path / "marks.json"
+    marks = FeedMarks(path)
+    marks.update("https://feed", {"id": "id-1", "published_ts": 1.0})
+    marks.save()
+    assert FeedMarks(path).get("https://feed") == {"id": "id-1", "published_ts": 1.0}
@@ -0,0 +1,40 @@
+# test_feed_registry.py
+
+from scores_news.utils.feed_registry import FeedRegistry
+
+SHARED = "https://www.investing.com/rss/news_25.rss"
+
+
+class _CountingEngine:
+    def __init__(self):
+        self.calls = []
+
+    def fetch_all(self, urls):
+        self.calls.append(list(urls))
+        return {url: [{"title": f"from {url}", "link": url}] for url in urls}
+
+
+def test_each_url_fetched_once_and_fanned_out():
+    engine = _CountingEngine()
+    registry = FeedRegistry(
+        {"bonds_dxy": ["https://fed/h10", SHARED], "futures_vix": ["https://cnbc/futures", SHARED]},
+        engine=engine,
+    )
+    assert registry.urls == ["https://fed/h10", SHARED, "https://cnbc/futures"]
+    assert registry.categories_for(SHARED) == ["bonds_dxy", "futures_vix"]
+
+    bonds = registry.articles_for("bonds_dxy")
+    futures = registry.articles_for("futures_vix")
+    assert len(engine.calls) == 1 and len(engine.calls[0]) == 3
+    assert [a["link"] for a in futures] == ["https://cnbc/futures", SHARED]
+
+    # כל קטגוריה מקבלת עותק משלה
+    futures[1]["sentiment_score"] = 90
+    assert "sentiment_score" not in bonds[1]
+
+
+def test_categories_filter_limits_the_cycle():
+    engine = _CountingEngine()
+    registry = FeedRegistry({"macro": ["https://bls"], "sentiment": ["https://mw"]}, categories=["macro"], engine=engine)
+    registry.articles_for("macro")
+    assert engine.calls == [["https://bls"]]
@@ -0,0 +1,47 @@
+# test_finance_lexicon.py
+
+import time
+
+from scores_news.cat_scores.finance_lexicon import AhoCorasick, FinanceLexicon, tokenize
+from scores_news.cat_scores.nlp_utils import fast_sentiment_score
+
+
+def test_automaton_finds_every_occurrence_on_word_boundaries():
+    automaton = AhoCorasick({("cut",): "a", ("cut", "rates"): "b", ("rates",): "c"})
+    found = sorted(automaton.finditer(tokenize("Fed may cut rates; upcut isn't cut")))
+    assert found == [(2, 3, "a"), (2, 4, "b"), (3, 4, "c"), (6, 7, "a")]
+
+
+def test_longest_match_wins_and_negation_flips():
+    lexicon = FinanceLexicon({"cut": -1.0, "cut rates": 2.0, "beat": 2.0}, negations=["failed to"])
+    assert lexicon.matches("Fed to cut rates") == [(("cut", "rates"), 2.0)]
+    assert lexicon.matches("Company failed to beat") == [(("beat",), 2.0 * -0.74)]
+    assert lexicon.score("nothing relevant here") is None
+
+
+def test_market_language_is_read_correctly():
+    assert fast_sentiment_score("Apple beats estimates as iPhone sales surge") > 0.3
+    assert fast_sentiment_score("Fed expected to cut rates in September") > 0
+    assert fast_sentiment_score("Stocks slide as recession fears grow") < -0.3
+    assert fast_sentiment_score("Fed minutes released on Wednesday") == 0.0
+
+
+def test_matching_cost_does_not_grow_with_lexicon_size():
+    text = " ".join(["markets rally as investors cheer earnings"] * 50)
+    small = FinanceLexicon({"rally": 1.0})
+    large = FinanceLexicon({f"phrase{i} token{i % 97}": 1.0 for i in range(20000)} | {"rally": 1.0})
+
+    def timed(lexicon):
+        started = time.perf_counter()
+        for _ in range(20):
+            lexicon.score(text)
+        return time.perf_counter() - started
+
+    timed(small), timed(large)  # חימום
+    assert timed(large) < timed(small) * 3
+
+
+def test_missing_file_yields_empty_lexicon(tmp_path):
+    lexicon = FinanceLexicon.load(tmp_path / "missing.json")
+    assert len(lexicon) == 0
+    assert lexicon.blend(0.25, "stocks rally") == 0.25
@@ -0,0 +1,68 @@
+# test_http_client.py
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from scores_news.utils.http_client import HostStats, HttpClient
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    failures_left = 0
+    peers = []
+
+    def do_GET(self):
+        _Handler.peers.append(self.client_address[1])
+        if _Handler.failures_left > 0:
+            _Handler.failures_left -= 1
+            status, body = 503, b"busy"
+        else:
+            status, body = 200, b"ok"
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def _serve():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/"
+
+
+def test_requests_reuse_one_keep_alive_connection():
+    server, url = _serve()
+    _Handler.peers = []
+    client = HttpClient(stats=HostStats())
+    try:
+        for _ in range(5):
+            assert client.get(url).text == "ok"
+    finally:
+        client.close()
+        server.shutdown()
+    assert len(set(_Handler.peers)) == 1, "❌ כל בקשה פתחה חיבור חדש"
+
+
+def test_5xx_is_retried_and_latency_is_recorded():
+    server, url = _serve()
+    _Handler.failures_left = 2
+    stats = HostStats()
+    client = HttpClient(backoff_factor=0, stats=stats)
+    try:
+        assert client.get(url).status_code == 200
+    finally:
+        client.close()
+        server.shutdown()
+    host = url.split("/")[2]
+    snapshot = stats.snapshot()[host]
+    assert snapshot["requests"] == 1 and snapshot["errors"] == 0
+    assert snapshot["avg_ms"] >= 0
+
+
+def test_default_timeout_and_compression_headers():
+    client = HttpClient()
+    assert client.timeout == (5, 20)
+    assert "gzip" in client.session.headers["Accept-Encoding"]
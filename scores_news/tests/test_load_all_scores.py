@@ -0,0 +1,93 @@
+# test_load_all_scores.py
+
+import csv
+import threading
+import time
+
+from scores_news.cat_scores import final_score
+from scores_news.cat_scores.final_score import load_all_scores, save_scores_to_log
+from scores_news.utils.feed_registry import FeedRegistry
+
+
+def _instant(key, score):
+    return lambda registry: {key: {"score": score, "explanation": "ok"}}
+
+
+def _fake_tasks(monkeypatch, slow_seconds=0.3, release=None):
+    def slow(registry):
+        (release or threading.Event()).wait(slow_seconds)
+        return {"bonds": {"score": 99, "explanation": "late"}}
+
+    def broken(registry):
+        raise RuntimeError("boom")
+
+    tasks = [
+        ("sentiment", _instant("sentiment", 70), lambda: {"sentiment": final_score._default()}),
+        ("bonds", slow, lambda: {"bonds": final_score._default()}),
+        ("sectors", broken, lambda: {"sectors": final_score._default()}),
+        ("mes", _instant("mes", 40), lambda: {"mes": final_score._default(score=0)}),
+    ]
+    monkeypatch.setattr(final_score, "CATEGORY_TASKS", tasks)
+    monkeypatch.setattr(final_score.FeedRegistry, "from_config", classmethod(lambda cls, **kw: None))
+
+
+def test_categories_run_concurrently_and_keep_their_order(monkeypatch):
+    _fake_tasks(monkeypatch, slow_seconds=0.2)
+    started = time.monotonic()
+    scores = load_all_scores(timeouts={"bonds": 5})
+    assert time.monotonic() - started < 1.0
+    assert list(scores) == ["sentiment", "bonds", "sectors", "mes"]
+    assert scores["bonds"]["score"] == 99
+    assert scores["sectors"]["score"] == 50 and "ברירת מחדל" in scores["sectors"]["explanation"]
+    assert all("seconds" in result for result in scores.values())
+
+
+def test_slow_category_falls_back_to_neutral_at_its_deadline(monkeypatch):
+    release = threading.Event()
+    _fake_tasks(monkeypatch, slow_seconds=10, release=release)
+    started = time.monotonic()
+    scores = load_all_scores(timeouts={"bonds": 0.2})
+    elapsed = time.monotonic() - started
+    release.set()
+
+    assert elapsed < 2.0
+    assert scores["bonds"]["score"] == 50 and "⏱️" in scores["bonds"]["explanation"]
+    assert scores["bonds"]["seconds"] >= 0.2
+    assert scores["sentiment"]["score"] == 70 and scores["mes"]["score"] == 40
+
+
+def test_global_deadline_caps_every_category(monkeypatch):
+    release = threading.Event()
+    _fake_tasks(monkeypatch, slow_seconds=10, release=release)
+    scores = load_all_scores(timeouts={"bonds": 30}, deadline=0.2)
+    release.set()
+    assert scores["bonds"]["score"] == 50
+
+
+def test_timings_are_logged_next_to_the_scores(tmp_path, monkeypatch):
+    _fake_tasks(monkeypatch, slow_seconds=0)
+    scores = load_all_scores()
+    path = tmp_path / "score_log.csv"
+    save_scores_to_log(scores, 55, "NEUTRAL", path)
+    with open(path, newline="", encoding="utf-8") as f:
+        row = next(csv.DictReader(f))
+    assert row["sentiment_score"] == "70"
+    assert float(row["sentiment_seconds"]) >= 0 and "bonds_seconds" in row
+
+
+def test_registry_fetches_once_under_concurrent_access():
+    calls = []
+
+    class _Engine:
+        def fetch_all(self, urls):
+            calls.append(urls)
+            time.sleep(0.05)
+            return {url: [{"title": url}] for url in urls}
+
+    registry = FeedRegistry({"macro": ["u1"], "futures_vix": ["u1", "u2"]}, engine=_Engine())
+    threads = [threading.Thread(target=registry.articles_for, args=(c,)) for c in ("macro", "futures_vix") * 3]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(calls) == 1
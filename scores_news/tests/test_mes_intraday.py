@@ -0,0 +1,83 @@
+# test_mes_intraday.py
+
+import math
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+import pandas as pd
+
+from scores_news.cat_scores.mes_intraday import IntradayMES, closed_bars, session_key
+
+ET = ZoneInfo("America/New_York")
+
+
+def _ts(day, hour, minute=0):
+    return datetime(2025, 7, day, hour, minute, tzinfo=ET).timestamp()
+
+
+def test_sessions_start_at_six_pm_new_york():
+    assert session_key(_ts(15, 17, 59)) == "2025-07-15"
+    assert session_key(_ts(15, 18, 0)) == "2025-07-16"
+    assert session_key(_ts(16, 9, 30)) == "2025-07-16"
+
+
+def test_indicators_match_a_full_recompute():
+    bars = [
+        (_ts(16, 9, 30 + i), 6000 + i, 6002 + i, 5998 + i, 6001 + i, 100 + 10 * i)
+        for i in range(20)
+    ]
+    state = IntradayMES(atr_period=5, rv_window=10)
+    for bar in bars:
+        assert state.update(*bar)
+    ind = state.indicators()
+
+    closes = [b[4] for b in bars]
+    typical = [(b[2] + b[3] + b[4]) / 3 for b in bars]
+    vwap = sum(t * b[5] for t, b in zip(typical, bars)) / sum(b[5] for b in bars)
+    assert math.isclose(ind["vwap"], vwap)
+    assert ind["session_range"] == max(b[2] for b in bars) - min(b[3] for b in bars)
+    assert math.isclose(ind["session_return"], (closes[-1] - bars[0][1]) / bars[0][1] * 100)
+
+    returns = [math.log(b / a) for a, b in zip(closes, closes[1:])][-10:]
+    assert math.isclose(ind["realized_vol"], math.sqrt(sum(r * r for r in returns)) * 100)
+
+    trs = [bars[0][2] - bars[0][3]] + [
+        max(b[2] - b[3], abs(b[2] - p[4]), abs(b[3] - p[4])) for p, b in zip(bars, bars[1:])
+    ]
+    atr = sum(trs[:5]) / 5
+    for tr in trs[5:]:
+        atr = (atr * 4 + tr) / 5
+    assert math.isclose(ind["atr"], atr)
+
+
+def test_new_session_resets_vwap_and_uses_previous_close():
+    state = IntradayMES()
+    state.update(_ts(15, 15, 0), 6000, 6005, 5995, 6000, 500)
+    state.update(_ts(15, 18, 0), 6010, 6100, 6010, 6090, 100)
+    ind = state.indicators()
+    assert ind["session"] == "2025-07-16"
+    assert math.isclose(ind["vwap"], (6100 + 6010 + 6090) / 3)
+    assert math.isclose(ind["session_return"], 1.5)
+
+    score, explanation = state.score()
+    assert score == round(90 * 0.5 + 80 * 0.2 + 90 * 0.3)
+    assert "VWAP" in explanation and "ATR" in explanation
+
+
+def test_old_duplicate_and_open_bars_are_not_ingested():
+    state = IntradayMES()
+    assert state.update(_ts(16, 10, 0), 6000, 6001, 5999, 6000, 10)
+    assert not state.update(_ts(16, 10, 0), 6000, 6001, 5999, 6000, 10)
+    assert not state.update(_ts(16, 9, 55), 6000, 6001, 5999, 6000, 10)
+    assert state.bars == 1
+
+    df = pd.DataFrame({
+        "timestamp": pd.to_datetime([_ts(16, 10, 5), _ts(16, 10, 10)], unit="s"),
+        "open": [6000, 6001], "high": [6002, 6003], "low": [5999, 6000],
+        "close": [6001, 6002], "volume": [5, 5],
+    })
+    ready = closed_bars(df, "5m", now=_ts(16, 10, 12))
+    assert len(ready) == 1
+    assert state.ingest(ready) == 1
+    assert state.ingest(df) == 1
+    assert state.ingest(df) == 0
@@ -0,0 +1,54 @@
+# test_near_dup.py
+
+from datetime import datetime
+
+import pandas as pd
+
+from scores_news.utils.cleaning import clean_articles
+from scores_news.utils.near_dup import NearDuplicateIndex, dedupe_articles
+
+
+def test_syndicated_headline_variants_are_clustered():
+    index = NearDuplicateIndex()
+    assert index.add("a", "Fed holds rates steady, signals two cuts later this year") == ("a", False)
+    representative, is_duplicate = index.add("b", "Fed Holds Rates Steady and Signals Two Cuts Later This Year")
+    assert (representative, is_duplicate) == ("a", True)
+    assert index.cluster_sizes["a"] == 2
+
+
+def test_different_stories_are_kept_apart():
+    index = NearDuplicateIndex()
+    index.add("a", "Fed holds rates steady, signals two cuts later this year")
+    assert index.add("b", "Oil prices jump as OPEC+ agrees to deeper output cuts") == ("b", False)
+    assert index.query("Nvidia shares slide after export restrictions widen") is None
+
+
+def test_index_is_bounded():
+    index = NearDuplicateIndex(capacity=3)
+    for i in range(10):
+        index.add(i, f"unique headline number {i} about topic{i}")
+    assert len(index) == 3
+    assert index.stats["evicted"] == 7
+
+
+def test_dedupe_articles_keeps_one_representative_per_cluster():
+    articles = [
+        {"title": "Stocks rally as inflation cools more than expected", "link": "https://a/1"},
+        {"title": "Stocks rally as inflation cools more than expected - Reuters", "link": "https://b/1"},
+        {"title": "Treasury yields fall after weak jobs report", "link": "https://a/2"},
+    ]
+    kept = dedupe_articles(articles)
+    assert [a["link"] for a in kept] == ["https://a/1", "https://a/2"]
+    assert [a["cluster_size"] for a in kept] == [2, 1]
+
+
+def test_clean_articles_drops_near_duplicates():
+    now = datetime.now().isoformat()
+    df = pd.DataFrame([
+        {"title": "Dollar slips ahead of CPI data", "link": "https://a/1", "published": now},
+        {"title": "Dollar slips ahead of CPI data.", "link": "https://b/1", "published": now},
+        {"title": " ", "link": "https://c/1", "published": now},
+    ])
+    cleaned = clean_articles(df)
+    assert len(cleaned) == 1
+    assert cleaned.loc[0, "cluster_size"] == 2
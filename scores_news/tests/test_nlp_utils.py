@@ -0,0 +1,68 @@
+# test_nlp_utils.py
+
+import pandas as pd
+
+from scores_news.cat_scores import nlp_utils
+from scores_news.cat_scores.nlp_utils import analyze_articles, analyze_texts, fast_sentiment_score
+from scores_news.utils.sentiment_cache import SentimentCache
+
+TEXTS = [
+    "Stocks rally strongly, a great win for investors",
+    "Markets plunge amid recession fears and weak guidance",
+    "Fed minutes released on Wednesday",
+]
+
+
+def test_batch_matches_single_text_scoring_in_input_order(monkeypatch):
+    monkeypatch.setattr(nlp_utils, "_sentiment_cache", SentimentCache("test", path=None))
+    texts = TEXTS + TEXTS[:1]
+    compound, labels = analyze_texts(pd.Series(texts))
+    assert list(compound) == [fast_sentiment_score(t) for t in texts]
+    assert list(labels) == ["positive", "negative", "neutral", "positive"]
+
+
+def test_identical_texts_are_scored_once(monkeypatch):
+    calls = []
+    monkeypatch.setattr(nlp_utils, "_sentiment_cache", SentimentCache("test", path=None))
+    monkeypatch.setattr(nlp_utils, "fast_sentiment_score", lambda t: calls.append(t) or 0.0)
+    analyze_texts(["same text"] * 50 + ["other"])
+    assert sorted(calls) == ["other", "same text"]
+
+
+def test_large_batches_are_sharded_across_processes(monkeypatch):
+    monkeypatch.setattr(nlp_utils, "_sentiment_cache", SentimentCache("test", path=None))
+    monkeypatch.setattr(nlp_utils, "POOL_WORKERS", 2)
+    texts = [f"{TEXTS[i % 3]} #{i}" for i in range(40)]
+    compound, _ = analyze_texts(texts, parallel_threshold=10)
+    assert list(compound) == [fast_sentiment_score(t) for t in texts]
+
+
+def test_analyze_articles_keeps_its_contract(monkeypatch):
+    monkeypatch.setattr(nlp_utils, "_sentiment_cache", SentimentCache("test", path=None))
+    articles = analyze_articles([{"title": TEXTS[0], "summary": None}])
+    assert articles[0]["sentiment_label"] == "positive"
+    assert isinstance(articles[0]["sentiment_score"], int) and 50 < articles[0]["sentiment_score"] <= 100
+
+
+def test_scores_are_shared_through_the_disk_cache(tmp_path, monkeypatch):
+    path = tmp_path / "sentiment.sqlite"
+    SentimentCache("v1", path).set_many({TEXTS[0]: 0.5})
+
+    # "תהליך" חדש עם אותה גרסה – הציון נטען מהדיסק בלי לחשב שוב
+    monkeypatch.setattr(nlp_utils, "_sentiment_cache", SentimentCache("v1", path))
+    monkeypatch.setattr(nlp_utils, "fast_sentiment_score", lambda t: 0.0)
+    compound, labels = analyze_texts([TEXTS[0]])
+    assert compound[0] == 0.5 and labels[0] == "positive"
+
+
+def test_new_scorer_version_invalidates_old_scores(tmp_path):
+    path = tmp_path / "sentiment.sqlite"
+    SentimentCache("v1", path).set_many({"text": 0.5})
+    assert SentimentCache("v2", path).get("text") is None
+    assert SentimentCache("v1", path).get("text") is None  # השורות הישנות נמחקו
+
+
+def test_memory_level_is_bounded():
+    cache = SentimentCache("v", path=None, max_memory=10)
+    cache.set_many({f"t{i}": 0.1 for i in range(25)})
+    assert len(cache) == 10
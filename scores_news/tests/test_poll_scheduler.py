@@ -0,0 +1,62 @@
+# test_poll_scheduler.py
+
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+from scores_news.utils.poll_scheduler import PollScheduler
+
+ET = ZoneInfo("America/New_York")
+BUSY = "https://busy.example.com/rss"
+QUIET = "https://quiet.example.com/rss"
+CPI = "https://www.bls.gov/feeds/news.release.cpi.rss"
+
+
+def _ts(hour, minute, second=0):
+    # יום רביעי
+    return datetime(2025, 7, 16, hour, minute, second, tzinfo=ET).timestamp()
+
+
+def test_all_feeds_due_on_first_cycle():
+    scheduler = PollScheduler([BUSY, QUIET], now=0)
+    assert sorted(scheduler.pop_due(now=0)) == [BUSY, QUIET]
+    assert scheduler.pop_due(now=0) == []
+
+
+def test_busy_feeds_are_polled_more_often_than_quiet_ones():
+    scheduler = PollScheduler([BUSY, QUIET], now=0)
+    now = 0
+    scheduler.pop_due(now)
+    scheduler.record(BUSY, [], now)
+    scheduler.record(QUIET, [], now)
+    for _ in range(5):
+        now += 300
+        scheduler.record(BUSY, [{}] * 10, now)
+        scheduler.record(QUIET, [], now)
+    assert scheduler.interval[BUSY] == 60
+    assert scheduler.interval[QUIET] == 1800
+
+
+def test_burst_window_pulls_macro_feed_forward():
+    config = {
+        "default_interval": 1200,
+        "macro_releases": [{"name": "CPI", "time": "08:30", "feeds": ["bls.gov"]}],
+    }
+    now = _ts(8, 20)
+    scheduler = PollScheduler([CPI, QUIET], config, macro_urls=[CPI], now=now)
+    scheduler.pop_due(now)
+    scheduler.record(CPI, [], now)
+    scheduler.record(QUIET, [], now)
+
+    # הפיד של CPI מתוזמן לתחילת החלון (08:29) ולא 30 דקות מאוחר יותר
+    assert scheduler.pop_due(_ts(8, 29)) == [CPI]
+    # בתוך החלון – סקירה כל 15 שניות
+    scheduler.record(CPI, [], _ts(8, 29))
+    assert scheduler.pop_due(_ts(8, 29, 15)) == [CPI]
+    assert QUIET not in scheduler.pop_due(_ts(8, 29, 15))
+
+
+def test_seconds_until_next_ignores_stale_entries():
+    scheduler = PollScheduler([BUSY], now=0)
+    scheduler.pop_due(0)
+    scheduler.record(BUSY, [], 0)
+    assert scheduler.seconds_until_next(0) == scheduler.interval[BUSY]
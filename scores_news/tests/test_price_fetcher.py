@@ -0,0 +1,86 @@
+# test_price_fetcher.py
+
+import threading
+import time
+
+from scores_news.cat_scores.sectors_score import SECTOR_SYMBOLS, calculate_sectors_score
+from scores_news.utils.price_fetcher import PriceFetcher, change_from_closes, parse_spark
+from scores_news.utils.sentiment_aggregates import SentimentAggregates
+
+
+def test_change_needs_two_closes():
+    assert change_from_closes([100.0, 101.5]) == 1.5
+    assert change_from_closes([100.0, None, 99.0]) == -1.0
+    assert change_from_closes([None, 100.0]) is None
+    assert change_from_closes(None) is None
+
+
+def test_parse_spark_handles_both_layouts():
+    nested = {"spark": {"result": [
+        {"symbol": "XLK", "response": [{"indicators": {"quote": [{"close": [10, 11]}]}}]},
+        {"symbol": "XLF", "response": []},
+    ]}}
+    assert parse_spark(nested) == {"XLK": [10, 11]}
+    assert parse_spark({"XLK": {"close": [10, 11]}, "XLF": {"error": "x"}}) == {"XLK": [10, 11]}
+
+
+def test_batch_first_then_concurrent_singles_and_missing_reported():
+    batches, singles = [], []
+    active = {"now": 0, "max": 0}
+    lock = threading.Lock()
+
+    def batch(symbols):
+        batches.append(list(symbols))
+        return {"XLK": [100, 102], "XLF": [50, None]}
+
+    def single(symbol):
+        with lock:
+            singles.append(symbol)
+            active["now"] += 1
+            active["max"] = max(active["max"], active["now"])
+        time.sleep(0.05)
+        with lock:
+            active["now"] -= 1
+        if symbol == "XLE":
+            raise ConnectionError("boom")
+        return [100, 99]
+
+    fetcher = PriceFetcher(batch=batch, single=single)
+    changes, missing = fetcher.daily_changes(["XLK", "XLF", "XLV", "XLE"])
+    assert batches == [["XLK", "XLF", "XLV", "XLE"]]
+    assert sorted(singles) == ["XLE", "XLF", "XLV"]
+    assert active["max"] > 1
+    assert changes == {"XLK": 2.0, "XLF": -1.0, "XLV": -1.0}
+    assert missing == ["XLE"]
+
+
+def test_quotes_are_cached_until_ttl_expires():
+    calls = []
+
+    def batch(symbols):
+        calls.append(list(symbols))
+        return {s: [100, 101] for s in symbols}
+
+    fetcher = PriceFetcher(ttl=60, batch=batch)
+    fetcher.daily_changes(["XLK", "XLF"])
+    fetcher.daily_changes(["XLK", "XLF", "XLV"])
+    assert calls == [["XLK", "XLF"], ["XLV"]]
+    assert fetcher.stats["cached"] == 2
+
+    expired = PriceFetcher(ttl=0, batch=batch)
+    expired.daily_changes(["XLK"])
+    expired.daily_changes(["XLK"])
+    assert calls[-2:] == [["XLK"], ["XLK"]]
+
+
+def test_missing_sectors_are_left_out_of_the_average(tmp_path):
+    up = {symbol: [100, 101.5] for symbol in list(SECTOR_SYMBOLS.values())[:3]}
+    fetcher = PriceFetcher(batch=lambda symbols: up, single=lambda symbol: [])
+    score, explanation = calculate_sectors_score(aggregates=SentimentAggregates(tmp_path / "aggregates.json"), fetcher=fetcher)
+    # בעבר כל סקטור חסר נספר כ־0.0% והממוצע ירד ל־0.41%
+    assert score == 80
+    assert "XLRE" in explanation
+
+    nothing = PriceFetcher(batch=lambda symbols: {}, single=lambda symbol: [])
+    score, explanation = calculate_sectors_score(aggregates=SentimentAggregates(tmp_path / "aggregates.json"), fetcher=nothing)
+    assert score == 50 and "ניטרלי" in explanation
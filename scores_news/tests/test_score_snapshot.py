@@ -0,0 +1,97 @@
+# test_score_snapshot.py
+
+import csv
+import json
+from pathlib import Path
+
+from scores_news.cat_scores import final_score
+from scores_news.utils import score_snapshot
+from scores_news.utils.score_snapshot import SNAPSHOT_VERSION, read_snapshot, write_snapshot
+
+SCORES = {
+    "sentiment": {"score": 61, "explanation": "ok", "seconds": 0.1},
+    "bonds": {"score": 40, "explanation": "ok", "seconds": 0.2},
+}
+
+
+def test_snapshot_round_trip_with_version_and_timestamp(tmp_path):
+    path = tmp_path / "snapshot.json"
+    written = write_snapshot(SCORES, 55, "🔒 NEUTRAL", path)
+    snapshot = read_snapshot(path)
+    assert snapshot == json.loads(json.dumps(written))
+    assert snapshot["version"] == SNAPSHOT_VERSION and snapshot["created_at"]
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_stale_or_foreign_snapshots_are_ignored(tmp_path, monkeypatch):
+    path = tmp_path / "snapshot.json"
+    write_snapshot(SCORES, 55, "🔒 NEUTRAL", path)
+    monkeypatch.setattr(score_snapshot.time, "time", lambda: read_snapshot(path)["created_ts"] + 600)
+    assert read_snapshot(path, max_age=300) is None
+    assert read_snapshot(path, max_age=900) is not None
+
+    path.write_text(json.dumps({"version": SNAPSHOT_VERSION + 1, "scores": {}}), encoding="utf-8")
+    assert read_snapshot(path) is None
+    assert read_snapshot(tmp_path / "missing.json") is None
+
+
+def test_fresh_snapshot_is_served_without_recomputing(tmp_path, monkeypatch):
+    path = tmp_path / "snapshot.json"
+    calls = []
+    monkeypatch.setattr(final_score, "load_all_scores", lambda: calls.append(1) or dict(SCORES))
+
+    first = final_score.load_scores_snapshot(path=path)
+    second = final_score.load_scores_snapshot(path=path)
+    assert len(calls) == 1
+    assert second["scores"]["sentiment"]["score"] == 61
+    assert second["final_score"] == first["final_score"]
+
+    final_score.load_scores_snapshot(max_age=-1, path=path)
+    assert len(calls) == 2
+
+
+def test_dashboard_reads_the_snapshot_only(tmp_path, monkeypatch):
+    # הדשבורד מייבא "modules.config" יחסית לתיקייה שלו
+    monkeypatch.syspath_prepend(str(Path(__file__).resolve().parents[2] / "market_dashboard"))
+    from market_dashboard.modules import data
+
+    path = tmp_path / "snapshot.json"
+    write_snapshot(SCORES, 55, "🔒 NEUTRAL", path)
+    monkeypatch.setattr(data, "read_snapshot", lambda: read_snapshot(path))
+    monkeypatch.setattr(data, "DATA_DIR", tmp_path)
+
+    df = data.load_scores()
+    rows = {r["category"]: r["score"] for r in df.to_dict("records")}
+    assert rows["Sentiment"] == 61 and rows["Bonds"] == 40 and rows["VIX"] == 50
+    assert df.attrs["created_at"] == read_snapshot(path)["created_at"]
+    assert list(data.load_time_series().columns) == list(data.CATEGORY_LABELS.values())
+
+
+def test_dashboard_marks_snapshots_from_a_stopped_service(tmp_path, monkeypatch):
+    monkeypatch.syspath_prepend(str(Path(__file__).resolve().parents[2] / "market_dashboard"))
+    from market_dashboard.modules import data
+
+    path = tmp_path / "snapshot.json"
+    write_snapshot(SCORES, 55, "🔒 NEUTRAL", path)
+    monkeypatch.setattr(data, "read_snapshot", lambda: read_snapshot(path))
+    monkeypatch.setattr(data, "DATA_DIR", tmp_path)
+    assert not data.load_scores().attrs["stale"]
+
+    created = read_snapshot(path)["created_ts"]
+    monkeypatch.setattr(score_snapshot.time, "time", lambda: created + score_snapshot.STALE_AFTER + 1)
+    df = data.load_scores()
+    assert df.attrs["stale"] and df["stale"].all()
+    assert all(read_snapshot(path)["created_at"] in e for e in df["explanation"])
+    assert df.loc[df["category"] == "Sentiment", "score"].item() == 61
+
+
+def test_a_reused_snapshot_is_logged_once(tmp_path):
+    path = tmp_path / "score_log.csv"
+    first = write_snapshot(SCORES, 55, "🔒 NEUTRAL", tmp_path / "snapshot.json")
+    assert final_score.save_scores_to_log(dict(SCORES), 55, "🔒 NEUTRAL", path, snapshot_at=first["created_at"])
+    assert not final_score.save_scores_to_log(dict(SCORES), 55, "🔒 NEUTRAL", path, snapshot_at=first["created_at"])
+    assert final_score.save_scores_to_log(dict(SCORES), 57, "🔒 NEUTRAL", path, snapshot_at="2099-01-01T00:00:00")
+
+    with open(path, newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    assert [r["snapshot_at"] for r in rows] == [first["created_at"], "2099-01-01T00:00:00"]
@@ -0,0 +1,52 @@
+# test_sector_entities.py
+
+from scores_news.cat_scores.sector_entities import SectorEntityMatcher, aggregate_key
+from scores_news.cat_scores.sectors_score import SECTOR_SYMBOLS, calculate_sectors_score, sector_news_sentiment
+from scores_news.utils.price_fetcher import PriceFetcher
+from scores_news.utils.sentiment_aggregates import SentimentAggregates
+
+MATCHER = SectorEntityMatcher.load()
+
+
+def test_dictionary_covers_every_sector_bucket():
+    assert set(MATCHER.sectors) == set(SECTOR_SYMBOLS)
+    assert MATCHER.etfs == SECTOR_SYMBOLS
+
+
+def test_companies_keywords_and_tickers_are_tagged_in_one_pass():
+    hits = MATCHER.tag("Exxon Mobil and Chevron slide as crude falls; NVDA rallies")
+    assert set(hits) == {"energy", "tech"}
+    assert MATCHER.tag("$JPM beats on net interest income") == {"finance": 2}
+
+
+def test_matches_respect_word_boundaries_and_case():
+    assert MATCHER.tag("Market turmoil spoils the mood") == {}
+    assert MATCHER.tag("ge and cat are lowercase words here") == {}
+    assert "industrial" in MATCHER.tag("$GE raises its outlook")
+    assert "industrial" in MATCHER.tag("General Electric raises its outlook")
+    # כותרת כולה באותיות גדולות – רק cashtags
+    assert MATCHER.tag("BREAKING: MARKETS GO WILD") == {}
+    assert MATCHER.tag("BA AND CI DOWNGRADED") == {}
+    assert MATCHER.tag("$XOM SLIDES") == {"energy": 1}
+
+
+def test_short_tickers_need_a_cashtag():
+    assert MATCHER.tag("EU and DE officials discuss MS treatment at the CI summit") == {}
+    assert MATCHER.tag("GE raises its outlook") == {}
+    assert MATCHER.tag("$MS and $KO rise") == {"finance": 1, "consumer": 1}
+    assert MATCHER.tag("NVDA and XOM rise") == {"tech": 1, "energy": 1}
+
+
+def test_sector_score_blends_price_and_news(tmp_path):
+    fetcher = PriceFetcher(batch=lambda symbols: {s: [100.0, 100.0] for s in symbols})
+    aggregates = SentimentAggregates(tmp_path / "aggregates.json")
+    price_only, _ = calculate_sectors_score(aggregates, fetcher)
+    assert price_only == 50
+
+    aggregates.add(aggregate_key("energy"), ["positive"] * 20, [90] * 20)
+    aggregates.add(aggregate_key("tech"), ["positive"] * 20, [90] * 20)
+    assert sector_news_sentiment(aggregates) == {"tech": (100.0, 20), "energy": (100.0, 20)}
+
+    score, explanation = calculate_sectors_score(aggregates, fetcher)
+    assert score == 65  # 0.7 * 50 + 0.3 * 100
+    assert "40 כתבות" in explanation
@@ -0,0 +1,41 @@
+# test_seen_store.py
+
+from scores_news.utils.seen_store import BloomFilter, SeenStore
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(1000, 0.01)
+    keys = [f"https://example.com/{i}" for i in range(1000)]
+    for key in keys:
+        bloom.add(key)
+    assert all(key in bloom for key in keys)
+    false_positives = sum(f"https://other.com/{i}" in bloom for i in range(10000))
+    assert false_positives < 300
+
+
+def test_articles_stay_seen_after_restart(tmp_path):
+    path = tmp_path / "seen.sqlite"
+    store = SeenStore(path)
+    assert store.check_and_add(["macro:a", "macro:b", "macro:a"]) == [False, False, True]
+    store.close()
+
+    reopened = SeenStore(path)
+    assert reopened.check_and_add(["macro:a", "macro:c"]) == [True, False]
+    assert "macro:b" in reopened
+
+
+def test_memory_is_bounded_by_rotating_generations(tmp_path):
+    store = SeenStore(tmp_path / "seen.sqlite", capacity=10, generations=2)
+    store.check_and_add([f"k{i}" for i in range(35)])
+    assert len(store._filters) == 2
+    assert len(store) <= 20
+    # הדור הישן נמחק גם מהטבלה – מפתח ותיק נחשב שוב חדש
+    assert store.check_and_add(["k0"]) == [False]
+    assert store.check_and_add(["k34"]) == [True]
+
+
+def test_new_keys_skip_the_exact_check(tmp_path):
+    store = SeenStore(tmp_path / "seen.sqlite")
+    store.check_and_add([f"k{i}" for i in range(100)])
+    store.check_and_add([f"new{i}" for i in range(100)])
+    assert store.stats["exact_checks"] <= 5
@@ -0,0 +1,69 @@
+# test_sentiment_aggregates.py
+
+import json
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from scores_news.cat_scores import sentiment_score
+from scores_news.cat_scores.sentiment_score import calculate_sentiment_score, load_sentiment_score
+from scores_news.utils.sentiment_aggregates import SentimentAggregates
+
+TEXTS = [
+    "Stocks rally strongly, a great win for investors",
+    "Markets plunge amid recession fears and weak guidance",
+    "Fed minutes released on Wednesday",
+]
+
+TODAY = datetime.now().strftime("%Y-%m-%d")
+TOMORROW = (datetime.now() + timedelta(days=1)).strftime("%Y-%m-%d")
+
+
+def test_batches_accumulate_and_persist_across_processes(tmp_path):
+    path = tmp_path / "aggregates.json"
+    aggregates = SentimentAggregates(path)
+    aggregates.add("sentiment", ["positive", "neutral"], [80, 50], day=TODAY)
+    aggregates.add("sentiment", ["negative"], [10], day=TODAY)
+    aggregates.add("macro", ["positive"], [90], day=TODAY)
+    aggregates.save()
+
+    reader = SentimentAggregates(path)
+    assert reader.get("sentiment", TODAY) == {
+        "positive": 1, "negative": 1, "neutral": 1, "total": 3, "score_sum": 140,
+    }
+    assert reader.get("macro", TODAY)["total"] == 1
+    assert reader.get("sentiment", TOMORROW) is None
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_old_days_are_pruned_on_save(tmp_path):
+    path = tmp_path / "aggregates.json"
+    old = (datetime.now() - timedelta(days=40)).strftime("%Y-%m-%d")
+    aggregates = SentimentAggregates(path, keep_days=30)
+    aggregates.add("sentiment", ["neutral"], [50], day=old)
+    aggregates.add("sentiment", ["neutral"], [50])
+    aggregates.save()
+    assert list(json.loads(path.read_text(encoding="utf-8"))) == [TODAY]
+
+
+def test_score_is_read_from_counters_without_rescoring(tmp_path, monkeypatch):
+    aggregates = SentimentAggregates(tmp_path / "aggregates.json")
+    aggregates.add("sentiment", ["positive", "positive", "negative", "neutral"], [90, 80, 10, 50])
+    monkeypatch.setattr(sentiment_score, "load_sentiment_data", lambda date=None: 1 / 0)
+
+    score, explanation = load_sentiment_score(aggregates=aggregates)
+    assert score == 62
+    assert "סה״כ: 4" in explanation
+
+
+def test_counters_match_the_full_recomputation(tmp_path, monkeypatch):
+    df = pd.DataFrame({"title": TEXTS, "summary": [""] * 3})
+    monkeypatch.setattr(sentiment_score, "load_sentiment_data", lambda date=None: df)
+    empty = SentimentAggregates(tmp_path / "none.json")
+    full = load_sentiment_score(aggregates=empty)
+    assert full == calculate_sentiment_score(df)
+
+    compound, labels = sentiment_score.analyze_texts([f"{t} " for t in TEXTS])
+    aggregates = SentimentAggregates(tmp_path / "aggregates.json")
+    aggregates.add("sentiment", labels, ((compound + 1) * 50).astype(int))
+    assert load_sentiment_score(aggregates=aggregates) == full
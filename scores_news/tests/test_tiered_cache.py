@@ -0,0 +1,59 @@
+# test_tiered_cache.py
+
+import time
+
+from scores_news.utils.tiered_cache import MemoryCache, SQLiteCache, TieredCache
+
+
+def test_memory_tier_evicts_least_recently_used():
+    cache = MemoryCache(max_entries=2)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    cache.get("a")
+    cache.set("c", "3")
+    assert cache.get_many(["a", "b", "c"]) == ["1", None, "3"]
+    assert cache.stats["evictions"] == 1
+
+
+def test_memory_tier_honours_ttl():
+    cache = MemoryCache()
+    cache.set("k", "v", ttl=0.05)
+    assert cache.get("k") == "v"
+    time.sleep(0.06)
+    assert cache.get("k") is None
+
+
+def test_sqlite_tier_survives_restart(tmp_path):
+    path = tmp_path / "cache.sqlite"
+    SQLiteCache(path).set_many({"entry:macro:x": "seen"}, ttl=600)
+    reopened = SQLiteCache(path)
+    assert reopened.exists_many(["entry:macro:x", "entry:macro:y"]) == [True, False]
+
+
+def test_lower_tier_hit_is_promoted_and_counted(tmp_path):
+    memory, disk = MemoryCache(), SQLiteCache(tmp_path / "cache.sqlite")
+    disk.set("k", "v")
+    cache = TieredCache([memory, disk], ["memory", "sqlite"])
+
+    assert cache.get("k") == "v"
+    assert memory.get("k") == "v"
+    assert cache.stats["memory"]["misses"] == 1
+    assert cache.stats["sqlite"]["hits"] == 1
+
+    cache.get("k")
+    assert cache.stats["memory"]["hits"] == 1 and cache.stats["sqlite"]["hits"] == 1
+
+
+def test_writes_go_to_every_tier(tmp_path):
+    memory, disk = MemoryCache(), SQLiteCache(tmp_path / "cache.sqlite")
+    cache = TieredCache([memory, disk])
+    cache.set_many({"a": "1", "b": "2"}, ttl=600)
+    assert disk.get_many(["a", "b"]) == ["1", "2"]
+    assert memory.get("a") == "1"
+
+
+def test_default_works_without_redis(tmp_path):
+    cache = TieredCache.default(sqlite_path=tmp_path / "cache.sqlite", use_redis=False)
+    assert cache.names == ["memory", "sqlite"]
+    cache.set("k", "v")
+    assert cache.get("k") == "v"
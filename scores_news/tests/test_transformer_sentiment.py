@@ -0,0 +1,80 @@
+# test_transformer_sentiment.py
+
+from types import SimpleNamespace
+
+import numpy as np
+
+from scores_news.cat_scores import nlp_utils
+from scores_news.cat_scores.transformer_sentiment import TransformerSentiment, load_backend, plan_batches
+from scores_news.utils.sentiment_cache import SentimentCache
+
+
+class _WordTokenizer:
+    """טוקנייזר מינימלי: מילה = טוקן, מזהה = אורך המילה"""
+
+    def encode_batch(self, texts):
+        return [SimpleNamespace(ids=[len(w) for w in t.split()], type_ids=[0] * len(t.split())) for t in texts]
+
+
+class _PositiveWordsSession:
+    """'מודל' שהלוגיט החיובי שלו הוא מספר הטוקנים האמיתיים – ושומר את צורת כל מנה"""
+
+    def __init__(self):
+        self.shapes = []
+
+    def get_inputs(self):
+        return [SimpleNamespace(name="input_ids"), SimpleNamespace(name="attention_mask")]
+
+    def run(self, _, feeds):
+        assert set(feeds) == {"input_ids", "attention_mask"}
+        self.shapes.append(feeds["input_ids"].shape)
+        real = feeds["attention_mask"].sum(axis=1).astype(float)
+        return [np.stack([real, np.zeros_like(real), np.zeros_like(real)], axis=1)]
+
+
+def _model(**settings):
+    session = _PositiveWordsSession()
+    model = TransformerSentiment(session, _WordTokenizer(), {"length_buckets": [4, 8, 16], "max_length": 16, **settings})
+    return model, session
+
+
+def test_batches_pad_to_the_smallest_fitting_bucket():
+    plan = plan_batches([3, 10, 2, 7, 16], [4, 8, 16], max_batch_size=2, max_batch_tokens=1000)
+    assert plan == [([2, 0], 4), ([3, 1], 16), ([4], 16)]
+
+
+def test_token_budget_limits_batch_rows():
+    plan = plan_batches([8] * 5, [8], max_batch_size=64, max_batch_tokens=16)
+    assert [len(indices) for indices, _ in plan] == [2, 2, 1]
+
+
+def test_scores_come_back_in_input_order_and_ignore_padding():
+    model, session = _model()
+    texts = ["a b c d e f g h i j", "a", "a b c"]
+    scores = model.compound_many(texts)
+
+    # padding לא משנה את התוצאה: הציון תלוי רק בטוקנים האמיתיים
+    expected = []
+    for n in (10, 1, 3):
+        p = np.exp([n, 0, 0]) / np.exp([n, 0, 0]).sum()
+        expected.append(round(float(p[0] - p[1]), 4))
+    assert scores == expected
+    assert all(width in (4, 8, 16) for _, width in session.shapes)
+    assert model.stats["real_tokens"] == 14
+
+
+def test_vader_is_the_default_backend():
+    assert load_backend({"backend": "vader"}) is None
+    assert load_backend({"backend": "transformer", "transformer": {"model_path": "/missing.onnx"}}) is None
+
+
+def test_nlp_utils_routes_new_texts_to_the_transformer(monkeypatch):
+    model, session = _model()
+    monkeypatch.setattr(nlp_utils, "_transformer", model)
+    monkeypatch.setattr(nlp_utils, "_transformer_loaded", True)
+    monkeypatch.setattr(nlp_utils, "_sentiment_cache", SentimentCache("test", path=None))
+
+    compound, labels = nlp_utils.analyze_texts(["a b c", "a b c", "x"])
+    assert list(compound) == model.compound_many(["a b c", "a b c", "x"])
+    assert list(labels) == ["positive", "positive", "positive"]
+    assert nlp_utils.scorer_version().startswith("onnx-")
@@ -0,0 +1,71 @@
+# test_vectorized_scores.py
+
+import time
+
+import numpy as np
+import pandas as pd
+
+from scores_news.cat_scores.bonds_score import calculate_bond_score, calculate_bond_scores
+from scores_news.cat_scores.mes_score import calculate_mes_score, calculate_mes_scores
+from scores_news.cat_scores.sectors_score import SECTOR_SYMBOLS, calculate_sectors_score, calculate_sectors_scores
+from scores_news.ml_model.rescore_history import MES_DATA_PATH, load_mes_history, rescore_history
+from scores_news.utils.price_fetcher import PriceFetcher
+from scores_news.utils.sentiment_aggregates import SentimentAggregates
+
+RNG = np.random.default_rng(7)
+
+
+def test_mes_scores_match_the_scalar_function_day_by_day():
+    mes = load_mes_history(MES_DATA_PATH)
+    vectorized = calculate_mes_scores(mes)["mes_score"].tolist()
+    scalar = [calculate_mes_score(mes.iloc[:i + 1])[0] for i in range(len(mes))]
+    assert vectorized == scalar
+
+    closes = 5000 + RNG.normal(0, 40, 300).cumsum()
+    ohlc = pd.DataFrame({"close": closes, "high": closes + RNG.uniform(0, 30, 300), "low": closes - RNG.uniform(0, 30, 300)})
+    ohlc.loc[5, "close"] = ohlc.loc[4, "close"] * 1.003  # בדיוק על הסף
+    vectorized = calculate_mes_scores(ohlc)["mes_score"].tolist()
+    assert vectorized == [calculate_mes_score(ohlc.iloc[:i + 1])[0] for i in range(len(ohlc))]
+
+
+def test_bond_scores_match_including_edges_and_missing_tenors():
+    spreads = [1.5, 1.0, 0.5, 0.0, -0.5, -1.0, -1.5] + list(RNG.uniform(-2, 2, 200))
+    yields = pd.DataFrame({"2Y": 4.0, "10Y": [4.0 + s for s in spreads]})
+    yields.loc[len(yields)] = {"2Y": np.nan, "10Y": 4.5}
+    vectorized = calculate_bond_scores(yields).tolist()
+    scalar = [calculate_bond_score(row.dropna().to_dict())[0] for _, row in yields.iterrows()]
+    assert vectorized == scalar
+    assert calculate_bond_scores(pd.DataFrame({"10Y": [4.0]})).tolist() == [50]
+
+
+def test_sector_scores_match_the_scalar_price_score(tmp_path):
+    symbols = list(SECTOR_SYMBOLS.values())
+    closes = pd.DataFrame(100 + RNG.normal(0, 1.2, (120, len(symbols))).cumsum(axis=0), columns=symbols)
+    closes.iloc[10, 3] = np.nan
+    closes.iloc[20, :] = np.nan
+    vectorized = calculate_sectors_scores(closes)
+
+    aggregates = SentimentAggregates(tmp_path / "aggregates.json")
+    for i in range(1, len(closes)):
+        window = {s: [None if np.isnan(v) else v for v in closes[s].iloc[i - 1:i + 1]] for s in symbols}
+        fetcher = PriceFetcher(batch=lambda chunk, w=window: {s: w[s] for s in chunk}, single=lambda s: [])
+        score, _ = calculate_sectors_score(aggregates, fetcher)
+        assert vectorized["sectors_score"].iloc[i] == score, i
+    assert vectorized["sectors_score"].iloc[0] == 50
+    assert vectorized["missing"].iloc[21] == len(symbols)
+
+
+def test_years_of_rows_rescored_well_under_a_second():
+    days = 252 * 10
+    dates = pd.bdate_range("2015-01-01", periods=days)
+    closes = 4000 + RNG.normal(0, 30, days).cumsum()
+    mes = pd.DataFrame({"date": dates, "open": closes - RNG.normal(0, 10, days), "close": closes})
+    yields = pd.DataFrame({"2Y": RNG.uniform(3, 5, days), "10Y": RNG.uniform(3, 5, days)}, index=dates)
+    sector_closes = pd.DataFrame(100 + RNG.normal(0, 1, (days, len(SECTOR_SYMBOLS))).cumsum(axis=0),
+                                 index=dates, columns=list(SECTOR_SYMBOLS.values()))
+
+    start = time.perf_counter()
+    scores = rescore_history(mes, yields, sector_closes)
+    assert time.perf_counter() - start < 1.0
+    assert len(scores) == days
+    assert scores[["mes_score", "bonds_score", "sectors_score"]].notna().all().all()
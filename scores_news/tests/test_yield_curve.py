@@ -0,0 +1,119 @@
+# test_yield_curve.py
+
+import io
+import threading
+from datetime import datetime
+
+import pytest
+
+from scores_news.cat_scores.bonds_score import calculate_bond_score, extract_yields_from_treasury_xml
+from scores_news.utils.yield_curve import YieldCurveStore, parse_yield_curve_xml
+
+
+def _month_xml(days: dict) -> bytes:
+    """מסמך בפורמט של משרד האוצר (Atom + OData) עם יום אחד לכל entry"""
+    entries = "".join(
+        f"""<entry><content type="application/xml"><m:properties>
+            <d:Id m:type="Edm.Int32">1</d:Id>
+            <d:NEW_DATE m:type="Edm.DateTime">{date}T00:00:00</d:NEW_DATE>
+            <d:BC_1MONTH m:type="Edm.Double">{y[0]}</d:BC_1MONTH>
+            <d:BC_3MONTH m:type="Edm.Double">{y[1]}</d:BC_3MONTH>
+            <d:BC_2YEAR m:type="Edm.Double">{y[2]}</d:BC_2YEAR>
+            <d:BC_10YEAR m:type="Edm.Double">{y[3]}</d:BC_10YEAR>
+            <d:BC_30YEAR m:type="Edm.Double">{y[4]}</d:BC_30YEAR>
+            <d:BC_1_5MONTH m:type="Edm.Double" m:null="true" />
+        </m:properties></content></entry>"""
+        for date, y in days.items()
+    )
+    return (
+        '<?xml version="1.0" encoding="utf-8"?>'
+        '<feed xmlns="http://www.w3.org/2005/Atom" '
+        'xmlns:d="http://schemas.microsoft.com/ado/2007/08/dataservices" '
+        'xmlns:m="http://schemas.microsoft.com/ado/2007/08/dataservices/metadata">'
+        f"{entries}</feed>"
+    ).encode("utf-8")
+
+
+APRIL = _month_xml({"2024-04-29": (5.4, 5.45, 4.98, 4.61, 4.75), "2024-04-30": (5.4, 5.46, 5.04, 4.69, 4.79)})
+MAY = _month_xml({"2024-05-01": (5.5, 5.46, 4.96, 4.63, 4.77)})
+
+
+def test_streaming_parse_reads_every_tenor_of_every_day():
+    curves = parse_yield_curve_xml(io.BytesIO(APRIL))
+    assert list(curves) == ["2024-04-29", "2024-04-30"]
+    assert curves["2024-04-30"] == {"1M": 5.4, "3M": 5.46, "2Y": 5.04, "10Y": 4.69, "30Y": 4.79}
+
+
+def test_extract_keeps_the_old_contract_with_all_tenors():
+    yields = extract_yields_from_treasury_xml(APRIL)
+    assert yields["2Y"] == 5.04 and yields["10Y"] == 4.69 and yields["3M"] == 5.46
+    score, _ = calculate_bond_score(yields)
+    assert score == 40
+
+
+def test_closed_months_are_fetched_once_and_current_month_on_refresh(tmp_path):
+    calls = []
+    months = {"202404": APRIL, "202405": MAY}
+
+    def fetch(year_month):
+        calls.append(year_month)
+        return io.BytesIO(months[year_month])
+
+    path = tmp_path / "curve.json"
+    now = datetime(2024, 5, 1, 18, 0)
+    store = YieldCurveStore(path, fetch=fetch, refresh_interval=3600)
+    store.refresh(now)
+    store.refresh(now)
+    assert sorted(calls) == ["202404", "202405"]
+    assert store.latest() == ("2024-05-01", {"1M": 5.5, "3M": 5.46, "2Y": 4.96, "10Y": 4.63, "30Y": 4.77})
+    assert store.latest("2024-04-30")[0] == "2024-04-30"
+    assert store.history("10Y") == {"2024-04-29": 4.61, "2024-04-30": 4.69, "2024-05-01": 4.63}
+
+    # תהליך חדש: החודש הסגור נטען מהדיסק, רק החודש הנוכחי נמשך כשהוא לא עדכני
+    reopened = YieldCurveStore(path, fetch=fetch, refresh_interval=0)
+    reopened.refresh(now)
+    assert calls[2:] == ["202405"]
+    assert reopened.latest()[0] == "2024-05-01"
+
+
+def test_failed_download_backs_off_and_concurrent_refreshes_fetch_once(tmp_path):
+    calls = []
+    gate = threading.Event()
+
+    def failing(year_month):
+        calls.append(year_month)
+        raise ConnectionError("treasury down")
+
+    store = YieldCurveStore(tmp_path / "curve.json", fetch=failing, refresh_interval=3600)
+    now = datetime(2024, 5, 1, 18, 0)
+    with pytest.raises(ConnectionError):
+        store.refresh(now)
+    # כל חודש נוסה פעם אחת – הקריאות הבאות מוותרות עד שיעבור refresh_interval
+    store.refresh(now)
+    store.refresh(now)
+    assert calls == ["202405", "202404"]
+
+    def slow(year_month):
+        calls.append(year_month)
+        gate.wait(1)
+        return io.BytesIO({"202404": APRIL, "202405": MAY}[year_month])
+
+    fresh = YieldCurveStore(None, fetch=slow, refresh_interval=3600)
+    calls.clear()
+    threads = [threading.Thread(target=fresh.refresh, args=(now,)) for _ in range(4)]
+    for t in threads:
+        t.start()
+    gate.set()
+    for t in threads:
+        t.join()
+    assert sorted(calls) == ["202404", "202405"]
+
+
+def test_latest_skips_days_without_the_spread_tenors(tmp_path):
+    partial = APRIL.replace(b"<d:BC_2YEAR m:type=\"Edm.Double\">5.04</d:BC_2YEAR>", b"")
+    assert extract_yields_from_treasury_xml(partial)["2Y"] == 4.98
+
+    store = YieldCurveStore(None, fetch=lambda ym: io.BytesIO(partial), refresh_interval=3600)
+    store.ensure_month("202404", datetime(2024, 5, 1))
+    assert store.latest()[0] == "2024-04-30"
+    assert store.latest(required=("2Y", "10Y"))[0] == "2024-04-29"
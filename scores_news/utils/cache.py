@@ -11,8 +11,12 @@ log a warning.  This is particularly important for environments where the
 running Python version.
 """
 
+import inspect
+import json
 import logging
-import requests
+
+from scores_news.utils.cache_codec import decode, encode, is_encoded
+from scores_news.utils.http_client import http_get
 
 try:
     import redis  # type: ignore
@@ -26,6 +30,13 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+def _from_redis(value):
+    """Redis returns bytes: codec-encoded values stay bytes, everything else is UTF-8 text."""
+    if not value:
+        return None
+    return value if is_encoded(value) else value.decode('utf-8')
+
+
 class RedisCache:
     """Simple caching wrapper around Redis.
 
@@ -62,9 +73,9 @@ class RedisCache:
         try:
             value = self.redis_client.get(key)
             if value:
-                logger.info(f"Cache HIT for key: {key}")
-                return value.decode('utf-8')
-            logger.info(f"Cache MISS for key: {key}")
+                logger.debug(f"Cache HIT for key: {key}")
+                return _from_redis(value)
+            logger.debug(f"Cache MISS for key: {key}")
             return None
         except Exception as e:
             logger.error(f"Redis get error for key {key}: {e}")
@@ -82,23 +93,213 @@ class RedisCache:
         expire_time = ttl if ttl is not None else self.ttl_seconds
         try:
             self.redis_client.set(key, value, ex=expire_time)
-            logger.info(f"Cache SET for key: {key} with TTL {expire_time} seconds")
+            logger.debug(f"Cache SET for key: {key} with TTL {expire_time} seconds")
         except Exception as e:
             logger.error(f"Redis set error for key {key}: {e}")
 
+    def get_many(self, keys) -> list:
+        """Retrieve several values with a single ``MGET`` round-trip.
+
+        Returns a list aligned with ``keys``; missing keys (or a disabled cache)
+        yield ``None``.
+        """
+        keys = list(keys)
+        if not keys or not getattr(self, 'redis_client', None):
+            return [None] * len(keys)
+        try:
+            values = self.redis_client.mget(keys)
+        except Exception as e:
+            logger.error(f"Redis mget error for {len(keys)} keys: {e}")
+            return [None] * len(keys)
+        hits = sum(1 for v in values if v)
+        logger.debug(f"Cache MGET: {hits}/{len(keys)} hits")
+        return [_from_redis(v) for v in values]
+
+    def set_many(self, mapping: dict, ttl: int | None = None) -> None:
+        """Store several values in one pipelined round-trip, all with the same TTL."""
+        if not mapping or not getattr(self, 'redis_client', None):
+            return
+        expire_time = ttl if ttl is not None else self.ttl_seconds
+        try:
+            pipe = self.redis_client.pipeline(transaction=False)
+            for key, value in mapping.items():
+                pipe.set(key, value, ex=expire_time)
+            pipe.execute()
+            logger.debug(f"Cache SET for {len(mapping)} keys with TTL {expire_time} seconds")
+        except Exception as e:
+            logger.error(f"Redis pipelined set error for {len(mapping)} keys: {e}")
+
+    def exists_many(self, keys) -> list:
+        """Return a list of booleans telling which of ``keys`` are present (one round-trip)."""
+        keys = list(keys)
+        if not keys or not getattr(self, 'redis_client', None):
+            return [False] * len(keys)
+        try:
+            pipe = self.redis_client.pipeline(transaction=False)
+            for key in keys:
+                pipe.exists(key)
+            return [bool(n) for n in pipe.execute()]
+        except Exception as e:
+            logger.error(f"Redis pipelined exists error for {len(keys)} keys: {e}")
+            return [False] * len(keys)
+
+
+# ---------------------------------------------------------------
+# Batch helpers that work with any cache object.
+#
+# RedisCache and the TieredCache levels implement get_many / set_many natively;
+# simpler caches that only have get / set (tests, in-memory stand-ins) fall back
+# to one call per key.  The ``a``-prefixed variants are what the feed engine
+# calls from its event loop; they also await a cache whose methods are coroutines.
+def bulk_get(cache, keys) -> list:
+    keys = list(keys)
+    if hasattr(cache, "get_many"):
+        return cache.get_many(keys)
+    return [cache.get(key) for key in keys]
+
+
+def bulk_set(cache, mapping: dict, ttl: int | None = None) -> None:
+    if not mapping:
+        return
+    if hasattr(cache, "set_many"):
+        return cache.set_many(mapping, ttl)
+    for key, value in mapping.items():
+        cache.set(key, value, ttl=ttl)
+
+
+async def abulk_get(cache, keys) -> list:
+    result = bulk_get(cache, keys)
+    return await result if inspect.isawaitable(result) else result
+
+
+async def abulk_set(cache, mapping: dict, ttl: int | None = None) -> None:
+    result = bulk_set(cache, mapping, ttl)
+    if inspect.isawaitable(result):
+        await result
+
+# ---------------------------------------------------------------
+# Conditional GET support.
+#
+# For every feed URL the cache keeps:
+#   rss_fresh:{url}       short-lived marker – while present the cached copy is used as-is
+#   rss_validators:{url}  ETag / Last-Modified returned by the server
+#   rss_entries:{url}     normalized entry list (feed engine / listener)
+#   rss_cache:{url}       raw body (fetch_url_with_cache)
+# fetch_url_with_cache keeps its freshness marker and validators under
+# ``BODY_SCOPE`` (rss_fresh:body:{url}, rss_validators:body:{url}): they
+# describe the stored body, not the stored entry list, so sharing them would
+# let a 304 to one consumer serve the other's older payload.
+# Entry lists and bodies are stored through ``cache_codec`` (compressed bytes);
+# plain-string values from before the codec are still read.
+# Validators and payloads outlive the freshness TTL so that, once the marker
+# expires, the next request can be sent conditionally and a ``304 Not Modified``
+# reuses the stored payload instead of downloading and parsing it again.
+VALIDATOR_TTL = 7 * 24 * 3600
+BODY_SCOPE = ":body"  # מרחב הטריות וה־validators של הגוף הגולמי (fetch_url_with_cache)
+
+
+def mark_fresh(cache, url: str, ttl: int | None = None, scope: str = "") -> None:
+    cache.set(f"rss_fresh{scope}:{url}", "1", ttl=ttl)
+
+
+def _loads(raw, default=None):
+    if not raw:
+        return default
+    try:
+        return json.loads(raw)
+    except ValueError:
+        return default
+
+
+def validators_payload(response_headers):
+    """JSON of the ETag / Last-Modified headers of a 200 response, or None if the server sent neither."""
+    validators = {
+        "etag": response_headers.get("ETag"),
+        "last_modified": response_headers.get("Last-Modified"),
+    }
+    validators = {k: v for k, v in validators.items() if v}
+    return json.dumps(validators) if validators else None
+
+
+def conditional_headers(validators: dict) -> dict:
+    """Build ``If-None-Match`` / ``If-Modified-Since`` request headers from stored validators."""
+    headers = {}
+    if validators.get("etag"):
+        headers["If-None-Match"] = validators["etag"]
+    if validators.get("last_modified"):
+        headers["If-Modified-Since"] = validators["last_modified"]
+    return headers
+
+
+def _decode_entries(raw, url: str = ""):
+    try:
+        return decode(raw, legacy="json")
+    except ValueError:
+        logger.warning(f"Corrupt cached entries for {url}")
+        return None
+
+
+def feed_entries_payload(url: str, entries: list, response_headers=None, scope: str = "") -> dict:
+    """Keys/values (all with ``VALIDATOR_TTL``) that persist ``entries`` and the response validators."""
+    payload = {f"rss_entries:{url}": encode(entries)}
+    validators = validators_payload(response_headers) if response_headers is not None else None
+    if validators:
+        payload[f"rss_validators{scope}:{url}"] = validators
+    return payload
+
+
+def feed_state_keys(url: str, scope: str = "", with_entries: bool = True) -> list:
+    """Cache keys read by :func:`parse_feed_state` – fetched for many feeds with one ``MGET``."""
+    keys = [f"rss_validators{scope}:{url}"]
+    if with_entries:
+        keys += [f"rss_fresh:{url}", f"rss_entries:{url}"]
+    return keys
+
+
+def parse_feed_state(values: list) -> dict:
+    """Decode the values of :func:`feed_state_keys` into ``{"validators", "fresh", "entries"}``."""
+    validators = _loads(values[0], {})
+    fresh = bool(values[1]) if len(values) > 1 else False
+    entries = _decode_entries(values[2]) if len(values) > 2 else None
+    return {"validators": validators, "fresh": fresh, "entries": entries}
+
+
 def fetch_url_with_cache(url: str, cache: RedisCache, headers=None, timeout=30, retries=1):
     cache_key = f"rss_cache:{url}"
-    cached_data = cache.get(cache_key)
-    if cached_data:
+    # סימון טריות, ולידטורים וגוף שמור – בבקשת MGET אחת
+    fresh, validators_raw, cached_raw = bulk_get(
+        cache, [f"rss_fresh{BODY_SCOPE}:{url}", f"rss_validators{BODY_SCOPE}:{url}", cache_key]
+    )
+    try:
+        cached_data = decode(cached_raw)
+    except ValueError:
+        cached_data = None
+    if fresh and cached_data:
         return cached_data
 
-    # לא נמצא במטמון, נטען מהאינטרנט
+    # לא טרי במטמון – בקשה מותנית אם יש לנו ETag / Last-Modified וגוף שמור
+    request_headers = dict(headers or {})
+    if cached_data:
+        request_headers.update(conditional_headers(_loads(validators_raw, {})))
+
     logging.info(f"Fetching RSS feed from internet: {url}")
     for attempt in range(retries + 1):
         try:
-            response = requests.get(url, headers=headers, timeout=timeout)
+            response = http_get(url, headers=request_headers, timeout=timeout)
+            if response.status_code == 304:
+                if cached_data:
+                    logging.info(f"304 Not Modified – reusing cached body for {url}")
+                    mark_fresh(cache, url, scope=BODY_SCOPE)
+                    return cached_data
+                # הגוף נמחק מהמטמון בינתיים – בקשה רגילה
+                response = http_get(url, headers=headers, timeout=timeout)
             response.raise_for_status()
-            cache.set(cache_key, response.text)
+            payload = {cache_key: encode(response.text)}
+            validators = validators_payload(response.headers)
+            if validators:
+                payload[f"rss_validators{BODY_SCOPE}:{url}"] = validators
+            bulk_set(cache, payload, ttl=VALIDATOR_TTL)
+            mark_fresh(cache, url, scope=BODY_SCOPE)
             return response.text
         except Exception as e:
             logging.warning(f"Attempt {attempt+1} failed for {url}: {e}")
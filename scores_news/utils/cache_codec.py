@@ -0,0 +1,163 @@
+# utils/cache_codec.py
+"""
+Compact, versioned encoding for large cache values (raw feed bodies, entry lists).
+
+An encoded value is ``bytes``::
+
+    MAGIC (3 bytes) | version (1) | format (1) | compression (1) | payload
+
+* format      – ``t`` UTF-8 text, ``j`` compact JSON, ``m`` msgpack (if installed)
+* compression – ``0`` none, ``z`` zlib, ``s`` zstd (if ``zstandard`` is installed)
+
+Values below ``MIN_COMPRESS_BYTES`` are stored uncompressed; for anything else
+the best available compressor is used.  RSS XML and entry lists usually shrink
+5-10x.  :func:`decode` also accepts the plain strings written before this
+codec existed, so existing cache entries stay readable.
+
+Byte counts and encode/decode timings accumulate in :data:`codec_stats`.
+"""
+
+import json
+import threading
+import time
+import zlib
+
+try:
+    import zstandard  # type: ignore
+except ImportError:
+    zstandard = None
+
+try:
+    import msgpack  # type: ignore
+except ImportError:
+    msgpack = None
+
+MAGIC = b"\x00AM"
+VERSION = 1
+MIN_COMPRESS_BYTES = 256
+ZLIB_LEVEL = 6
+ZSTD_LEVEL = 3
+
+
+class CodecStats:
+    """Running totals of bytes saved and time spent encoding / decoding."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        self.encoded = 0
+        self.decoded = 0
+        self.raw_bytes = 0
+        self.stored_bytes = 0
+        self.encode_seconds = 0.0
+        self.decode_seconds = 0.0
+
+    def record_encode(self, raw: int, stored: int, seconds: float) -> None:
+        with self._lock:
+            self.encoded += 1
+            self.raw_bytes += raw
+            self.stored_bytes += stored
+            self.encode_seconds += seconds
+
+    def record_decode(self, seconds: float) -> None:
+        with self._lock:
+            self.decoded += 1
+            self.decode_seconds += seconds
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "encoded": self.encoded,
+                "decoded": self.decoded,
+                "raw_bytes": self.raw_bytes,
+                "stored_bytes": self.stored_bytes,
+                "bytes_saved": self.raw_bytes - self.stored_bytes,
+                "ratio": round(self.raw_bytes / self.stored_bytes, 2) if self.stored_bytes else None,
+                "avg_encode_ms": round(self.encode_seconds / self.encoded * 1000, 3) if self.encoded else 0.0,
+                "avg_decode_ms": round(self.decode_seconds / self.decoded * 1000, 3) if self.decoded else 0.0,
+            }
+
+
+codec_stats = CodecStats()
+
+
+def _compress(data: bytes) -> tuple[bytes, bytes]:
+    if len(data) < MIN_COMPRESS_BYTES:
+        return b"0", data
+    if zstandard is not None:
+        return b"s", zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+    return b"z", zlib.compress(data, ZLIB_LEVEL)
+
+
+def _decompress(kind: bytes, data: bytes) -> bytes:
+    """Decompress a payload; a corrupt one raises ValueError like every other decode failure."""
+    if kind == b"0":
+        return data
+    if kind == b"z":
+        try:
+            return zlib.decompress(data)
+        except zlib.error as e:
+            raise ValueError(f"corrupt zlib payload: {e}") from e
+    if kind == b"s":
+        if zstandard is None:
+            raise ValueError("value was compressed with zstd but zstandard is not installed")
+        try:
+            return zstandard.ZstdDecompressor().decompress(data)
+        except zstandard.ZstdError as e:
+            raise ValueError(f"corrupt zstd payload: {e}") from e
+    raise ValueError(f"unknown compression {kind!r}")
+
+
+def is_encoded(value) -> bool:
+    return isinstance(value, (bytes, bytearray)) and bytes(value[:3]) == MAGIC
+
+
+def encode(value) -> bytes:
+    """Encode a string (stored as text) or a JSON-compatible object."""
+    started = time.perf_counter()
+    if isinstance(value, str):
+        fmt, raw = b"t", value.encode("utf-8")
+    elif msgpack is not None:
+        fmt, raw = b"m", msgpack.packb(value, use_bin_type=True)
+    else:
+        fmt, raw = b"j", json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    kind, payload = _compress(raw)
+    data = MAGIC + bytes([VERSION]) + fmt + kind + payload
+    codec_stats.record_encode(len(raw), len(data), time.perf_counter() - started)
+    return data
+
+
+def decode(value, legacy: str = "text"):
+    """Decode a value produced by :func:`encode`.
+
+    Values written before the codec (plain strings) are returned as-is for
+    ``legacy="text"`` or parsed with ``json.loads`` for ``legacy="json"``.
+    Returns None for an empty value.
+    """
+    if value is None or value == "" or value == b"":
+        return None
+    if not is_encoded(value):
+        if isinstance(value, (bytes, bytearray)):
+            value = bytes(value).decode("utf-8")
+        return json.loads(value) if legacy == "json" else value
+
+    started = time.perf_counter()
+    value = bytes(value)
+    version, fmt, kind = value[3], value[4:5], value[5:6]
+    if version != VERSION:
+        raise ValueError(f"unsupported cache codec version {version}")
+    raw = _decompress(kind, value[6:])
+    if fmt == b"t":
+        result = raw.decode("utf-8")
+    elif fmt == b"j":
+        result = json.loads(raw)
+    elif fmt == b"m":
+        if msgpack is None:
+            raise ValueError("value was packed with msgpack but msgpack is not installed")
+        result = msgpack.unpackb(raw, raw=False)
+    else:
+        raise ValueError(f"unknown format {fmt!r}")
+    codec_stats.record_decode(time.perf_counter() - started)
+    return result
@@ -5,6 +5,10 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../.
 
 from datetime import datetime, timedelta
 
+import pandas as pd
+
+from scores_news.utils.near_dup import dedupe_articles
+
 
 def clean_articles(df: pd.DataFrame) -> pd.DataFrame:
     # סינון כותרות ריקות
@@ -20,4 +24,8 @@ def clean_articles(df: pd.DataFrame) -> pd.DataFrame:
     # הסרת כפילויות לפי כותרת + לינק
     df = df.drop_duplicates(subset=["title", "link"])
 
+    # הסרת כמעט־כפילויות (אותה ידיעה בכמה מקורות עם שינוי קל בכותרת)
+    if not df.empty:
+        df = pd.DataFrame(dedupe_articles(df.to_dict(orient="records")))
+
     return df.reset_index(drop=True)
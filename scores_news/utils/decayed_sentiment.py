@@ -0,0 +1,176 @@
+# utils/decayed_sentiment.py
+"""
+Exponentially time-decayed sentiment, per category and per source.
+
+The count-based scores weigh a headline from 23 hours ago the same as one
+from 5 minutes ago.  Here each article's 0-100 score is weighted by
+``2 ** (-age / half_life)``.  Each accumulator keeps only three numbers (a
+decayed weighted sum, the decayed total weight and the timestamp they
+refer to):
+
+* adding an article is O(1): the state is decayed to the article's
+  timestamp and the article is added with weight 1.  An article older than
+  the state is added with its own decay factor, so the arrival order
+  doesn't matter;
+* querying at any timestamp at or after the last update is O(1): the mean
+  is unchanged by decay, only the effective mass (how many "fresh" articles
+  back it) shrinks.  Earlier timestamps can't be answered from the folded
+  state (later articles are already in the mean) and raise ``ValueError``.
+
+The score shrinks towards neutral 50 as the mass decays, with
+``prior_weight`` pseudo-articles at 50.  With no recent news the score
+drifts back to neutral instead of freezing on the last headline.
+
+Half-lives are configured per category in ``config/sentiment_decay.json``.
+The state lives in ``logs/decayed_sentiment.json``, written atomically by
+the RSS listener and read by ``final_score``.
+"""
+
+import json
+import logging
+import os
+import time
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = Path(__file__).resolve().parents[2]
+DECAY_CONFIG_PATH = BASE_DIR / "scores_news" / "config" / "sentiment_decay.json"
+STATE_PATH = BASE_DIR / "scores_news" / "logs" / "decayed_sentiment.json"
+
+DEFAULT_HALF_LIFE_HOURS = 6.0
+DEFAULT_PRIOR_WEIGHT = 2.0
+NEUTRAL = 50.0
+
+
+def load_decay_config(path: Path | str = DECAY_CONFIG_PATH) -> dict:
+    """``{"half_life_hours": {"default": h, <category>: h}, "prior_weight": w}``."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            config = json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Could not read sentiment decay config from {path}: {e}")
+        config = {}
+    half_lives = config.get("half_life_hours", {})
+    if not isinstance(half_lives, dict):
+        half_lives = {"default": half_lives}
+    half_lives.setdefault("default", DEFAULT_HALF_LIFE_HOURS)
+    return {"half_life_hours": half_lives, "prior_weight": config.get("prior_weight", DEFAULT_PRIOR_WEIGHT)}
+
+
+class DecayedAccumulator:
+    """Decayed weighted mean of a stream of (timestamp, value) observations."""
+
+    __slots__ = ("half_life", "weighted_sum", "weight", "ts")
+
+    def __init__(self, half_life: float, weighted_sum: float = 0.0, weight: float = 0.0, ts: float | None = None) -> None:
+        self.half_life = half_life
+        self.weighted_sum = weighted_sum
+        self.weight = weight
+        self.ts = ts
+
+    def _factor(self, seconds: float) -> float:
+        return 2.0 ** (-seconds / self.half_life)
+
+    def add(self, value: float, ts: float) -> None:
+        if self.ts is None:
+            self.ts = ts
+        if ts >= self.ts:
+            factor = self._factor(ts - self.ts)
+            self.weighted_sum *= factor
+            self.weight *= factor
+            self.ts = ts
+            w = 1.0
+        else:
+            w = self._factor(self.ts - ts)
+        self.weighted_sum += w * value
+        self.weight += w
+
+    def mass_at(self, ts: float) -> float:
+        """Effective number of articles at ``ts`` (``ts`` must not precede the last update)."""
+        if self.ts is None:
+            return 0.0
+        if ts < self.ts:
+            raise ValueError(f"cannot query decayed state at {ts}: it was last updated at {self.ts}")
+        return self.weight * self._factor(ts - self.ts)
+
+    def mean(self) -> float | None:
+        return self.weighted_sum / self.weight if self.weight else None
+
+    def score_at(self, ts: float, prior_weight: float = DEFAULT_PRIOR_WEIGHT, prior: float = NEUTRAL) -> float:
+        mass = self.mass_at(ts)
+        mean = self.mean()
+        if mean is None:
+            return prior
+        return (mass * mean + prior_weight * prior) / (mass + prior_weight)
+
+    def to_dict(self) -> dict:
+        return {"weighted_sum": self.weighted_sum, "weight": self.weight, "ts": self.ts}
+
+
+class DecayedSentiment:
+    """Persisted accumulators keyed by ``category`` and ``category/source``."""
+
+    def __init__(self, path: Path | str = STATE_PATH, config: dict | None = None) -> None:
+        self.path = Path(path)
+        self.config = config if config is not None else load_decay_config()
+        self._accumulators = {}
+        self._dirty = False
+        self.reload()
+
+    def half_life_hours(self, category: str) -> float:
+        half_lives = self.config["half_life_hours"]
+        return float(half_lives.get(category, half_lives["default"]))
+
+    def reload(self) -> None:
+        if not self.path.exists():
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not read decayed sentiment from {self.path}: {e}")
+            return
+        self._accumulators = {
+            key: DecayedAccumulator(self.half_life_hours(key.split("/", 1)[0]) * 3600, **values)
+            for key, values in state.items()
+        }
+
+    def _accumulator(self, key: str, category: str) -> DecayedAccumulator:
+        acc = self._accumulators.get(key)
+        if acc is None:
+            acc = self._accumulators[key] = DecayedAccumulator(self.half_life_hours(category) * 3600)
+        return acc
+
+    def add(self, category: str, score: float, source: str | None = None, ts: float | None = None) -> None:
+        """Record one article's 0-100 score at ``ts`` (default now; future timestamps are clamped)."""
+        now = time.time()
+        ts = now if ts is None else min(ts, now)
+        self._accumulator(category, category).add(score, ts)
+        if source:
+            self._accumulator(f"{category}/{source}", category).add(score, ts)
+        self._dirty = True
+
+    def score(self, category: str, source: str | None = None, ts: float | None = None) -> tuple[float, float] | None:
+        """``(score, effective_mass)`` at ``ts`` (default now), or None if nothing was recorded."""
+        acc = self._accumulators.get(f"{category}/{source}" if source else category)
+        if acc is None or acc.ts is None:
+            return None
+        # ברירת המחדל "עכשיו" – לא לפני העדכון האחרון (למשל state שנכתב בשעון מעט מקדים)
+        ts = max(time.time(), acc.ts) if ts is None else ts
+        return acc.score_at(ts, self.config["prior_weight"]), acc.mass_at(ts)
+
+    def sources(self, category: str) -> list:
+        prefix = f"{category}/"
+        return [key[len(prefix):] for key in self._accumulators if key.startswith(prefix)]
+
+    def save(self) -> None:
+        """Write the state atomically (temp file + rename)."""
+        if not self._dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({key: acc.to_dict() for key, acc in self._accumulators.items()}, f, indent=2)
+        os.replace(tmp_path, self.path)
+        self._dirty = False
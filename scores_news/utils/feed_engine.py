@@ -0,0 +1,337 @@
+# utils/feed_engine.py
+"""
+Asynchronous RSS fetch engine shared by every category scorer.
+
+All feeds of a cycle are downloaded concurrently with ``aiohttp``.  Two
+semaphores keep the load polite: a global one that bounds the number of
+in-flight requests and a per-host one so a single site (nasdaq.com, cnbc.com)
+is never hit with more than a few parallel connections.  Every request has its
+own deadline, so a dead host costs at most ``timeout`` seconds instead of
+stalling the whole cycle.
+
+The engine returns normalized article dictionaries with the same keys the
+scorers already use (``title``, ``summary``, ``link``, ``published``,
+``source``).  A failed feed simply yields an empty list.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+import xml.etree.ElementTree as ET
+from urllib.parse import urlsplit
+
+import aiohttp
+import feedparser
+
+from scores_news.utils.cache import (
+    VALIDATOR_TTL,
+    abulk_get,
+    abulk_set,
+    conditional_headers,
+    feed_entries_payload,
+    feed_state_keys,
+    parse_feed_state,
+    validators_payload,
+)
+from scores_news.utils.feed_marks import NewItemsParser, filter_new, mark_for
+from scores_news.utils.http_client import host_stats as shared_host_stats
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/124.0.0.0 Safari/537.36"
+    )
+}
+
+MAX_CONCURRENCY = 16       # בקשות במקביל בסך הכל
+PER_HOST_CONCURRENCY = 4   # בקשות במקביל לכל שרת
+REQUEST_TIMEOUT = 10       # שניות לכל בקשה
+RETRIES = 1                # ניסיונות חוזרים לאחר כישלון
+CHUNK_SIZE = 16 * 1024     # גודל מקטע בקריאה הזורמת של פיד
+MARKS_SCOPE = ":marks"     # מרחב ה־validators של מצב high-water marks
+
+
+def normalize_entries(entries, source: str) -> list:
+    """Convert feedparser entries into the plain article dicts used by the scorers."""
+    articles = []
+    for entry in entries:
+        articles.append({
+            "title": entry.get("title", ""),
+            "summary": entry.get("summary", ""),
+            "link": entry.get("link", ""),
+            "published": entry.get("published", ""),
+            "source": source
+        })
+    return articles
+
+
+class FeedFetchEngine:
+    """Concurrent RSS downloader with global/per-host limits and per-request deadlines.
+
+    If a cache object is supplied (anything with ``get``/``set``), normalized
+    entries are stored under ``rss_entries:{url}`` and served without a request
+    for ``cache_ttl`` seconds.  After that the feed is revalidated with a
+    conditional GET; a ``304`` reuses the stored entries without re-parsing.
+
+    Cache traffic is batched per cycle: the state of every feed is read with one
+    ``get_many`` before the downloads start, and all writes are flushed with
+    one ``set_many`` per TTL at the end.  The cache may be a :class:`RedisCache`,
+    a :class:`TieredCache` or anything with plain ``get``/``set``.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = MAX_CONCURRENCY,
+        per_host: int = PER_HOST_CONCURRENCY,
+        timeout: float = REQUEST_TIMEOUT,
+        retries: int = RETRIES,
+        headers: dict | None = None,
+        cache=None,
+        cache_ttl: int = 600,
+        host_stats=None,
+    ) -> None:
+        self.max_concurrency = max_concurrency
+        self.per_host = per_host
+        self.timeout = timeout
+        self.retries = retries
+        self.headers = headers or DEFAULT_HEADERS
+        self.cache = cache
+        self.cache_ttl = cache_ttl
+        # לטנסי לכל host – אותו אוסף כמו של http_client
+        self.host_stats = host_stats if host_stats is not None else shared_host_stats
+        self.stats = {"downloaded": 0, "not_modified": 0, "cache_hits": 0, "failed": 0, "stopped_early": 0}
+
+    async def _timed(self, host: str, coro):
+        """Await ``coro`` and record its latency (and failure) for ``host``."""
+        started = time.perf_counter()
+        try:
+            result = await coro
+        except Exception:
+            self.host_stats.record(host, time.perf_counter() - started, ok=False)
+            raise
+        self.host_stats.record(host, time.perf_counter() - started)
+        return result
+
+    async def _download(self, session, url: str, headers: dict | None = None):
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        async with session.get(url, timeout=timeout, headers=headers) as response:
+            if response.status == 304:
+                return 304, b"", response.headers
+            response.raise_for_status()
+            return response.status, await response.read(), response.headers
+
+    async def _load_states(self, urls, scope: str = "", with_entries: bool = True) -> dict:
+        """Read the cached state of every URL in one batch: ``{url: {"validators", "fresh", "entries"}}``."""
+        empty = {"validators": {}, "fresh": False, "entries": None}
+        if self.cache is None:
+            return {url: dict(empty) for url in urls}
+        per_url = len(feed_state_keys("", scope, with_entries))
+        keys = [key for url in urls for key in feed_state_keys(url, scope, with_entries)]
+        values = await abulk_get(self.cache, keys)
+        return {
+            url: parse_feed_state(values[i * per_url:(i + 1) * per_url])
+            for i, url in enumerate(urls)
+        }
+
+    async def _flush(self, writes: dict) -> None:
+        """Write the cycle's pending ``{ttl: {key: value}}`` groups, one batch per TTL."""
+        if self.cache is None:
+            return
+        for ttl, mapping in writes.items():
+            await abulk_set(self.cache, mapping, ttl=ttl)
+
+    def _queue(self, writes: dict, mapping: dict, ttl) -> None:
+        writes.setdefault(ttl, {}).update(mapping)
+
+    async def _fetch_conditional(self, session, url: str, state: dict, writes: dict):
+        """Download ``url``; returns its articles, reusing the cached entries on 304."""
+        request_headers = conditional_headers(state["validators"]) if self.cache is not None else {}
+
+        status, body, response_headers = await self._download(session, url, request_headers)
+        if status == 304:
+            if state["entries"] is not None:
+                self.stats["not_modified"] += 1
+                self._queue(writes, {f"rss_fresh:{url}": "1"}, self.cache_ttl)
+                return state["entries"]
+            # הרשומות נמחקו מהמטמון – בקשה רגילה
+            status, body, response_headers = await self._download(session, url)
+
+        self.stats["downloaded"] += 1
+        articles = normalize_entries(feedparser.parse(body).entries, url)
+        if self.cache is not None:
+            self._queue(writes, feed_entries_payload(url, articles, response_headers), VALIDATOR_TTL)
+            self._queue(writes, {f"rss_fresh:{url}": "1"}, self.cache_ttl)
+        return articles
+
+    async def fetch_one(self, session, url: str, global_sem, host_sems: dict, state=None, writes=None) -> list:
+        """Download and parse a single feed, honouring both concurrency limits.
+
+        With a cache attached, a fresh copy is returned without any request and a
+        stale one is revalidated with ``If-None-Match`` / ``If-Modified-Since``.
+        ``state`` / ``writes`` come from the batched cycle in :meth:`fetch_all_async`;
+        when called on its own the feed's state is read and written directly.
+        """
+        own_batch = writes is None
+        if state is None:
+            state = (await self._load_states([url]))[url]
+        writes = {} if own_batch else writes
+
+        if state["fresh"] and state["entries"] is not None:
+            self.stats["cache_hits"] += 1
+            return state["entries"]
+
+        host = urlsplit(url).netloc
+        host_sem = host_sems.setdefault(host, asyncio.Semaphore(self.per_host))
+        try:
+            for attempt in range(self.retries + 1):
+                try:
+                    async with host_sem, global_sem:
+                        return await self._timed(host, self._fetch_conditional(session, url, state, writes))
+                except Exception as e:
+                    reason = "timeout" if isinstance(e, asyncio.TimeoutError) else e
+                    logger.warning(f"Attempt {attempt + 1} failed for {url}: {reason}")
+        finally:
+            if own_batch:
+                await self._flush(writes)
+        self.stats["failed"] += 1
+        logger.error(f"Failed to fetch {url} after {self.retries + 1} attempts")
+        return []
+
+    async def _stream_new_items(self, session, url: str, mark: dict | None, state: dict, writes: dict):
+        """Stream ``url`` through :class:`NewItemsParser` and stop at the first seen item.
+
+        Returns ``(new_items, new_mark)``; a 304 yields ``([], None)``.
+        """
+        request_headers = conditional_headers(state["validators"]) if self.cache is not None else {}
+
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        async with session.get(url, timeout=timeout, headers=request_headers) as response:
+            if response.status == 304:
+                self.stats["not_modified"] += 1
+                return [], None
+            response.raise_for_status()
+            self.stats["downloaded"] += 1
+
+            parser = NewItemsParser(mark, url)
+            received = []
+            try:
+                async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+                    received.append(chunk)
+                    if parser.feed(chunk):
+                        # הגענו לפריט שכבר נראה – שאר המסמך לא נקרא
+                        self.stats["stopped_early"] += 1
+                        break
+                items = parser.close()
+                new_mark = parser.new_mark()
+            except ET.ParseError:
+                # XML לא תקין – feedparser סלחני יותר, מנתחים את כל המסמך
+                body = b"".join(received) + await response.read()
+                articles = normalize_entries(feedparser.parse(body).entries, url)
+                items = filter_new(articles, mark)
+                new_mark = mark_for(items[0]) if items else None
+
+            validators = validators_payload(response.headers) if self.cache is not None else None
+            if validators:
+                self._queue(writes, {f"rss_validators{MARKS_SCOPE}:{url}": validators}, VALIDATOR_TTL)
+            return items, new_mark
+
+    async def fetch_new_one(self, session, url: str, marks, global_sem, host_sems: dict, state: dict, writes: dict) -> list:
+        """Return only the items of ``url`` newer than its high-water mark, and advance the mark."""
+        host = urlsplit(url).netloc
+        host_sem = host_sems.setdefault(host, asyncio.Semaphore(self.per_host))
+        for attempt in range(self.retries + 1):
+            try:
+                async with host_sem, global_sem:
+                    items, new_mark = await self._timed(
+                        host, self._stream_new_items(session, url, marks.get(url), state, writes)
+                    )
+                marks.update(url, new_mark)
+                return items
+            except Exception as e:
+                reason = "timeout" if isinstance(e, asyncio.TimeoutError) else e
+                logger.warning(f"Attempt {attempt + 1} failed for {url}: {reason}")
+        self.stats["failed"] += 1
+        logger.error(f"Failed to fetch {url} after {self.retries + 1} attempts")
+        return []
+
+    async def fetch_new_async(self, urls, marks) -> dict:
+        """Fetch every URL concurrently and return ``{url: [new items]}`` relative to ``marks``."""
+        unique_urls = list(dict.fromkeys(urls))
+        states = await self._load_states(unique_urls, MARKS_SCOPE, with_entries=False)
+        writes = {}
+        global_sem = asyncio.Semaphore(self.max_concurrency)
+        host_sems = {}
+        connector = aiohttp.TCPConnector(limit=self.max_concurrency, limit_per_host=self.per_host)
+        async with aiohttp.ClientSession(headers=self.headers, connector=connector) as session:
+            tasks = [
+                self.fetch_new_one(session, url, marks, global_sem, host_sems, states[url], writes)
+                for url in unique_urls
+            ]
+            results = await asyncio.gather(*tasks)
+        await self._flush(writes)
+        return dict(zip(unique_urls, results))
+
+    def fetch_new(self, urls, marks) -> dict:
+        """Synchronous wrapper around :meth:`fetch_new_async`."""
+        return _run_sync(self.fetch_new_async(urls, marks))
+
+    async def fetch_all_async(self, urls) -> dict:
+        """Fetch every URL concurrently and return ``{url: [articles]}`` in input order."""
+        unique_urls = list(dict.fromkeys(urls))
+        # קריאה אחת מהמטמון לכל הפידים לפני ההורדות, וכתיבה אחת בסוף הסבב
+        states = await self._load_states(unique_urls)
+        writes = {}
+        global_sem = asyncio.Semaphore(self.max_concurrency)
+        host_sems = {}
+        connector = aiohttp.TCPConnector(limit=self.max_concurrency, limit_per_host=self.per_host)
+        async with aiohttp.ClientSession(headers=self.headers, connector=connector) as session:
+            tasks = [
+                self.fetch_one(session, url, global_sem, host_sems, states[url], writes)
+                for url in unique_urls
+            ]
+            results = await asyncio.gather(*tasks)
+        await self._flush(writes)
+        return dict(zip(unique_urls, results))
+
+    def fetch_all(self, urls) -> dict:
+        """Synchronous wrapper around :meth:`fetch_all_async`."""
+        return _run_sync(self.fetch_all_async(urls))
+
+
+def _run_sync(coro):
+    """Run a coroutine to completion, even when called from inside a running event loop."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+
+    # כבר רץ event loop בת'רד הנוכחי – מריצים בת'רד נפרד
+    result = {}
+
+    def runner():
+        try:
+            result["value"] = asyncio.run(coro)
+        except BaseException as e:
+            result["error"] = e
+
+    t = threading.Thread(target=runner)
+    t.start()
+    t.join()
+    if "error" in result:
+        raise result["error"]
+    return result["value"]
+
+
+def fetch_feeds(urls, **engine_kwargs) -> dict:
+    """Fetch all feeds in one concurrent cycle and return ``{url: [articles]}``."""
+    return FeedFetchEngine(**engine_kwargs).fetch_all(urls)
+
+
+def fetch_articles(urls, **engine_kwargs) -> list:
+    """Fetch all feeds concurrently and return one flat list of articles."""
+    results = fetch_feeds(urls, **engine_kwargs)
+    return [article for articles in results.values() for article in articles]
@@ -0,0 +1,180 @@
+# utils/feed_marks.py
+"""
+Per-feed high-water marks and a streaming parser that stops at the first
+already-seen item.
+
+A mark records the newest item we have processed for a feed: its id (GUID,
+falling back to the link) and its published timestamp.  RSS/Atom feeds list
+items newest first, so the parser can stop as soon as it reaches the marked
+item (or anything published before it).  The XML is consumed with
+``xml.etree.ElementTree.XMLPullParser`` chunk by chunk; once the stop item is
+seen the caller can abort the download, so the tail of the document is never
+parsed or even received.
+
+Marks are kept in a small JSON file (``logs/feed_marks.json``) and written
+atomically so a crash mid-write never loses the previous state.
+"""
+
+import json
+import logging
+import os
+import xml.etree.ElementTree as ET
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = Path(__file__).resolve().parents[2]
+MARKS_PATH = BASE_DIR / "scores_news" / "logs" / "feed_marks.json"
+
+_ITEM_TAGS = {"item", "entry"}
+
+
+def _local(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+def parse_timestamp(text: str | None) -> float | None:
+    """Parse an RFC 822 (RSS) or ISO 8601 (Atom) date into a UTC timestamp."""
+    if not text:
+        return None
+    text = text.strip()
+    try:
+        dt = parsedate_to_datetime(text)
+    except (TypeError, ValueError):
+        try:
+            dt = datetime.fromisoformat(text.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+
+def item_to_article(elem, source: str) -> dict:
+    """Convert an RSS ``<item>`` or Atom ``<entry>`` element into an article dict."""
+    fields = {}
+    link = ""
+    for child in elem:
+        name = _local(child.tag)
+        if name == "link":
+            # Atom: <link href="..."/>, RSS: <link>...</link>
+            href = child.get("href")
+            if href and child.get("rel", "alternate") == "alternate":
+                link = link or href
+            elif child.text:
+                link = link or child.text.strip()
+        elif name not in fields:
+            fields[name] = (child.text or "").strip()
+
+    published = fields.get("pubDate") or fields.get("published") or fields.get("updated") or fields.get("date") or ""
+    return {
+        "title": fields.get("title", ""),
+        "summary": fields.get("description") or fields.get("summary") or fields.get("content", ""),
+        "link": link,
+        "published": published,
+        "source": source,
+        "guid": fields.get("guid") or fields.get("id") or link,
+        "published_ts": parse_timestamp(published),
+    }
+
+
+def is_seen(article: dict, mark: dict | None) -> bool:
+    """True if ``article`` is the marked item or was published before it."""
+    if not mark:
+        return False
+    if article.get("guid") and article["guid"] == mark.get("id"):
+        return True
+    ts, mark_ts = article.get("published_ts"), mark.get("published_ts")
+    return ts is not None and mark_ts is not None and ts < mark_ts
+
+
+def mark_for(article: dict) -> dict:
+    return {"id": article.get("guid") or article.get("link", ""), "published_ts": article.get("published_ts")}
+
+
+class NewItemsParser:
+    """Incremental feed parser that collects items until the first already-seen one.
+
+    Call :meth:`feed` with consecutive chunks of the document; it returns True
+    once the stop item was reached, after which the rest of the body can be
+    discarded.  Raises ``xml.etree.ElementTree.ParseError`` on malformed XML.
+    """
+
+    def __init__(self, mark: dict | None, source: str) -> None:
+        self.mark = mark
+        self.source = source
+        self.items = []
+        self.done = False
+        self._parser = ET.XMLPullParser(events=("end",))
+
+    def feed(self, chunk: bytes) -> bool:
+        if self.done:
+            return True
+        self._parser.feed(chunk)
+        for _, elem in self._parser.read_events():
+            if _local(elem.tag) not in _ITEM_TAGS:
+                continue
+            article = item_to_article(elem, self.source)
+            elem.clear()
+            if is_seen(article, self.mark):
+                self.done = True
+                return True
+            self.items.append(article)
+        return False
+
+    def close(self) -> list:
+        if not self.done:
+            self._parser.close()
+        return self.items
+
+    def new_mark(self) -> dict | None:
+        """Mark to persist after this parse (the newest item), or None if nothing new."""
+        return mark_for(self.items[0]) if self.items else None
+
+
+def filter_new(articles: list, mark: dict | None) -> list:
+    """Same stop rule for an already-parsed entry list (feedparser fallback)."""
+    new_items = []
+    for article in articles:
+        article.setdefault("guid", article.get("link", ""))
+        article.setdefault("published_ts", parse_timestamp(article.get("published")))
+        if is_seen(article, mark):
+            break
+        new_items.append(article)
+    return new_items
+
+
+class FeedMarks:
+    """Persisted ``{url: {"id", "published_ts"}}`` store."""
+
+    def __init__(self, path: Path | str = MARKS_PATH) -> None:
+        self.path = Path(path)
+        self._marks = {}
+        self._dirty = False
+        if self.path.exists():
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self._marks = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Could not read feed marks from {self.path}: {e}")
+
+    def get(self, url: str) -> dict | None:
+        return self._marks.get(url)
+
+    def update(self, url: str, mark: dict | None) -> None:
+        if mark and mark != self._marks.get(url):
+            self._marks[url] = mark
+            self._dirty = True
+
+    def save(self) -> None:
+        """Write the marks atomically (temp file + rename)."""
+        if not self._dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._marks, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
+        self._dirty = False
@@ -0,0 +1,89 @@
+# utils/feed_registry.py
+"""
+Per-cycle feed registry.
+
+``sources.yaml`` lists several feeds under more than one category (e.g.
+``investing.com/rss/news_25.rss`` under both ``bonds_dxy`` and
+``futures_vix``).  The registry maps every unique URL to the categories that
+subscribe to it, downloads and parses each URL exactly once per cycle through
+the shared :class:`FeedFetchEngine`, and hands the parsed entries to every
+subscribing category.
+"""
+
+import threading
+from pathlib import Path
+
+import yaml
+
+from scores_news.utils.feed_engine import FeedFetchEngine
+
+BASE_DIR = Path(__file__).resolve().parents[2]
+CONFIG_PATH = BASE_DIR / "scores_news" / "config" / "sources.yaml"
+
+
+class FeedRegistry:
+    """Deduplicated view of the configured feeds, fetched once per cycle."""
+
+    def __init__(self, feeds_by_category: dict, categories=None, engine: FeedFetchEngine | None = None) -> None:
+        if categories is not None:
+            feeds_by_category = {c: feeds_by_category.get(c, []) for c in categories}
+        self.feeds_by_category = {c: list(urls or []) for c, urls in feeds_by_category.items()}
+        self.engine = engine or FeedFetchEngine()
+
+        self.url_categories = {}
+        for category, urls in self.feeds_by_category.items():
+            for url in urls:
+                subscribers = self.url_categories.setdefault(url, [])
+                if category not in subscribers:
+                    subscribers.append(category)
+        self._cycle = None
+        # final_score מריץ את הקטגוריות ב־threads; הסבב נמשך פעם אחת גם כשכמה קטגוריות ניגשות יחד
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config_path: Path | None = None, categories=None, **kwargs) -> "FeedRegistry":
+        """Build a registry from the ``rss_feeds`` section of ``sources.yaml``."""
+        path = Path(config_path) if config_path else CONFIG_PATH
+        if not path.exists():
+            raise FileNotFoundError(f"sources.yaml לא נמצא: {path}")
+        with open(path, "r", encoding="utf-8") as f:
+            config = yaml.safe_load(f) or {}
+        return cls(config.get("rss_feeds", {}), categories=categories, **kwargs)
+
+    @property
+    def urls(self) -> list:
+        """Every unique feed URL, in configuration order."""
+        return list(self.url_categories)
+
+    def categories_for(self, url: str) -> list:
+        return self.url_categories.get(url, [])
+
+    def urls_for(self, category: str) -> list:
+        return list(dict.fromkeys(self.feeds_by_category.get(category, [])))
+
+    def fetch_cycle(self) -> dict:
+        """Fetch every unique URL once (concurrently) and keep the results for this cycle."""
+        self._cycle = self.engine.fetch_all(self.urls)
+        return self._cycle
+
+    def reset(self) -> None:
+        """Start a new cycle; the next access fetches again."""
+        self._cycle = None
+
+    def _ensure_cycle(self) -> dict:
+        with self._lock:
+            if self._cycle is None:
+                self.fetch_cycle()
+            return self._cycle
+
+    def entries_for_url(self, url: str) -> list:
+        return self._ensure_cycle().get(url, [])
+
+    def articles_for(self, category: str) -> list:
+        """Articles of every feed ``category`` subscribes to.
+
+        The parsed entries are shared between categories; each category gets its
+        own shallow copies so that enrichment (sentiment fields) doesn't leak.
+        """
+        cycle = self._ensure_cycle()
+        return [dict(article) for url in self.urls_for(category) for article in cycle.get(url, [])]
@@ -0,0 +1,155 @@
+# utils/http_client.py
+"""
+Shared HTTP client for the synchronous requests in ``scores_news``.
+
+One ``requests.Session`` is reused by every caller (Yahoo chart API, Treasury
+XML, the cached RSS helper).  Its ``HTTPAdapter`` keeps a keep-alive
+connection pool per host, so repeated requests skip the TCP and TLS
+handshakes.  On top of that the client provides:
+
+* default ``(connect, read)`` timeouts, so no request can hang forever;
+* retries with exponential backoff for connection errors and 429/5xx, and
+  ``Retry-After`` is honoured;
+* ``Accept-Encoding`` negotiation: gzip/deflate always, brotli when the
+  ``brotli`` / ``brotlicffi`` package is installed (urllib3 decodes it);
+* per-host latency / error counters in :data:`host_stats`.  The aiohttp feed
+  engine records into the same collector.
+"""
+
+import logging
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import brotli  # type: ignore  # noqa: F401
+    _HAS_BROTLI = True
+except ImportError:
+    try:
+        import brotlicffi  # type: ignore  # noqa: F401
+        _HAS_BROTLI = True
+    except ImportError:
+        _HAS_BROTLI = False
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIMEOUT = (5, 20)  # (connect, read) בשניות
+DEFAULT_RETRIES = 3
+BACKOFF_FACTOR = 0.5
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+POOL_HOSTS = 20        # מספר מאגרי חיבורים (host-ים) שנשמרים
+POOL_PER_HOST = 10     # חיבורי keep-alive לכל host
+
+ACCEPT_ENCODING = "gzip, deflate, br" if _HAS_BROTLI else "gzip, deflate"
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0",
+    "Accept-Encoding": ACCEPT_ENCODING,
+}
+
+
+class HostStats:
+    """Thread-safe per-host request counters and latencies (milliseconds)."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._hosts = {}
+
+    def record(self, host: str, elapsed: float, ok: bool = True) -> None:
+        ms = elapsed * 1000
+        with self._lock:
+            stats = self._hosts.setdefault(host, {"requests": 0, "errors": 0, "total_ms": 0.0, "max_ms": 0.0})
+            stats["requests"] += 1
+            stats["errors"] += 0 if ok else 1
+            stats["total_ms"] += ms
+            stats["max_ms"] = max(stats["max_ms"], ms)
+
+    def snapshot(self) -> dict:
+        """``{host: {"requests", "errors", "avg_ms", "max_ms"}}``."""
+        with self._lock:
+            return {
+                host: {
+                    "requests": s["requests"],
+                    "errors": s["errors"],
+                    "avg_ms": round(s["total_ms"] / s["requests"], 1),
+                    "max_ms": round(s["max_ms"], 1),
+                }
+                for host, s in self._hosts.items()
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._hosts.clear()
+
+
+host_stats = HostStats()
+
+
+class HttpClient:
+    """``requests.Session`` with pooled keep-alive connections, timeouts and retries."""
+
+    def __init__(
+        self,
+        timeout=DEFAULT_TIMEOUT,
+        retries: int = DEFAULT_RETRIES,
+        backoff_factor: float = BACKOFF_FACTOR,
+        headers: dict | None = None,
+        stats: HostStats | None = None,
+    ) -> None:
+        self.timeout = timeout
+        self.stats = stats if stats is not None else host_stats
+        retry = Retry(
+            total=retries,
+            connect=retries,
+            read=retries,
+            status=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=frozenset({"GET", "HEAD"}),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=POOL_HOSTS, pool_maxsize=POOL_PER_HOST, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update(DEFAULT_HEADERS)
+        if headers:
+            self.session.headers.update(headers)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """GET ``url`` through the pooled session; ``timeout`` defaults to :data:`DEFAULT_TIMEOUT`."""
+        kwargs.setdefault("timeout", self.timeout)
+        host = urlsplit(url).netloc
+        started = time.perf_counter()
+        try:
+            response = self.session.get(url, **kwargs)
+        except requests.RequestException:
+            self.stats.record(host, time.perf_counter() - started, ok=False)
+            raise
+        self.stats.record(host, time.perf_counter() - started, ok=response.status_code < 400)
+        return response
+
+    def close(self) -> None:
+        self.session.close()
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> HttpClient:
+    """Process-wide shared :class:`HttpClient`."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = HttpClient()
+        return _client
+
+
+def http_get(url: str, **kwargs) -> requests.Response:
+    """Shortcut for ``get_client().get(url, **kwargs)``."""
+    return get_client().get(url, **kwargs)
@@ -0,0 +1,166 @@
+# utils/near_dup.py
+"""
+Near-duplicate detection for syndicated news (MinHash + LSH banding).
+
+The same wire story shows up in MarketWatch, Nasdaq and CNBC feeds with small
+title edits, so exact ``(title, link)`` matching lets it be scored several
+times.  Every article gets a compact MinHash signature of its normalized title
+tokens (``num_perm`` 32-bit values, 256 bytes by default).  The signature is
+split into ``bands``; articles sharing any band bucket are candidates, and a
+candidate is a near-duplicate when the estimated Jaccard similarity reaches
+``threshold``.  Lookups touch only a handful of buckets, well under a
+millisecond, and the index keeps at most ``capacity`` signatures (oldest
+evicted first), so memory stays bounded in a long-running listener.
+
+Near-duplicates are clustered onto the first article seen (the
+representative); only representatives should go on to sentiment scoring or
+LLM analysis.
+"""
+
+import hashlib
+import re
+from collections import OrderedDict
+
+import numpy as np
+
+_PRIME = (1 << 32) - 5  # ראשוני מתחת ל־2^32 – a*h+b נכנס ב־uint64 בלי גלישה
+_TOKEN_RE = re.compile(r"[a-z0-9$%&']+")
+_STOPWORDS = frozenset(
+    "a an the of to in on for and or as at by is are be with from after over its it this that".split()
+)
+
+
+def tokenize(text: str) -> set:
+    """Lower-case word tokens without punctuation and common stopwords."""
+    return {t for t in _TOKEN_RE.findall(str(text or "").lower()) if t not in _STOPWORDS}
+
+
+def _token_hash(token: str) -> int:
+    return int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=4).digest(), "little")
+
+
+def fingerprint_text(article: dict) -> str:
+    """Text used for fingerprinting – the title carries the story identity across sources."""
+    return str(article.get("title") or article.get("summary") or "")
+
+
+class NearDuplicateIndex:
+    """Bounded MinHash/LSH index that clusters near-duplicate texts."""
+
+    def __init__(self, num_perm: int = 64, bands: int = 16, threshold: float = 0.7, capacity: int = 10000) -> None:
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self.capacity = capacity
+
+        # פרמוטציות דטרמיניסטיות (a*x + b mod p) – אותן חתימות בכל הרצה
+        rng = np.random.default_rng(20250703)
+        self._a = rng.integers(1, _PRIME, size=(num_perm, 1), dtype=np.uint64)
+        self._b = rng.integers(0, _PRIME, size=(num_perm, 1), dtype=np.uint64)
+
+        self._entries = OrderedDict()   # key -> (signature, representative)
+        self._buckets = {}              # (band, band_hash) -> [keys]
+        self.cluster_sizes = {}         # representative -> cluster size
+        self.stats = {"added": 0, "duplicates": 0, "evicted": 0}
+
+    def signature(self, text: str):
+        """MinHash signature of ``text`` (``uint32`` array), or None when it has no usable tokens."""
+        hashes = [_token_hash(t) for t in tokenize(text)]
+        if not hashes:
+            return None
+        h = np.array(hashes, dtype=np.uint64)
+        return ((self._a * h + self._b) % _PRIME).min(axis=1).astype(np.uint32)
+
+    def _band_keys(self, sig):
+        raw = sig.tobytes()
+        width = self.rows * 4
+        for band in range(self.bands):
+            yield band, raw[band * width:(band + 1) * width]
+
+    def similarity(self, sig_a, sig_b) -> float:
+        """Estimated Jaccard similarity between two signatures."""
+        return int(np.count_nonzero(sig_a == sig_b)) / self.num_perm
+
+    def query(self, text: str, sig=None):
+        """Return the representative key of the closest near-duplicate, or None."""
+        sig = sig if sig is not None else self.signature(text)
+        if sig is None:
+            return None
+        best, best_sim = None, self.threshold
+        seen = set()
+        for band_key in self._band_keys(sig):
+            for key in self._buckets.get(band_key, ()):
+                if key in seen:
+                    continue
+                seen.add(key)
+                other_sig, representative = self._entries[key]
+                sim = self.similarity(sig, other_sig)
+                if sim >= best_sim:
+                    best, best_sim = representative, sim
+        return best
+
+    def add(self, key, text: str):
+        """Index ``text`` under ``key``.
+
+        Returns ``(representative, is_duplicate)``; the representative is ``key``
+        itself for the first article of a cluster.
+        """
+        if key in self._entries:
+            return self._entries[key][1], True
+        sig = self.signature(text)
+        if sig is None:
+            # טקסט ריק – אי אפשר להשוות, נחשב ייחודי ולא נכנס לאינדקס
+            return key, False
+        representative = self.query(text, sig)
+        is_duplicate = representative is not None
+        if is_duplicate:
+            self.stats["duplicates"] += 1
+            self.cluster_sizes[representative] = self.cluster_sizes.get(representative, 1) + 1
+        else:
+            representative = key
+            self.cluster_sizes[key] = 1
+
+        self._entries[key] = (sig, representative)
+        for band_key in self._band_keys(sig):
+            self._buckets.setdefault(band_key, []).append(key)
+        self.stats["added"] += 1
+        if len(self._entries) > self.capacity:
+            self._evict_oldest()
+        return representative, is_duplicate
+
+    def _evict_oldest(self) -> None:
+        key, (sig, representative) = self._entries.popitem(last=False)
+        for band_key in self._band_keys(sig):
+            bucket = self._buckets.get(band_key)
+            if bucket:
+                bucket.remove(key)
+                if not bucket:
+                    del self._buckets[band_key]
+        if representative == key:
+            self.cluster_sizes.pop(key, None)
+        self.stats["evicted"] += 1
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def dedupe_articles(articles: list, index: NearDuplicateIndex | None = None) -> list:
+    """Keep one representative per near-duplicate cluster.
+
+    Each returned article gets ``cluster_size`` (how many copies were collapsed
+    into it).  Pass a long-lived ``index`` to dedupe against earlier batches too.
+    """
+    if index is None:
+        index = NearDuplicateIndex(capacity=max(len(articles), 1))
+    representatives = {}
+    for i, article in enumerate(articles):
+        key = article.get("link") or f"#{i}"
+        representative, is_duplicate = index.add(key, fingerprint_text(article))
+        if not is_duplicate:
+            representatives[key] = article
+    for key, article in representatives.items():
+        article["cluster_size"] = index.cluster_sizes.get(key, 1)
+    return list(representatives.values())
@@ -0,0 +1,177 @@
+# utils/poll_scheduler.py
+"""
+Adaptive polling scheduler for the continuous RSS listener.
+
+Feeds live in a priority queue (``heapq``) keyed by their next poll time.  After
+every poll the feed's publish rate is updated (EWMA of new items per second)
+and its next interval is set so that, on average, about
+``target_items_per_poll`` new items are waiting when we come back, clamped to
+``[min_interval, max_interval]``.  Busy headline feeds are therefore polled
+often and quiet ones (Fed testimony) rarely.
+
+On top of that, burst windows can be configured around scheduled macro
+releases (CPI / PPI / payrolls at 08:30 ET, FOMC at 14:00 ET, ...).  Inside a
+window the matching feeds are polled every ``burst.interval`` seconds, and a
+feed whose regular next poll would land after a window start is pulled forward
+to that start, so a release is seen within seconds instead of minutes.
+
+Configuration comes from the ``polling`` section of ``sources.yaml``.
+"""
+
+import heapq
+import itertools
+import time
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+DEFAULTS = {
+    "default_interval": 300,
+    "min_interval": 60,
+    "max_interval": 1800,
+    "target_items_per_poll": 1.0,
+    "rate_alpha": 0.3,
+}
+
+BURST_DEFAULTS = {
+    "interval": 15,
+    "before_seconds": 60,
+    "after_seconds": 600,
+    "timezone": "America/New_York",
+}
+
+WEEKDAYS = ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]
+
+
+class BurstWindow:
+    """A recurring release time (``HH:MM`` in ``timezone``) and the feeds it applies to."""
+
+    def __init__(self, release: dict, burst_cfg: dict, feeds: list) -> None:
+        self.name = release.get("name", release["time"])
+        hour, minute = (int(part) for part in release["time"].split(":"))
+        self.hour, self.minute = hour, minute
+        self.tz = ZoneInfo(burst_cfg["timezone"])
+        self.before = timedelta(seconds=burst_cfg["before_seconds"])
+        self.after = timedelta(seconds=burst_cfg["after_seconds"])
+        self.weekdays = {WEEKDAYS.index(d[:3].lower()) for d in release.get("weekdays", WEEKDAYS[:5])}
+        self.dates = set(release.get("dates", []))
+        # אם הוגדר "feeds" – רק פידים שמכילים את אחת המחרוזות; אחרת כל פידי המאקרו
+        patterns = release.get("feeds")
+        self.feeds = {url for url in feeds if not patterns or any(p in url for p in patterns)}
+
+    def _occurs_on(self, day) -> bool:
+        if self.dates:
+            return day.isoformat() in self.dates
+        return day.weekday() in self.weekdays
+
+    def next_window(self, now: float):
+        """Return ``(start_ts, end_ts)`` of the current or next window after ``now``."""
+        local_now = datetime.fromtimestamp(now, self.tz)
+        for offset in range(0, 370):
+            day = (local_now + timedelta(days=offset)).date()
+            if not self._occurs_on(day):
+                continue
+            release = datetime(day.year, day.month, day.day, self.hour, self.minute, tzinfo=self.tz)
+            start, end = (release - self.before).timestamp(), (release + self.after).timestamp()
+            if end > now:
+                return start, end
+        return None
+
+
+class PollScheduler:
+    """Priority-queue scheduler that decides which feeds are due for polling."""
+
+    def __init__(self, urls, config: dict | None = None, macro_urls=None, now: float | None = None) -> None:
+        config = config or {}
+        self.cfg = {**DEFAULTS, **{k: v for k, v in config.items() if k in DEFAULTS}}
+        burst_cfg = {**BURST_DEFAULTS, **config.get("burst", {})}
+        self.burst_interval = burst_cfg["interval"]
+        self.windows = [
+            BurstWindow(release, burst_cfg, list(macro_urls or []))
+            for release in config.get("macro_releases", [])
+        ]
+
+        now = time.time() if now is None else now
+        self._heap = []
+        self._seq = itertools.count()
+        self._next = {}
+        self.rate = {}       # פריטים חדשים לשנייה (EWMA)
+        self.interval = {}
+        self.last_poll = {}
+        for url in dict.fromkeys(urls):
+            self.interval[url] = self.cfg["default_interval"]
+            self._push(url, now)  # סבב ראשון – כל הפידים מיד
+
+    def _push(self, url: str, when: float) -> None:
+        self._next[url] = when
+        heapq.heappush(self._heap, (when, next(self._seq), url))
+
+    def _burst_adjust(self, url: str, now: float, candidate: float) -> float:
+        """Pull ``candidate`` forward if it falls inside or after a burst window of ``url``."""
+        best = candidate
+        for window in self.windows:
+            if url not in window.feeds:
+                continue
+            span = window.next_window(now)
+            if span is None:
+                continue
+            start, end = span
+            if start <= now < end:
+                best = min(best, now + self.burst_interval)
+            elif start < best:
+                best = min(best, start)
+        return best
+
+    def pop_due(self, now: float | None = None) -> list:
+        """Remove and return every feed whose poll time has arrived."""
+        now = time.time() if now is None else now
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            when, _, url = heapq.heappop(self._heap)
+            if self._next.get(url) != when:
+                continue  # רשומה ישנה שהוחלפה
+            del self._next[url]
+            due.append(url)
+        return due
+
+    def record(self, url: str, new_items: list, now: float | None = None) -> float:
+        """Update the publish-rate estimate of ``url`` and schedule its next poll.
+
+        Returns the chosen interval in seconds.
+        """
+        now = time.time() if now is None else now
+        last = self.last_poll.get(url)
+        if last is None:
+            observed = _rate_from_timestamps(new_items)
+        else:
+            observed = len(new_items) / max(now - last, 1.0)
+        self.last_poll[url] = now
+
+        alpha = self.cfg["rate_alpha"]
+        previous = self.rate.get(url)
+        rate = observed if previous is None else alpha * observed + (1 - alpha) * previous
+        self.rate[url] = rate
+
+        if rate > 0:
+            interval = self.cfg["target_items_per_poll"] / rate
+        else:
+            interval = self.interval[url] * 1.5
+        interval = min(max(interval, self.cfg["min_interval"]), self.cfg["max_interval"])
+        self.interval[url] = interval
+        self._push(url, self._burst_adjust(url, now, now + interval))
+        return interval
+
+    def seconds_until_next(self, now: float | None = None) -> float:
+        now = time.time() if now is None else now
+        while self._heap and self._next.get(self._heap[0][2]) != self._heap[0][0]:
+            heapq.heappop(self._heap)
+        if not self._heap:
+            return self.cfg["default_interval"]
+        return max(self._heap[0][0] - now, 0.0)
+
+
+def _rate_from_timestamps(items: list) -> float:
+    """Estimate items/second from the published timestamps of a first full poll."""
+    stamps = sorted(ts for ts in (item.get("published_ts") for item in items) if ts)
+    if len(stamps) < 2 or stamps[-1] <= stamps[0]:
+        return 0.0
+    return (len(stamps) - 1) / (stamps[-1] - stamps[0])
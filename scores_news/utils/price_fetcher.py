@@ -0,0 +1,161 @@
+# utils/price_fetcher.py
+"""
+Daily percentage change for many symbols at once.
+
+``sectors_score`` used to request one Yahoo chart per ETF in sequence, and
+turned every failure into a 0.0% change, which biased the average.  The
+fetcher works in three steps:
+
+1. quotes younger than ``ttl`` seconds are served from memory;
+2. everything else is requested in one batched Yahoo ``spark`` call
+   (up to ``BATCH_SIZE`` symbols per request);
+3. symbols the batch didn't return are fetched concurrently, one chart each,
+   over the shared pooled :mod:`http_client` session.
+
+Latency therefore stays close to one round-trip whatever the number of
+symbols.  :meth:`PriceFetcher.daily_changes` returns the changes together
+with the symbols that could not be priced, so callers can leave them out
+instead of treating them as flat.
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from scores_news.utils.http_client import POOL_PER_HOST, http_get
+
+logger = logging.getLogger(__name__)
+
+SPARK_URL = "https://query1.finance.yahoo.com/v7/finance/spark?symbols={symbols}&range=2d&interval=1d"
+CHART_URL = "https://query1.finance.yahoo.com/v8/finance/chart/{symbol}?interval=1d&range=2d"
+BATCH_SIZE = 20
+DEFAULT_TTL = 60  # שניות – ציטוטים תוך־יומיים
+
+
+def change_from_closes(closes) -> float | None:
+    """Percent change between the last two closes, or None if they are missing."""
+    closes = [c for c in (closes or []) if c is not None]
+    if len(closes) < 2 or not closes[-2]:
+        return None
+    return round((closes[-1] - closes[-2]) / closes[-2] * 100, 2)
+
+
+def parse_spark(data: dict) -> dict:
+    """``{symbol: closes}`` from a spark response (both the ``spark.result`` and the flat layout)."""
+    closes = {}
+    results = (data.get("spark") or {}).get("result")
+    if results is not None:
+        for item in results or []:
+            try:
+                closes[item["symbol"]] = item["response"][0]["indicators"]["quote"][0]["close"]
+            except (KeyError, IndexError, TypeError):
+                continue
+        return closes
+    for symbol, item in data.items():
+        if isinstance(item, dict) and "close" in item:
+            closes[symbol] = item["close"]
+    return closes
+
+
+def fetch_batch(symbols: list) -> dict:
+    """One spark request for ``symbols``; returns ``{symbol: closes}`` for what came back."""
+    response = http_get(SPARK_URL.format(symbols=",".join(symbols)))
+    response.raise_for_status()
+    return parse_spark(response.json())
+
+
+def fetch_chart(symbol: str) -> list:
+    response = http_get(CHART_URL.format(symbol=symbol))
+    response.raise_for_status()
+    return response.json()["chart"]["result"][0]["indicators"]["quote"][0]["close"]
+
+
+class PriceFetcher:
+    """Concurrent / batched daily-change fetcher with an intraday TTL cache."""
+
+    def __init__(self, ttl: float = DEFAULT_TTL, max_workers: int = POOL_PER_HOST,
+                 batch=fetch_batch, single=fetch_chart) -> None:
+        self.ttl = ttl
+        self.max_workers = max_workers
+        self._batch = batch
+        self._single = single
+        self._quotes = {}  # symbol -> (fetched_at, change)
+        self._lock = threading.Lock()
+        self.stats = {"cached": 0, "batched": 0, "single": 0, "missing": 0}
+
+    def _cached(self, symbols, now: float) -> dict:
+        with self._lock:
+            return {
+                s: self._quotes[s][1] for s in symbols
+                if s in self._quotes and now - self._quotes[s][0] < self.ttl
+            }
+
+    def _fetch_batched(self, symbols: list) -> dict:
+        changes = {}
+        for i in range(0, len(symbols), BATCH_SIZE):
+            chunk = symbols[i:i + BATCH_SIZE]
+            try:
+                closes = self._batch(chunk)
+            except Exception as e:
+                logger.warning(f"Batched quote request failed for {chunk}: {e}")
+                continue
+            for symbol in chunk:
+                change = change_from_closes(closes.get(symbol))
+                if change is not None:
+                    changes[symbol] = change
+        return changes
+
+    def _fetch_one(self, symbol: str):
+        try:
+            return change_from_closes(self._single(symbol))
+        except Exception as e:
+            logger.warning(f"Quote request failed for {symbol}: {e}")
+            return None
+
+    def daily_changes(self, symbols) -> tuple[dict, list]:
+        """``({symbol: change_pct}, [missing symbols])`` – order follows ``symbols``."""
+        symbols = list(dict.fromkeys(symbols))
+        now = time.time()
+        changes = self._cached(symbols, now)
+        self.stats["cached"] += len(changes)
+
+        fresh = {}
+        pending = [s for s in symbols if s not in changes]
+        if pending:
+            batched = self._fetch_batched(pending)
+            self.stats["batched"] += len(batched)
+            fresh.update(batched)
+
+        pending = [s for s in pending if s not in fresh]
+        if pending:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(pending))) as pool:
+                singles = dict(zip(pending, pool.map(self._fetch_one, pending)))
+            singles = {s: c for s, c in singles.items() if c is not None}
+            self.stats["single"] += len(singles)
+            fresh.update(singles)
+
+        fetched_at = time.time()
+        with self._lock:
+            for symbol, change in fresh.items():
+                self._quotes[symbol] = (fetched_at, change)
+        changes.update(fresh)
+
+        missing = [s for s in symbols if s not in changes]
+        self.stats["missing"] += len(missing)
+        if missing:
+            logger.warning(f"No price data for: {', '.join(missing)}")
+        return {s: changes[s] for s in symbols if s in changes}, missing
+
+
+_fetcher = None
+_fetcher_lock = threading.Lock()
+
+
+def get_fetcher() -> PriceFetcher:
+    """Process-wide shared :class:`PriceFetcher` (shares its quote cache between callers)."""
+    global _fetcher
+    with _fetcher_lock:
+        if _fetcher is None:
+            _fetcher = PriceFetcher()
+        return _fetcher
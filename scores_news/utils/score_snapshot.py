@@ -0,0 +1,76 @@
+# utils/score_snapshot.py
+"""
+Versioned snapshot of the latest category scores.
+
+``final_score`` computes the categories (Treasury XML, RSS feeds, Yahoo
+charts, ...) at most once per interval and writes the result here.  The
+dashboard and later ``final_score`` runs read the snapshot instead of
+repeating every outbound request.  A snapshot is one JSON file::
+
+    {"version": 1, "created_at": "2024-05-01T14:30:00", "created_ts": 1714573800.0,
+     "scores": {"sentiment": {"score": 60, "explanation": "...", "seconds": 0.4}, ...},
+     "final_score": 58, "bias": "🔒 NEUTRAL"}
+
+It is written atomically (temp file + rename), so readers never see a
+partial file.  A file with another ``version`` is ignored, like a missing
+one.
+"""
+
+import json
+import logging
+import os
+import time
+from datetime import datetime
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = Path(__file__).resolve().parents[2]
+SNAPSHOT_PATH = BASE_DIR / "scores_news" / "logs" / "score_snapshot.json"
+SNAPSHOT_VERSION = 1
+# כל כמה שניות שירות ה־snapshot מחשב מחדש; snapshot צעיר מזה מוגש כמו שהוא
+SNAPSHOT_INTERVAL = 300
+# snapshot ישן מכמה מחזורים – כנראה ששירות הציונים נעצר
+STALE_AFTER = 3 * SNAPSHOT_INTERVAL
+
+
+def write_snapshot(scores: dict, final_score=None, bias=None, path: Path | str = SNAPSHOT_PATH) -> dict:
+    """Persist ``scores`` (the ``load_all_scores`` dict) with a timestamp and return the snapshot."""
+    now = time.time()
+    snapshot = {
+        "version": SNAPSHOT_VERSION,
+        "created_at": datetime.fromtimestamp(now).isoformat(timespec="seconds"),
+        "created_ts": now,
+        "scores": scores,
+        "final_score": final_score,
+        "bias": bias,
+    }
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(snapshot, f, ensure_ascii=False, indent=2, default=float)
+    os.replace(tmp_path, path)
+    return snapshot
+
+
+def read_snapshot(path: Path | str = SNAPSHOT_PATH, max_age: float | None = None) -> dict | None:
+    """The stored snapshot, or None if it is missing, unreadable, of another version or older than ``max_age`` seconds."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            snapshot = json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning(f"Could not read score snapshot from {path}: {e}")
+        return None
+    if snapshot.get("version") != SNAPSHOT_VERSION:
+        return None
+    if max_age is not None and snapshot_age(snapshot) > max_age:
+        return None
+    return snapshot
+
+
+def snapshot_age(snapshot: dict) -> float:
+    """Seconds since the snapshot was produced."""
+    return time.time() - snapshot.get("created_ts", 0)
@@ -0,0 +1,165 @@
+# utils/seen_store.py
+"""
+Durable, memory-bounded set of articles the listener has already handled.
+
+Membership is answered in two steps:
+
+* A rotating Bloom filter in memory.  A negative answer is final, so for the
+  common case (a genuinely new article) the check costs ``k`` bit lookups and
+  no I/O at all.
+* A positive answer is confirmed against an exact SQLite table on local disk,
+  so a Bloom false positive never drops a new article.
+
+Keys are written into generations of ``capacity`` keys each.  When the
+current generation fills up a new one starts, and generations beyond
+``generations`` are dropped from both the filter and the table.  Memory use
+and the table size are therefore bounded, and an article is remembered for
+at least ``capacity * (generations - 1)`` newer articles, far longer than
+any feed keeps it.  The table survives restarts; the filters are rebuilt
+from it on startup.
+"""
+
+import hashlib
+import math
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[2]
+SEEN_PATH = BASE_DIR / "scores_news" / "logs" / "seen_articles.sqlite"
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter sized for ``capacity`` keys at ``error_rate``."""
+
+    def __init__(self, capacity: int, error_rate: float = 0.001) -> None:
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key: str):
+        # double hashing: h1 + i*h2 מתוך digest יחיד של 128 ביט
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+
+    def add(self, key: str) -> None:
+        for pos in self._positions(key):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+    @property
+    def full(self) -> bool:
+        return self.count >= self.capacity
+
+
+class SeenStore:
+    """Rotating Bloom filter with an exact SQLite check, persisted across restarts."""
+
+    def __init__(
+        self,
+        path: Path | str = SEEN_PATH,
+        capacity: int = 50000,
+        generations: int = 3,
+        error_rate: float = 0.001,
+    ) -> None:
+        self.path = Path(path)
+        self.capacity = capacity
+        self.generations = generations
+        self.error_rate = error_rate
+        self.stats = {"checked": 0, "bloom_negative": 0, "exact_checks": 0, "false_positives": 0, "rotations": 0}
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS seen (key TEXT PRIMARY KEY, generation INTEGER, added_at REAL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS seen_generation ON seen (generation)")
+        self._load()
+
+    def _load(self) -> None:
+        """Rebuild the in-memory filters from the persisted keys."""
+        self._filters = {}  # generation -> BloomFilter
+        for generation, key in self._conn.execute("SELECT generation, key FROM seen ORDER BY generation"):
+            self._filter(generation).add(key)
+        self._current = max(self._filters, default=0)
+        if not self._filters:
+            self._filter(0)
+
+    def _filter(self, generation: int) -> BloomFilter:
+        if generation not in self._filters:
+            self._filters[generation] = BloomFilter(self.capacity, self.error_rate)
+        return self._filters[generation]
+
+    def _rotate(self) -> None:
+        self._current += 1
+        self._filter(self._current)
+        oldest_kept = self._current - self.generations + 1
+        for generation in [g for g in self._filters if g < oldest_kept]:
+            del self._filters[generation]
+        self._conn.execute("DELETE FROM seen WHERE generation < ?", (oldest_kept,))
+        self.stats["rotations"] += 1
+
+    def _maybe_seen(self, key: str) -> bool:
+        return any(key in bloom for bloom in self._filters.values())
+
+    def _exact(self, keys: list) -> set:
+        found = set()
+        for i in range(0, len(keys), 500):
+            chunk = keys[i:i + 500]
+            placeholders = ",".join("?" * len(chunk))
+            rows = self._conn.execute(f"SELECT key FROM seen WHERE key IN ({placeholders})", chunk)
+            found.update(row[0] for row in rows)
+        return found
+
+    def check_and_add(self, keys) -> list:
+        """Return, for every key, whether it had been seen before – and remember all of them."""
+        keys = list(keys)
+        with self._lock:
+            maybe = [k for k in dict.fromkeys(keys) if self._maybe_seen(k)]
+            self.stats["checked"] += len(keys)
+            self.stats["bloom_negative"] += len(keys) - len(maybe)
+            self.stats["exact_checks"] += len(maybe)
+            seen = self._exact(maybe) if maybe else set()
+            self.stats["false_positives"] += len(maybe) - len(seen)
+
+            result = []
+            rows = []
+            now = time.time()
+            for key in keys:
+                result.append(key in seen)
+                if key in seen:
+                    continue
+                seen.add(key)  # כפילות בתוך אותה מנה
+                if self._filters[self._current].full:
+                    self._rotate()
+                self._filters[self._current].add(key)
+                rows.append((key, self._current, now))
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO seen (key, generation, added_at) VALUES (?, ?, ?)", rows
+                )
+        return result
+
+    def add(self, key: str) -> None:
+        self.check_and_add([key])
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return self._maybe_seen(key) and bool(self._exact([key]))
+
+    def __len__(self) -> int:
+        return sum(bloom.count for bloom in self._filters.values())
+
+    def close(self) -> None:
+        self._conn.close()
@@ -0,0 +1,102 @@
+# utils/sentiment_aggregates.py
+"""
+Running per-day, per-category sentiment counters.
+
+The RSS listener scores every new article once.  Instead of re-reading and
+re-scoring the whole day's CSV whenever a score is requested, it adds each
+scored batch to a small counter record::
+
+    {"2024-05-01": {"sentiment": {"positive": 12, "negative": 4, "neutral": 30,
+                                  "total": 46, "score_sum": 2504}}}
+
+``score_sum`` is the sum of the 0-100 article scores, so the mean is
+``score_sum / total``.  Reading a category score is then O(1) whatever the
+number of articles.
+
+The file (``logs/sentiment_aggregates.json``) is written atomically (temp
+file + rename), so other processes (final_score, the dashboard) never see
+a half-written file.  Days older than ``keep_days`` are dropped on save.
+"""
+
+import json
+import logging
+import os
+from datetime import date as date_cls, datetime, timedelta
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = Path(__file__).resolve().parents[2]
+AGGREGATES_PATH = BASE_DIR / "scores_news" / "logs" / "sentiment_aggregates.json"
+
+LABELS = ("positive", "negative", "neutral")
+
+
+def _day(day) -> str:
+    if day is None:
+        return datetime.now().strftime("%Y-%m-%d")
+    if isinstance(day, (datetime, date_cls)):
+        return day.strftime("%Y-%m-%d")
+    return str(day)
+
+
+def empty_counters() -> dict:
+    return {"positive": 0, "negative": 0, "neutral": 0, "total": 0, "score_sum": 0}
+
+
+class SentimentAggregates:
+    """Persisted ``{day: {category: counters}}`` store, updated incrementally."""
+
+    def __init__(self, path: Path | str = AGGREGATES_PATH, keep_days: int = 30) -> None:
+        self.path = Path(path)
+        self.keep_days = keep_days
+        self._days = {}
+        self._dirty = False
+        self.reload()
+
+    def reload(self) -> None:
+        """Re-read the file (another process may have updated it)."""
+        if not self.path.exists():
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self._days = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not read sentiment aggregates from {self.path}: {e}")
+
+    def add(self, category: str, labels, scores, day=None) -> dict:
+        """Add a batch of scored articles (labels + 0-100 scores) and return the updated counters."""
+        counters = self._days.setdefault(_day(day), {}).setdefault(category, empty_counters())
+        for label, score in zip(labels, scores):
+            label = str(label)
+            if label in LABELS:
+                counters[label] += 1
+            counters["total"] += 1
+            counters["score_sum"] += int(score)
+        self._dirty = True
+        return counters
+
+    def get(self, category: str, day=None) -> dict | None:
+        """Counters of ``category`` for ``day`` (default today), or None if nothing was recorded."""
+        counters = self._days.get(_day(day), {}).get(category)
+        return dict(counters) if counters else None
+
+    def days(self) -> list:
+        return sorted(self._days)
+
+    def _prune(self) -> None:
+        cutoff = (datetime.now() - timedelta(days=self.keep_days)).strftime("%Y-%m-%d")
+        for day in [d for d in self._days if d < cutoff]:
+            del self._days[day]
+
+    def save(self) -> None:
+        """Write the counters atomically (temp file + rename)."""
+        if not self._dirty:
+            return
+        self._prune()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._days, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
+        self._dirty = False
@@ -0,0 +1,131 @@
+# utils/sentiment_cache.py
+"""
+Persistent sentiment cache shared by every pipeline process.
+
+``scores_news/main.py`` runs each step as its own ``python`` subprocess, so an
+in-process dict is always cold: the sentiment, macro and futures steps kept
+re-scoring the same headlines.  This cache has two levels:
+
+* an in-memory LRU bounded to ``max_memory`` entries;
+* a SQLite file (WAL mode, safe for concurrent processes) holding the
+  compound score of every text ever scored.
+
+Keys are a 128-bit BLAKE2 hash of the text, so the store doesn't keep article
+text.  Every row carries the scorer ``version`` (analyzer + lexicon
+fingerprint).  A different version never matches, and rows of other
+versions are purged when the cache is opened, so changing the model
+invalidates old scores automatically.
+"""
+
+import hashlib
+import logging
+import sqlite3
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = Path(__file__).resolve().parents[2]
+CACHE_PATH = BASE_DIR / "scores_news" / "logs" / "sentiment_cache.sqlite"
+
+
+def text_key(text: str) -> bytes:
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+
+class SentimentCache:
+    """Content-hash → compound score, with an LRU in front of SQLite."""
+
+    def __init__(self, version: str, path: Path | str | None = CACHE_PATH, max_memory: int = 50000) -> None:
+        self.version = version
+        self.max_memory = max_memory
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0}
+        self._conn = None
+        if path is not None:
+            try:
+                self._open(Path(path))
+            except sqlite3.Error as e:
+                logger.error(f"Sentiment cache on disk unavailable ({path}): {e}")
+                self._conn = None
+
+    def _open(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path), timeout=30, check_same_thread=False)
+        with self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS sentiment ("
+                "version TEXT, key BLOB, compound REAL, PRIMARY KEY (version, key))"
+            )
+            purged = self._conn.execute("DELETE FROM sentiment WHERE version != ?", (self.version,)).rowcount
+        if purged:
+            logger.info(f"Sentiment cache: dropped {purged} scores of older scorer versions")
+
+    def _remember(self, key: bytes, compound: float) -> None:
+        self._memory[key] = compound
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory:
+            self._memory.popitem(last=False)
+
+    def get_many(self, texts) -> dict:
+        """Return ``{text: compound}`` for every text that has a cached score."""
+        keys = {text: text_key(text) for text in texts}
+        found = {}
+        missing = {}
+        with self._lock:
+            for text, key in keys.items():
+                if key in self._memory:
+                    self._memory.move_to_end(key)
+                    found[text] = self._memory[key]
+                else:
+                    missing[key] = text
+            self.stats["memory_hits"] += len(found)
+
+            if missing and self._conn is not None:
+                key_list = list(missing)
+                for i in range(0, len(key_list), 500):
+                    chunk = key_list[i:i + 500]
+                    placeholders = ",".join("?" * len(chunk))
+                    rows = self._conn.execute(
+                        f"SELECT key, compound FROM sentiment WHERE version = ? AND key IN ({placeholders})",
+                        (self.version, *chunk),
+                    )
+                    for key, compound in rows:
+                        found[missing.pop(key)] = compound
+                        self._remember(key, compound)
+                        self.stats["disk_hits"] += 1
+            self.stats["misses"] += len(missing)
+        return found
+
+    def get(self, text: str):
+        return self.get_many([text]).get(text)
+
+    def set_many(self, scores: dict) -> None:
+        """Store ``{text: compound}`` in memory and on disk."""
+        if not scores:
+            return
+        rows = [(self.version, text_key(text), float(compound)) for text, compound in scores.items()]
+        with self._lock:
+            for _, key, compound in rows:
+                self._remember(key, compound)
+            if self._conn is not None:
+                try:
+                    with self._conn:
+                        self._conn.executemany(
+                            "INSERT OR REPLACE INTO sentiment (version, key, compound) VALUES (?, ?, ?)", rows
+                        )
+                except sqlite3.Error as e:
+                    logger.error(f"Sentiment cache write failed: {e}")
+
+    def __contains__(self, text: str) -> bool:
+        return text in self.get_many([text])
+
+    def __len__(self) -> int:
+        return len(self._memory)
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
@@ -0,0 +1,236 @@
+# utils/tiered_cache.py
+"""
+Tiered cache with the same ``get``/``set`` interface as :class:`RedisCache`.
+
+Lookups go through the tiers in order and stop at the first hit:
+
+1. :class:`MemoryCache` – bounded in-process LRU with per-key TTL.
+2. :class:`SQLiteCache` – optional on-disk tier that survives restarts.
+3. :class:`RedisCache` – shared tier, used only when Redis is reachable.
+
+A hit in a lower tier is copied into the tiers above it.  Writes go to every
+tier (write-through).  Without Redis the process still keeps its seen-set and
+feed state in memory and on disk instead of silently losing all caching.
+
+Every tier has its own ``hits`` / ``misses`` / ``evictions`` counters
+(:attr:`TieredCache.stats`).
+"""
+
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+from scores_news.utils.cache import RedisCache, bulk_get, bulk_set
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = Path(__file__).resolve().parents[2]
+SQLITE_PATH = BASE_DIR / "scores_news" / "logs" / "cache.sqlite"
+
+MEMORY_MAX_ENTRIES = 20000
+# TTL of values promoted from a lower tier – the real remaining TTL there is unknown,
+# so the copy stays short-lived and never outlives a freshness marker by much.
+PROMOTE_TTL = 60
+
+
+def _new_stats() -> dict:
+    return {"hits": 0, "misses": 0, "evictions": 0}
+
+
+class MemoryCache:
+    """Bounded LRU with per-key expiry, held in process memory."""
+
+    def __init__(self, max_entries: int = MEMORY_MAX_ENTRIES, ttl_seconds: int = 600) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._data = OrderedDict()  # key -> (value, expires_at)
+        self._lock = threading.Lock()
+        self.stats = _new_stats()
+
+    def _lookup(self, key: str, now: float):
+        item = self._data.get(key)
+        if item is None:
+            return None
+        value, expires_at = item
+        if expires_at <= now:
+            del self._data[key]
+            self.stats["evictions"] += 1
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def get(self, key: str):
+        return self.get_many([key])[0]
+
+    def get_many(self, keys) -> list:
+        now = time.monotonic()
+        with self._lock:
+            values = [self._lookup(key, now) for key in keys]
+        hits = sum(v is not None for v in values)
+        self.stats["hits"] += hits
+        self.stats["misses"] += len(values) - hits
+        return values
+
+    def exists_many(self, keys) -> list:
+        return [v is not None for v in self.get_many(keys)]
+
+    def set(self, key: str, value: str, ttl: int | None = None) -> None:
+        self.set_many({key: value}, ttl)
+
+    def set_many(self, mapping: dict, ttl: int | None = None) -> None:
+        expires_at = time.monotonic() + (ttl if ttl is not None else self.ttl_seconds)
+        with self._lock:
+            for key, value in mapping.items():
+                self._data[key] = (value, expires_at)
+                self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.stats["evictions"] += 1
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class SQLiteCache:
+    """Key/value store in a local SQLite file with per-key expiry.
+
+    Expired rows are ignored on read and purged every ``purge_every`` writes.
+    """
+
+    def __init__(self, path: Path | str = SQLITE_PATH, ttl_seconds: int = 600, purge_every: int = 500) -> None:
+        self.path = Path(path)
+        self.ttl_seconds = ttl_seconds
+        self.purge_every = purge_every
+        self._writes = 0
+        self._lock = threading.Lock()
+        self.stats = _new_stats()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        with self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value TEXT, expires_at REAL)"
+            )
+
+    def get(self, key: str):
+        return self.get_many([key])[0]
+
+    def get_many(self, keys) -> list:
+        keys = list(keys)
+        found = {}
+        now = time.time()
+        with self._lock:
+            # SQLite מגביל את מספר הפרמטרים בשאילתה – קריאה במנות
+            for i in range(0, len(keys), 500):
+                chunk = keys[i:i + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT key, value FROM cache WHERE key IN ({placeholders}) AND expires_at > ?",
+                    (*chunk, now),
+                )
+                found.update(rows)
+        values = [found.get(key) for key in keys]
+        self.stats["hits"] += len(found)
+        self.stats["misses"] += len(keys) - len(found)
+        return values
+
+    def exists_many(self, keys) -> list:
+        return [v is not None for v in self.get_many(keys)]
+
+    def set(self, key: str, value: str, ttl: int | None = None) -> None:
+        self.set_many({key: value}, ttl)
+
+    def set_many(self, mapping: dict, ttl: int | None = None) -> None:
+        if not mapping:
+            return
+        expires_at = time.time() + (ttl if ttl is not None else self.ttl_seconds)
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+                [(key, value, expires_at) for key, value in mapping.items()],
+            )
+            self._writes += len(mapping)
+            if self._writes >= self.purge_every:
+                self._writes = 0
+                purged = self._conn.execute("DELETE FROM cache WHERE expires_at <= ?", (time.time(),)).rowcount
+                self.stats["evictions"] += purged
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+class TieredCache:
+    """Read-through / write-through chain of caches, fastest first."""
+
+    def __init__(self, tiers: list, names: list | None = None, promote_ttl: int = PROMOTE_TTL) -> None:
+        self.tiers = list(tiers)
+        self.names = list(names or [type(t).__name__ for t in self.tiers])
+        self.promote_ttl = promote_ttl
+        self._counters = {name: _new_stats() for name in self.names}
+
+    @classmethod
+    def default(cls, ttl_seconds: int = 600, sqlite_path: Path | str | None = SQLITE_PATH,
+                use_redis: bool = True, redis_kwargs=None):
+        """Memory → SQLite → Redis; SQLite is skipped when ``sqlite_path`` is None and
+        Redis when ``use_redis`` is False or the server can't be reached."""
+        tiers, names = [MemoryCache(ttl_seconds=ttl_seconds)], ["memory"]
+        if sqlite_path is not None:
+            try:
+                tiers.append(SQLiteCache(sqlite_path, ttl_seconds=ttl_seconds))
+                names.append("sqlite")
+            except sqlite3.Error as e:
+                logger.error(f"SQLite cache unavailable ({sqlite_path}): {e}")
+        redis_cache = RedisCache(ttl_seconds=ttl_seconds, **(redis_kwargs or {})) if use_redis else None
+        if redis_cache is not None and redis_cache.redis_client is not None:
+            tiers.append(redis_cache)
+            names.append("redis")
+        elif use_redis:
+            logger.warning("Redis unavailable; using local cache tiers only")
+        return cls(tiers, names)
+
+    @property
+    def stats(self) -> dict:
+        """Per-tier ``{"hits", "misses", "evictions"}``."""
+        result = {}
+        for name, tier in zip(self.names, self.tiers):
+            counters = dict(self._counters[name])
+            counters["evictions"] = getattr(tier, "stats", {}).get("evictions", 0)
+            result[name] = counters
+        return result
+
+    def get(self, key: str):
+        return self.get_many([key])[0]
+
+    def get_many(self, keys) -> list:
+        keys = list(keys)
+        values = [None] * len(keys)
+        pending = list(range(len(keys)))
+        for level, (name, tier) in enumerate(zip(self.names, self.tiers)):
+            if not pending:
+                break
+            found = bulk_get(tier, [keys[i] for i in pending])
+            hits = {keys[i]: v for i, v in zip(pending, found) if v is not None}
+            self._counters[name]["hits"] += len(hits)
+            self._counters[name]["misses"] += len(pending) - len(hits)
+            if hits and level:
+                # העתקה לשכבות המהירות יותר
+                for upper in self.tiers[:level]:
+                    bulk_set(upper, hits, ttl=self.promote_ttl)
+            for i, v in zip(pending, found):
+                if v is not None:
+                    values[i] = v
+            pending = [i for i in pending if values[i] is None]
+        return values
+
+    def exists_many(self, keys) -> list:
+        return [v is not None for v in self.get_many(keys)]
+
+    def set(self, key: str, value: str, ttl: int | None = None) -> None:
+        self.set_many({key: value}, ttl)
+
+    def set_many(self, mapping: dict, ttl: int | None = None) -> None:
+        for tier in self.tiers:
+            bulk_set(tier, mapping, ttl=ttl)
@@ -0,0 +1,230 @@
+# utils/yield_curve.py
+"""
+Local store of the Treasury daily par yield curve, all tenors.
+
+The Treasury publishes one XML document per month.  Re-downloading the
+month on every score (and on every dashboard load) is wasteful: a closed
+month never changes, and the current month only gains one row per business
+day.  The store therefore:
+
+* fetches a closed month once and keeps it forever;
+* refreshes only the current month, at most every ``refresh_interval``
+  seconds.  A failed download backs off for the same interval, and one
+  refresh runs at a time, so callers keep reading the stored curves
+  instead of retrying the Treasury;
+* parses the XML incrementally with ``ElementTree.iterparse`` straight
+  from the HTTP stream.  Each ``<m:properties>`` row is converted and
+  cleared as soon as it ends, so no full tree is ever built.
+
+Curves are kept in memory as ``{date: {tenor: yield}}`` and persisted to
+``logs/yield_curve.json`` (atomic write).  :meth:`YieldCurveStore.latest`
+is a dictionary lookup, so bond scoring and the inversion alert read it
+in microseconds.
+"""
+
+import io
+import json
+import logging
+import os
+import threading
+import time
+import xml.etree.ElementTree as ET
+from datetime import datetime
+from pathlib import Path
+
+from scores_news.utils.http_client import http_get
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = Path(__file__).resolve().parents[2]
+STORE_PATH = BASE_DIR / "scores_news" / "logs" / "yield_curve.json"
+STORE_VERSION = 1
+
+TREASURY_URL = (
+    "https://home.treasury.gov/resource-center/data-chart-center/"
+    "interest-rates/pages/xmlview?data=daily_treasury_yield_curve&field_tdr_date_value_month={year_month}"
+)
+REFRESH_INTERVAL = 3600  # שניות – רענון החודש הנוכחי
+SPREAD_TENORS = ("2Y", "10Y")  # הטנורים שציון האג"ח וזיהוי האינברסיה צריכים
+
+# שדה ב־XML → שם הטנור, לפי סדר המחזור
+TENORS = {
+    "BC_1MONTH": "1M",
+    "BC_1_5MONTH": "1.5M",
+    "BC_2MONTH": "2M",
+    "BC_3MONTH": "3M",
+    "BC_4MONTH": "4M",
+    "BC_6MONTH": "6M",
+    "BC_1YEAR": "1Y",
+    "BC_2YEAR": "2Y",
+    "BC_3YEAR": "3Y",
+    "BC_5YEAR": "5Y",
+    "BC_7YEAR": "7Y",
+    "BC_10YEAR": "10Y",
+    "BC_20YEAR": "20Y",
+    "BC_30YEAR": "30Y",
+}
+
+
+def _local(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+def parse_yield_curve_xml(source) -> dict:
+    """Stream-parse a Treasury month (bytes, str or a binary file object) into ``{YYYY-MM-DD: {tenor: yield}}``."""
+    if isinstance(source, str):
+        source = source.encode("utf-8")
+    if isinstance(source, (bytes, bytearray)):
+        source = io.BytesIO(source)
+    curves = {}
+    for _, elem in ET.iterparse(source, events=("end",)):
+        if _local(elem.tag) != "properties":
+            continue
+        date = None
+        curve = {}
+        for child in elem:
+            name = _local(child.tag)
+            text = (child.text or "").strip()
+            if name == "NEW_DATE" and text:
+                date = text[:10]
+            elif name in TENORS and text:
+                try:
+                    curve[TENORS[name]] = float(text)
+                except ValueError:
+                    pass
+        if date and curve:
+            curves[date] = curve
+        elem.clear()
+    return curves
+
+
+def fetch_month_stream(year_month: str):
+    """Open the month's XML as a decoded byte stream (parsed while it downloads)."""
+    response = http_get(TREASURY_URL.format(year_month=year_month), stream=True)
+    response.raise_for_status()
+    response.raw.decode_content = True
+    return response.raw
+
+
+def _previous_month(year_month: str) -> str:
+    year, month = int(year_month[:4]), int(year_month[4:])
+    return f"{year - 1}12" if month == 1 else f"{year}{month - 1:02d}"
+
+
+class YieldCurveStore:
+    """Daily yield curves by date; closed months cached forever, current month refreshed."""
+
+    def __init__(self, path: Path | str | None = STORE_PATH, fetch=fetch_month_stream,
+                 refresh_interval: float = REFRESH_INTERVAL) -> None:
+        self.path = Path(path) if path is not None else None
+        self.fetch = fetch
+        self.refresh_interval = refresh_interval
+        self.curves = {}
+        self.months = {}  # "YYYYMM" -> {"closed": bool, "fetched_at": ts}
+        self.failed_at = {}  # "YYYYMM" -> ניסיון אחרון שנכשל (לא נשמר לדיסק)
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._load()
+
+    def _load(self) -> None:
+        if self.path is None or not self.path.exists():
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not read yield curve store from {self.path}: {e}")
+            return
+        if state.get("version") == STORE_VERSION:
+            self.curves = state.get("curves", {})
+            self.months = state.get("months", {})
+
+    def _save(self) -> None:
+        if self.path is None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": STORE_VERSION, "months": self.months, "curves": self.curves}, f)
+        os.replace(tmp_path, self.path)
+
+    def ensure_month(self, year_month: str, now: datetime | None = None) -> bool:
+        """Download ``year_month`` unless it is cached (closed), fresh enough (current) or failed recently. True if fetched."""
+        now = now or datetime.now()
+        meta = self.months.get(year_month)
+        is_current = year_month >= now.strftime("%Y%m")
+        if meta and meta.get("closed"):
+            return False
+        if meta and is_current and time.time() - meta.get("fetched_at", 0) < self.refresh_interval:
+            return False
+        if time.time() - self.failed_at.get(year_month, 0) < self.refresh_interval:
+            return False
+
+        try:
+            stream = self.fetch(year_month)
+            try:
+                curves = parse_yield_curve_xml(stream)
+            finally:
+                close = getattr(stream, "close", None)
+                if close:
+                    close()
+        except Exception:
+            self.failed_at[year_month] = time.time()
+            raise
+        self.failed_at.pop(year_month, None)
+        with self._lock:
+            self.curves.update(curves)
+            self.curves = dict(sorted(self.curves.items()))
+            self.months[year_month] = {"closed": not is_current, "fetched_at": time.time()}
+            self._save()
+        logger.info(f"Yield curve {year_month}: {len(curves)} days ({'current' if is_current else 'closed'})")
+        return True
+
+    def refresh(self, now: datetime | None = None) -> None:
+        """Bring the current month up to date; the previous month is pulled once so early-month dates have data."""
+        now = now or datetime.now()
+        current = now.strftime("%Y%m")
+        # קריאה מקבילה (קטגוריות ב־threads) מחכה לרענון הרץ במקום להוריד שוב
+        error = None
+        with self._refresh_lock:
+            for year_month in (current, _previous_month(current)):
+                try:
+                    self.ensure_month(year_month, now)
+                except Exception as e:
+                    error = e
+        if error is not None:
+            raise error
+
+    def latest(self, on_or_before: str | None = None, required=()) -> tuple[str, dict] | tuple[None, dict]:
+        """``(date, {tenor: yield})`` of the newest curve (optionally not after ``on_or_before``) that has every ``required`` tenor."""
+        for date in reversed(self.curves):
+            curve = self.curves[date]
+            if (on_or_before is None or date <= on_or_before) and all(t in curve for t in required):
+                return date, dict(curve)
+        return None, {}
+
+    def history(self, tenor: str) -> dict:
+        """``{date: yield}`` of one tenor across every stored day."""
+        return {date: curve[tenor] for date, curve in self.curves.items() if tenor in curve}
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store() -> YieldCurveStore:
+    """Process-wide store, refreshed when the current month is stale."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = YieldCurveStore()
+    try:
+        _store.refresh()
+    except Exception as e:
+        logger.warning(f"Yield curve refresh failed, serving stored curves: {e}")
+    return _store
+
+
+def latest_yields(required=SPREAD_TENORS) -> dict:
+    """All tenors of the newest stored curve that has the ``required`` tenors (2Y and 10Y by default)."""
+    return get_store().latest(required=required)[1]
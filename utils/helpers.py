@@ -1,5 +1,14 @@
-import feedparser
+from scores_news.utils.feed_engine import fetch_feeds
+
 
 def parse_rss(url):
-    feed = feedparser.parse(url)
-    return [{"title": entry.title, "link": entry.link, "summary": entry.summary} for entry in feed.entries]
+    return parse_rss_many([url])[url]
+
+
+def parse_rss_many(urls):
+    """מוריד כמה פידים במקביל ומחזיר {url: [כתבות]}"""
+    results = fetch_feeds(urls)
+    return {
+        url: [{"title": a["title"], "link": a["link"], "summary": a["summary"]} for a in articles]
+        for url, articles in results.items()
+    }